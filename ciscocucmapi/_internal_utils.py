@@ -3,6 +3,9 @@
 from collections.abc import Iterable
 from collections import OrderedDict
 from inspect import signature
+from io import BytesIO
+
+from lxml import etree
 
 
 from zeep.xsd.elements.element import Element
@@ -12,6 +15,8 @@ from zeep.helpers import serialize_object
 
 import zeep     # this is for serialization and that could be made more specific jre
 
+from .result_table import ResultTable
+
 def element_list_to_ordered_dict(elements):
     """Converts a list of lists of zeep Element objects to a list of OrderedDicts
     Used for SQL query serialization
@@ -19,6 +24,82 @@ def element_list_to_ordered_dict(elements):
     return [OrderedDict((element.tag, element.text) for element in row) for row in elements]
 
 
+def element_list_to_result_table(elements):
+    """Converts a list of lists of zeep Element objects to a ResultTable
+    Used for SQL query serialization
+
+    Columns are matched to the header by tag (see align_row) so rows with missing or reordered
+    columns keep their values under the right column names.
+    """
+    header = None
+    rows = []
+    for row in elements:
+        columns = tuple(element.tag for element in row)
+        values = tuple(element.text for element in row)
+        if header is None:
+            header = columns
+        elif columns != header:
+            header, values = align_row(header, rows, columns, values)
+        rows.append(values)
+    return ResultTable(header or (), rows)
+
+
+def align_row(header, rows, columns, values):
+    """Re-order one row's values to the header by column name
+
+    Columns missing from the row are None.  Columns the header does not have yet are added to the
+    end of the header and the rows already collected are padded with None in place.
+
+    :param header: tuple of column names so far
+    :param rows: list of row tuples collected so far (padded in place when the header grows)
+    :param columns: this row's column names
+    :param values: this row's values
+    :return: tuple of (header, row values tuple in header order)
+    """
+    row_dict = dict(zip(columns, values))
+    new_columns = tuple(column for column in row_dict if column not in header)
+    if new_columns:
+        header = header + new_columns
+        padding = (None,) * len(new_columns)
+        rows[:] = [row + padding for row in rows]
+    return header, tuple(row_dict.get(column) for column in header)
+
+
+def iterparse_sql_rows(content):
+    """Parse a raw executeSQLQuery response straight into row tuples, bypassing zeep
+
+    Rows are cleared as they are parsed so only the output tuples stay in memory.
+    Rows whose columns come back missing or in a different order are re-ordered to the header.
+
+    :param content: (bytes) SOAP response XML
+    :return: tuple of (header tuple of column names, list of row value tuples)
+    """
+    header = None
+    rows = []
+    for _, row in etree.iterparse(BytesIO(content), events=("end",), tag="row"):
+        columns = tuple(column.tag for column in row)
+        values = tuple(column.text for column in row)
+        if header is None:
+            header = columns
+        elif columns != header:
+            header, values = align_row(header, rows, columns, values)
+        rows.append(values)
+
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+    return header or (), rows
+
+
+def soap_fault_string(content):
+    """Return the faultstring of a raw SOAP fault response (or None)"""
+    try:
+        fault = etree.fromstring(content).find(".//faultstring")
+    except etree.XMLSyntaxError:
+        return None
+    return fault.text if fault is not None else None
+
+
 def flatten(l):
     """Flattens nested Iterable of arbitrary depth"""
     for el in l:
@@ -39,13 +120,28 @@ def downcase_string(s):
     return s[:1].lower() + s[1:] if s else ''
 
 
+_signature_cache = {}
+
+
+def signature_parameters(f):
+    """Return (parameter names, **kwargs name or None) for a function or bound method
+
+    inspect.signature is slow and the wrappers call flatten_signature_kwargs on every request,
+    so the result is memoized per function (bound and unbound kept apart since bound drops 'self').
+    """
+    key = (getattr(f, "__func__", f), hasattr(f, "__self__"))
+    try:
+        return _signature_cache[key]
+    except KeyError:
+        parameters = signature(f).parameters
+        kwargs_keys = [k for k, v in parameters.items() if v.kind == v.VAR_KEYWORD]
+        result = _signature_cache[key] = (frozenset(parameters), kwargs_keys[-1] if kwargs_keys else None)
+        return result
+
+
 def get_signature_kwargs_key(f):
     """Get the key name for kwargs if a method signature"""
-    keys = [k for k, v in signature(f).parameters.items() if v.kind == v.VAR_KEYWORD]
-    try:
-        return keys.pop()
-    except IndexError:  # empty list
-        return None
+    return signature_parameters(f)[1]
 
 
 def flatten_signature_kwargs(func, loc):
@@ -61,7 +157,8 @@ def flatten_signature_kwargs(func, loc):
 
 def get_signature_locals(f, loc):
     """Filters locals to only include keys in original method signature"""
-    return {k: v for k, v in loc.items() if k in signature(f).parameters}
+    parameters = signature_parameters(f)[0]
+    return {k: v for k, v in loc.items() if k in parameters}
 
 
 def nullstring_dict(returnedTags):
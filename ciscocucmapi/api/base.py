@@ -1,9 +1,13 @@
 """Base AXL APIs"""
 
 import functools
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from operator import methodcaller
 
 from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
 from zeep.helpers import serialize_object
 from zeep.xsd.elements.element import Element           # jre might only be in internal_utils now
 from zeep.xsd.elements.indicators import Choice         # jre might only be in internal_utils now
@@ -11,7 +15,10 @@ from zeep.xsd.elements.indicators import Sequence       # jre might only be in i
 
 from .._internal_utils import check_valid_attribute_req_dict  # jre might only be in intenral_utils now
 from .._internal_utils import downcase_string
-from .._internal_utils import element_list_to_ordered_dict
+from .._internal_utils import element_list_to_result_table
+from .._internal_utils import iterparse_sql_rows
+from .._internal_utils import soap_fault_string
+from .._internal_utils import flatten
 from .._internal_utils import flatten_signature_kwargs
 from .._internal_utils import nullstring_dict
 from .._internal_utils import fetch_choices               # JRE add_udpate
@@ -20,6 +27,8 @@ from .._internal_utils import format_get_returned_tags   # JRE add_udpate
    
 from ..exceptions import IllegalSQLStatement
 from ..helpers import get_model_dict
+from ..object_cache import is_type_table_select
+from ..result_table import ResultTable
 from ..helpers import sanitize_model_dict
 from ..helpers import filter_attributes_depth_one       # JRE add_update
 
@@ -27,6 +36,72 @@ from copy import deepcopy   # using for add_udpate (may remove)  [jre]
 from pprint import pprint
 import logging
 
+# iter_list() paging
+LIST_PAGE_SIZE = 1000
+LIST_MIN_PAGE_SIZE = 10
+
+# AXL fault text when a list/query response would exceed the AXL size limit, ex:
+#   "Query request too large. Total rows matched: 125000 rows. Suggestive Row Fetch: less than 31250 rows"
+AXL_SIZE_FAULT_MARKERS = ("Query request too large", "Suggestive Row Fetch", "Maximum AXL Memory Allocation")
+AXL_SUGGESTED_ROWS = re.compile(r"Suggestive Row Fetch: less than (\d+)")
+
+# add_update_many() requests in flight
+ADD_UPDATE_WORKERS = 8
+
+# ThinAXLAPI.query_iter() chunking
+SQL_CHUNK_SIZE = 2000
+SQL_MIN_CHUNK_SIZE = 10
+SQL_THROTTLE_RETRIES = 5
+SQL_THROTTLE_BACKOFF = 2.0
+SQL_SELECT = re.compile(r"^select\s+(?!skip\b|first\b|limit\b)", re.IGNORECASE)
+
+# HTTP status codes AXL uses when it is throttling requests
+AXL_THROTTLE_STATUS_CODES = (429, 503)
+
+# AXL actions that change objects and invalidate the connector's object cache for the type
+CACHE_INVALIDATING_ACTIONS = ("add", "update", "remove")
+
+
+def axl_size_fault_page_size(fault, page_size):
+    """Return a smaller page size for an AXL 'too large' fault, or None for any other fault
+
+    :param fault: zeep Fault raised by the AXL request
+    :param page_size: (int) page size of the failed request
+    :return: (int) AXL's suggested row count (if lower) or half of page_size
+    """
+    message = getattr(fault, "message", "") or ""
+    if not any(marker in message for marker in AXL_SIZE_FAULT_MARKERS):
+        return None
+    suggested = AXL_SUGGESTED_ROWS.search(message)
+    if suggested and 0 < int(suggested.group(1)) < page_size:
+        return int(suggested.group(1))
+    return page_size // 2
+
+
+# WSDL derived metadata (returnedTags templates, search criteria keys, get choices, models) keyed by
+# (connector schema_key, API class, name).  Built on first use and shared by every connector using
+# the same schema.  Cached values are shared, callers must not modify them.
+_schema_metadata = {}
+
+
+def schema_metadata(api, name, build):
+    """Return cached metadata for an API wrapper, calling build() the first time
+
+    :param api: API wrapper instance
+    :param name: metadata name (ex: 'model:add')
+    :param build: callable returning the value
+    """
+    key = (getattr(api.connector, "schema_key", None), api.__class__, name)
+    try:
+        return _schema_metadata[key]
+    except KeyError:
+        return _schema_metadata.setdefault(key, build())
+
+
+def clear_schema_metadata():
+    _schema_metadata.clear()
+
+
 def classproperty(func):
     """Decorator function to denote class properties"""
     if not isinstance(func, (classmethod, staticmethod)):
@@ -58,6 +133,43 @@ class BaseAXLAPI(object):
         self.object_factory = object_factory
         self._return_name = downcase_string(self.__class__.__name__)
 
+    def _object_cache(self, obj_type):
+        """Connector's AXLObjectCache if it caches obj_type, else None"""
+        cache = getattr(self.connector, "object_cache", None)
+        if cache is not None and cache.caches(obj_type):
+            return cache
+        return None
+
+    def _read_through(self, action, criteria, fetch, obj_type=None):
+        """Return fetch() through the connector's object cache (fetch() alone when not cached)
+
+        :param action: request verb ('get', 'list', 'query')
+        :param criteria: request arguments making up the cache key
+        :param fetch: callable sending the request
+        :param obj_type: cache object type (API class name by default)
+        """
+        obj_type = obj_type or self.__class__.__name__
+        cache = self._object_cache(obj_type)
+        if cache is None:
+            return fetch()
+        hit, value = cache.get(self.connector.cluster_key, obj_type, action, criteria)
+        if not hit:
+            value = fetch()
+            cache.set(self.connector.cluster_key, obj_type, action, criteria, value)
+        return value
+
+    def _invalidate_cache(self, obj_type=None):
+        obj_type = obj_type or self.__class__.__name__
+        cache = self._object_cache(obj_type)
+        if cache is not None:
+            cache.invalidate(self.connector.cluster_key, obj_type)
+
+    def _invalidate_cluster_cache(self):
+        """Drop every cached object type of the cluster (SQL writes can touch any table)"""
+        cache = getattr(self.connector, "object_cache", None)
+        if cache is not None:
+            cache.invalidate_cluster(self.connector.cluster_key)
+
     @classproperty
     def factory_descriptor(cls):  # noqa
         return cls._factory_descriptor
@@ -123,6 +235,27 @@ class SimpleAXLAPI(BaseAXLAPI):
         """
         return self.connector.client.get_type(f'ns0:{obj_name}')
 
+    def _cached_model(self, target_model="add"):
+        """model(target_model) from the schema metadata cache (used read-only by add_update)"""
+        return schema_metadata(self, f"model:{target_model}", lambda: self.model(target_model=target_model))
+
+    def _get_choices(self):
+        """Identifier choices of the get request (ex: ('name', 'uuid')) from the schema metadata cache"""
+        return schema_metadata(self, "get_choices",
+                               lambda: fetch_choices(self._fetch_get_method().elements_nested[0][1][0]))
+
+    def _list_search_key(self):
+        """First search criteria of the list request (used for a 'fetch-all' list)"""
+        def build():
+            list_method = self._get_wsdl_obj(self._list_method_name)
+            return list_method.elements[0][1].type.elements[0][0]
+        return schema_metadata(self, "list_search_key", build)
+
+    def _list_returned_tags(self):
+        """returnedTags template with every attribute of the list response"""
+        return schema_metadata(self, "list_returned_tags",
+                               lambda: get_model_dict(self._get_wsdl_obj(self._list_model_name)))
+
     def _axl_methodcaller(self, action, **kwargs):
         """Map calling method to a concat of the action verb and the API class name
 
@@ -143,7 +276,10 @@ class SimpleAXLAPI(BaseAXLAPI):
         :return: Data Model object containing the serialized response data dict
         """
         axl_resp = self._axl_methodcaller(action, **kwargs)
+        return self._axl_object_result(axl_resp)
 
+    def _axl_object_result(self, axl_resp):
+        """Serialize an AXL response holding a single object (get/options style responses)"""
         # Disabled object factory due to issues with mutable mapping
         if self.USE_OBJECT_FACTORY:
             return self.object_factory(
@@ -160,6 +296,8 @@ class SimpleAXLAPI(BaseAXLAPI):
         :return: (str) uuid
         """
         axl_resp = self._axl_methodcaller(action, **kwargs)
+        if action in CACHE_INVALIDATING_ACTIONS:
+            self._invalidate_cache()
         return serialize_object(axl_resp)["return"]
 
     @BaseAXLAPI.assert_supported
@@ -258,13 +396,24 @@ class SimpleAXLAPI(BaseAXLAPI):
         # define zeep objects for method generically
         #get_method = self._get_wsdl_obj(self._get_method_name)
         get_kwargs = flatten_signature_kwargs(self.get, locals())
-        return self._serialize_axl_object("get", **get_kwargs)
+        return self._read_through("get", get_kwargs, lambda: self._serialize_axl_object("get", **get_kwargs))
 
     @BaseAXLAPI.assert_supported
     def update(self, **kwargs):
         """Update method for API endpoint"""
         return self._serialize_uuid_resp("update", **kwargs)
 
+    def _list_defaults(self, searchCriteria=None, returnedTags=None):
+        """Fill in default searchCriteria ('fetch-all') and returnedTags (all tags) for list requests"""
+        if not searchCriteria:
+            # this is presumptive and may not work in all cases.
+            searchCriteria = {self._list_search_key(): "%"}
+        if not returnedTags:
+            returnedTags = self._list_returned_tags()
+        elif isinstance(returnedTags, list):
+            returnedTags = nullstring_dict(returnedTags)
+        return searchCriteria, returnedTags
+
     @BaseAXLAPI.assert_supported
     def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None):
         """Fetch a list of API endpoint objects.
@@ -279,18 +428,13 @@ class SimpleAXLAPI(BaseAXLAPI):
         :param first: (int) return first number of results
         :return: list of Data Models for API Endpoint
         """
-        if not searchCriteria:
-            # this is presumptive and may not work in all cases.
-            list_method = self._get_wsdl_obj(self._list_method_name)
-            supported_criteria = [element[0] for element in list_method.elements[0][1].type.elements]
-            searchCriteria = {supported_criteria[0]: "%"}
-        if not returnedTags:
-            list_model = self._get_wsdl_obj(self._list_model_name)
-            returnedTags = get_model_dict(list_model)
-        elif isinstance(returnedTags, list):
-            returnedTags = nullstring_dict(returnedTags)
-        axl_resp = self._axl_methodcaller("list", searchCriteria=searchCriteria, returnedTags=returnedTags,
-                                          skip=skip, first=first)
+        searchCriteria, returnedTags = self._list_defaults(searchCriteria, returnedTags)
+        list_kwargs = {"searchCriteria": searchCriteria, "returnedTags": returnedTags, "skip": skip, "first": first}
+        return self._read_through("list", list_kwargs,
+                                  lambda: self._axl_list_result(self._axl_methodcaller("list", **list_kwargs)))
+
+    def _axl_list_result(self, axl_resp):
+        """Serialize an AXL list response to a list of Data Models ([] if nothing matched)"""
         try:
             axl_list = serialize_object(axl_resp)["return"][self._return_name]
 
@@ -303,6 +447,56 @@ class SimpleAXLAPI(BaseAXLAPI):
         except TypeError:
             return []
 
+    def iter_list(self, searchCriteria=None, returnedTags=None, page_size=LIST_PAGE_SIZE,
+                  min_page_size=LIST_MIN_PAGE_SIZE, page_timings=None):
+        """Generator version of list() that pages through results with skip/first.
+
+        Only one page is held in memory at a time so very large clusters can be listed in
+        constant memory.  When AXL rejects a page as too large the page size is reduced (to
+        AXL's suggested row count when the fault has one, otherwise halved) and the page is retried.
+
+        :param searchCriteria: (dict) search criteria for "list' method.  Wraps a 'fetch-all' if unspecified.
+        :param returnedTags: (dict) returned attributes.  If none, all attributes are returned
+        :param page_size: (int) rows requested per page
+        :param min_page_size: (int) smallest page size before the size fault is raised
+        :param page_timings: (list) optional list, a dict is appended for each page requested
+                             {'skip', 'first', 'rows', 'elapsed_time', 'fault'} for page size tuning
+        :return: generator of Data Models for API Endpoint
+        """
+        if "list" not in self.supported_methods:
+            raise AttributeError(f"{self.__class__.__name__} API does not support 'list' method.")
+
+        searchCriteria, returnedTags = self._list_defaults(searchCriteria, returnedTags)
+        skip = 0
+        while True:
+            start_time = time.time()
+            try:
+                page = self.list(searchCriteria=searchCriteria, returnedTags=returnedTags,
+                                 skip=skip, first=page_size)
+            except Fault as fault:
+                smaller_page_size = axl_size_fault_page_size(fault, page_size)
+                if page_timings is not None:
+                    page_timings.append({"skip": skip, "first": page_size, "rows": 0,
+                                         "elapsed_time": time.time() - start_time, "fault": fault.message})
+                if smaller_page_size is None or smaller_page_size < min_page_size:
+                    raise
+                logging.debug(f"{self.__class__.__name__}.iter_list: page size {page_size} too large, "
+                              f"retrying with {smaller_page_size}")
+                page_size = smaller_page_size
+                continue
+
+            elapsed_time = time.time() - start_time
+            if page_timings is not None:
+                page_timings.append({"skip": skip, "first": page_size, "rows": len(page),
+                                     "elapsed_time": elapsed_time, "fault": None})
+            logging.debug(f"{self.__class__.__name__}.iter_list: skip={skip} first={page_size} "
+                          f"rows={len(page)} in {elapsed_time:.3f} seconds")
+
+            yield from page
+            if len(page) < page_size:
+                return
+            skip += len(page)
+
     @BaseAXLAPI.assert_supported
     def remove(self, **kwargs):
         """Remove method for API endpoint"""
@@ -358,7 +552,7 @@ class SimpleAXLAPI(BaseAXLAPI):
         try:
             # Perform GET request
             #valid_choices = fetch_req_choices(self._fetch_get_method())
-            valid_choices = fetch_choices(self._fetch_get_method().elements_nested[0][1][0])    # pull choices from WSDL object (this appears to be working)
+            valid_choices = self._get_choices()     # pull choices from WSDL object (cached per wrapper)
             choice_criteria = filter_get_choice_criteria(choice_criteria=obj_data, valid_choices=valid_choices)   # pull out choice_criteria from obj_data
             returned_tags = nullstring_dict(choice_criteria)                            # use choice criteria for return tags
             
@@ -391,7 +585,7 @@ class SimpleAXLAPI(BaseAXLAPI):
 
 
             # pop items not used for ADD
-            add_model=self.model()
+            add_model = self._cached_model("add")
             add_data = filter_attributes_depth_one(add_model, add_data)
 
             if LOCAL_DEBUG:
@@ -403,7 +597,7 @@ class SimpleAXLAPI(BaseAXLAPI):
             if LOCAL_DEBUG:
                 print('ADD_UPDATE: GET RETURNED VALUE: Proceeding with UPDATE')
                 
-            update_model=self.model(target_model='update')
+            update_model = self._cached_model("update")
 
             if LOCAL_DEBUG:
                 # BUG/ISSUE: for LRG, has an additional depth of struture
@@ -420,6 +614,81 @@ class SimpleAXLAPI(BaseAXLAPI):
                 pprint(update_data)
             return self.update(**update_data)       # run UPDATE and seriliaze to a UUID
 
+    def add_update_many(self, records, workers=ADD_UPDATE_WORKERS, key_fields=None, existing_keys=None):
+        """Reconcile many objects at once: ADD the ones missing and UPDATE the ones that exist
+
+        add_update() spends a GET round trip per object to pick ADD or UPDATE.  This method lists the
+        identifiers of every existing object once (paginated iter_list), decides ADD or UPDATE
+        locally and sends the ADDs/UPDATEs over a thread pool.  Models and get choices are
+        built once per wrapper.  Data is filtered the same way add_update() does.
+
+        Classes that override add_update() (ex: UserRole) keep their own logic; their records
+        are sent to add_update() over the thread pool.
+
+        :param records: iterable of obj_data dicts (same format as add_update)
+        :param workers: (int) requests in flight
+        :param key_fields: identifier fields to match on.  Defaults to the non-uuid get choice
+                           (ex: ('name',) or ('pattern', 'routePartitionName'))
+        :param existing_keys: optional set of key tuples already known to exist (skips the list)
+        :return: list (in records order) of dicts {'action': 'add'|'update'|'add_update',
+                 'result': uuid or None, 'error': Exception or None}
+        """
+        if "add_update" not in self.supported_methods:
+            raise AttributeError(f"{self.__class__.__name__} API does not support 'add_update' method.")
+
+        records = list(records)
+        if type(self).add_update is not SimpleAXLAPI.add_update:
+            actions = [("add_update", record) for record in records]
+        else:
+            key_fields = tuple(key_fields or self._add_update_key_fields())
+            if existing_keys is None:
+                returned_tags = nullstring_dict(key_fields)
+                existing_keys = {self._record_key(row, key_fields)
+                                 for row in self.iter_list(searchCriteria=None, returnedTags=returned_tags)}
+            actions = [("update" if self._record_key(record, key_fields) in existing_keys else "add", record)
+                       for record in records]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._dispatch_add_update, actions))
+
+    def _add_update_key_fields(self):
+        """First non-uuid identifier choice of the get request, flattened to a tuple of field names"""
+        for choice in self._get_choices():
+            if choice != "uuid":
+                return tuple(flatten([choice]))
+        raise AttributeError(f"{self.__class__.__name__} API has no identifier other than uuid.")
+
+    @staticmethod
+    def _record_key(record, key_fields):
+        """Key tuple for a record or list row.  Reference fields ({'_value_1': name, 'uuid': ...}) use
+        the name and empty values are None so both sides compare the same way."""
+        key = []
+        for field in key_fields:
+            value = record.get(field)
+            if isinstance(value, dict):
+                value = value.get("_value_1")
+            key.append(value if value != "" else None)
+        return tuple(key)
+
+    def _dispatch_add_update(self, action_record):
+        action, record = action_record
+        result = None
+        error = None
+        try:
+            if action == "add":
+                add_data = deepcopy(self._add_defaults)
+                add_data.update(record)
+                result = self.add(**filter_attributes_depth_one(self._cached_model("add"), add_data))
+            elif action == "update":
+                update_data = filter_attributes_depth_one(self._cached_model("update"), deepcopy(record))
+                result = self.update(**update_data)
+            else:
+                result = self.add_update(record)
+        except Exception as e:
+            logging.error(f"{self.__class__.__name__} {action} failed for {record}: {e}")
+            error = e
+        return {"action": action, "result": result, "error": error}
+
 
 class DeviceAXLAPI(SimpleAXLAPI):
     """AXL API support additional device-related methods"""
@@ -460,32 +729,88 @@ class DeviceAXLAPI(SimpleAXLAPI):
 class ThinAXLAPI(BaseAXLAPI):
     """API extension for Thin AXL"""
     _factory_descriptor = "sql"
-    supported_methods = ["query", "update"]
+    supported_methods = ["query", "query_tuples", "query_iter", "update"]
+
+    def _query_rows(self, sql_statement):
+        """Execute SQL query via Thin AXL and serialize the rows
+
+        :param sql_statement: Informix-compliant SQL statement
+        :return: ResultTable of rows (zeep Fault is not caught)
+        """
+        axl_resp = self.connector.service.executeSQLQuery(sql=sql_statement)
+        return self._sql_result(axl_resp)
+
+    @staticmethod
+    def _sql_result(axl_resp):
+        """Serialize an executeSQLQuery response to a ResultTable"""
+        try:
+            serialized_resp = element_list_to_result_table(
+                serialize_object(axl_resp)["return"]["rows"])
+        except KeyError:
+            # single tuple response
+            serialized_resp = element_list_to_result_table(
+                serialize_object(axl_resp)["return"]["row"])
+        except TypeError:
+            # no SQL tuples
+            #
+            # JRE Edit - original routine would return "None" if no rows found
+            # Instead, returning an empty list for 0 entries of the query was
+            # executed without errors
+            serialized_resp = ResultTable()
+            #serialized_resp = serialize_object(axl_resp)["return"] 
+        return serialized_resp
+
+    def _query_tuples(self, sql_statement):
+        """Execute SQL query via Thin AXL using the raw response (no zeep deserialization)
+
+        :param sql_statement: Informix-compliant SQL statement
+        :return: tuple of (header tuple, list of row tuples)
+        :raises Fault: SOAP fault returned by AXL
+        :raises TransportError: any other non-200 response
+        """
+        # force XML raw response for this call to bypass ZEEP processing
+        with self.connector.client.settings(raw_response=True):
+            r = self.connector.service.executeSQLQuery(sql=sql_statement)
+
+        if r.status_code != 200:
+            fault_string = soap_fault_string(r.content)
+            if fault_string is not None:
+                raise Fault(fault_string)
+            raise TransportError(status_code=r.status_code, content=r.content)
+        return iterparse_sql_rows(r.content)
+
+    @BaseAXLAPI.assert_supported
+    def query_tuples(self, sql_statement):
+        """Fast path for large SQL queries: rows as tuples plus one shared header
+
+        Parses the raw SOAP response with lxml instead of building the zeep object graph.
+
+        :param sql_statement: Informix-compliant SQL statement
+        :return: tuple of (header tuple of column names, list of row value tuples)
+        """
+        try:
+            return self._query_tuples(sql_statement)
+        except Fault as fault:
+            raise IllegalSQLStatement(message=fault.message)
 
     @BaseAXLAPI.assert_supported
-    def query(self, sql_statement):
+    def query(self, sql_statement, fast_path=False):
         """Execute SQL query via Thin AXL
 
         :param sql_statement: Informix-compliant SQL statement
-        :return: SQL Thin AXL data model object
+        :param fast_path: (bool) parse the raw response with lxml (see query_tuples)
+        :return: ResultTable (iterates and indexes as OrderedDict rows like the old list)
         """
         try:
-            axl_resp = self.connector.service.executeSQLQuery(sql=sql_statement)
-            try:
-                serialized_resp = element_list_to_ordered_dict(
-                    serialize_object(axl_resp)["return"]["rows"])
-            except KeyError:
-                # single tuple response
-                serialized_resp = element_list_to_ordered_dict(
-                    serialize_object(axl_resp)["return"]["row"])
-            except TypeError:
-                # no SQL tuples
-                #
-                # JRE Edit - original routine would return "None" if no rows found
-                # Instead, returning an empty list for 0 entries of the query was
-                # executed without errors
-                serialized_resp = []
-                #serialized_resp = serialize_object(axl_resp)["return"] 
+            if fast_path:
+                fetch = lambda: ResultTable(*self._query_tuples(sql_statement))   # noqa: E731
+            else:
+                fetch = lambda: self._query_rows(sql_statement)     # noqa: E731
+            if is_type_table_select(sql_statement):
+                # CUCM enum tables (typeproduct, typemodel, ...) only change with an upgrade
+                serialized_resp = self._read_through("query", sql_statement, fetch, obj_type="sql")
+            else:
+                serialized_resp = fetch()
 
             # Disabled object factory due to issues with mutable mapping
             if self.USE_OBJECT_FACTORY:
@@ -496,6 +821,77 @@ class ThinAXLAPI(BaseAXLAPI):
         except Fault as fault:
             raise IllegalSQLStatement(message=fault.message)
 
+    @BaseAXLAPI.assert_supported
+    def query_iter(self, sql_statement, chunk_size=SQL_CHUNK_SIZE, min_chunk_size=SQL_MIN_CHUNK_SIZE,
+                   max_retries=SQL_THROTTLE_RETRIES, backoff=SQL_THROTTLE_BACKOFF, chunk_timings=None):
+        """Execute a large SQL query in chunks and yield rows as each chunk arrives
+
+        The statement is re-sent as "SELECT SKIP n FIRST m ..." until a short chunk is returned.
+        Include an ORDER BY (ex: pkid) so chunks do not overlap or miss rows between requests.
+
+        - AXL 'too large' faults reduce the chunk size (AXL's suggested row count or half) and retry
+        - throttling (HTTP 503/429 from AXL) waits backoff * 2^retry seconds, halves the chunk
+          size and retries up to max_retries times in a row.  With a connector scheduler its
+          transport already retries throttled requests, so the TransportError is raised as is.
+
+        :param sql_statement: Informix-compliant SELECT statement (without SKIP/FIRST)
+        :param chunk_size: (int) rows requested per chunk
+        :param min_chunk_size: (int) smallest chunk size before the size fault is raised
+        :param max_retries: (int) consecutive throttled requests allowed before giving up
+        :param backoff: (float) seconds to wait after the first throttled request
+        :param chunk_timings: (list) optional list, a dict is appended for each request
+                              {'skip', 'first', 'rows', 'elapsed_time', 'fault'}
+        :return: generator of OrderedDict rows
+        """
+        statement = sql_statement.strip().rstrip(";")
+        select = SQL_SELECT.match(statement)
+        if not select:
+            raise IllegalSQLStatement(message="query_iter requires a SELECT statement without SKIP/FIRST")
+        select_body = statement[select.end():]
+
+        skip = 0
+        retries = 0
+        while True:
+            chunk_statement = f"SELECT SKIP {skip} FIRST {chunk_size} {select_body}"
+            start_time = time.time()
+            try:
+                rows = self._query_rows(chunk_statement)
+            except Fault as fault:
+                self._record_chunk(chunk_timings, skip, chunk_size, 0, start_time, fault.message)
+                smaller_chunk_size = axl_size_fault_page_size(fault, chunk_size)
+                if smaller_chunk_size is None or smaller_chunk_size < min_chunk_size:
+                    raise IllegalSQLStatement(message=fault.message)
+                logging.debug(f"query_iter: chunk size {chunk_size} too large, retrying with {smaller_chunk_size}")
+                chunk_size = smaller_chunk_size
+                continue
+            except TransportError as e:
+                self._record_chunk(chunk_timings, skip, chunk_size, 0, start_time, f"HTTP {e.status_code}")
+                if (e.status_code not in AXL_THROTTLE_STATUS_CODES or retries >= max_retries
+                        or getattr(self.connector, "scheduler", None)):
+                    raise
+                delay = backoff * 2 ** retries
+                retries += 1
+                chunk_size = max(min_chunk_size, chunk_size // 2)
+                logging.warning(f"query_iter: AXL throttled (HTTP {e.status_code}), retry {retries}/{max_retries} "
+                                f"in {delay:.1f} seconds with chunk size {chunk_size}")
+                time.sleep(delay)
+                continue
+
+            retries = 0
+            self._record_chunk(chunk_timings, skip, chunk_size, len(rows), start_time, None)
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            skip += len(rows)
+
+    @staticmethod
+    def _record_chunk(chunk_timings, skip, first, rows, start_time, fault):
+        elapsed_time = time.time() - start_time
+        logging.debug(f"query_iter: skip={skip} first={first} rows={rows} in {elapsed_time:.3f} seconds")
+        if chunk_timings is not None:
+            chunk_timings.append({"skip": skip, "first": first, "rows": rows,
+                                  "elapsed_time": elapsed_time, "fault": fault})
+
     @BaseAXLAPI.assert_supported
     def update(self, sql_statement):
         """Execute SQL update via Thin AXL
@@ -505,6 +901,7 @@ class ThinAXLAPI(BaseAXLAPI):
         """
         try:
             axl_resp = self.connector.service.executeSQLUpdate(sql=sql_statement)
+            self._invalidate_cluster_cache()
             return serialize_object(axl_resp)["return"]["rowsUpdated"]
         except Fault as fault:
             raise IllegalSQLStatement(message=fault.message)
@@ -0,0 +1,264 @@
+"""SimpleAXLAPI/ThinAXLAPI request helpers against stubbed AXL responses"""
+
+import re
+
+import pytest
+from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
+
+from ciscocucmapi.api.base import SimpleAXLAPI
+from ciscocucmapi.api.base import ThinAXLAPI
+from ciscocucmapi.exceptions import IllegalSQLStatement
+
+SEARCH = {"name": "%"}
+TAGS = {"name": ""}
+
+
+class FakeListAPI(SimpleAXLAPI):
+    """list() served from a list of names, faulting while 'first' is above max_first"""
+
+    def __init__(self, names, max_first=None, fault="Query request too large. Total rows matched: 5000 rows. "
+                                                  "Suggestive Row Fetch: less than 300 rows"):
+        super().__init__(None, None)
+        self.names = names
+        self.max_first = max_first
+        self.fault = fault
+        self.requests = []
+
+    def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None):
+        self.requests.append((skip, first))
+        if self.max_first is not None and first > self.max_first:
+            raise Fault(self.fault)
+        return [{"name": name} for name in self.names[skip:skip + first]]
+
+
+def names(count):
+    return [f"SEP{n:012d}" for n in range(count)]
+
+
+def test_iter_list_pages_until_a_short_page():
+    api = FakeListAPI(names(25))
+    rows = list(api.iter_list(SEARCH, TAGS, page_size=10))
+    assert [row["name"] for row in rows] == names(25)
+    assert api.requests == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_iter_list_full_last_page_needs_one_empty_page():
+    api = FakeListAPI(names(20))
+    assert len(list(api.iter_list(SEARCH, TAGS, page_size=10))) == 20
+    assert api.requests == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_iter_list_is_lazy():
+    api = FakeListAPI(names(25))
+    rows = api.iter_list(SEARCH, TAGS, page_size=10)
+    assert api.requests == []
+    next(rows)
+    assert api.requests == [(0, 10)]
+
+
+def test_iter_list_uses_axl_suggested_row_count_after_size_fault():
+    api = FakeListAPI(names(700), max_first=300)
+    page_timings = []
+    rows = list(api.iter_list(SEARCH, TAGS, page_size=1000, page_timings=page_timings))
+    assert len(rows) == 700
+    assert api.requests == [(0, 1000), (0, 300), (300, 300), (600, 300)]
+    assert [timing["fault"] is not None for timing in page_timings] == [True, False, False, False]
+    assert [timing["rows"] for timing in page_timings] == [0, 300, 300, 100]
+
+
+def test_iter_list_halves_page_size_without_suggested_row_count():
+    api = FakeListAPI(names(30), max_first=260, fault="Maximum AXL Memory Allocation Consumed")
+    assert len(list(api.iter_list(SEARCH, TAGS, page_size=1000))) == 30
+    assert api.requests == [(0, 1000), (0, 500), (0, 250)]
+
+
+def test_iter_list_raises_size_fault_below_min_page_size():
+    api = FakeListAPI(names(30), max_first=5)
+    with pytest.raises(Fault):
+        list(api.iter_list(SEARCH, TAGS, page_size=40, min_page_size=10))
+    assert api.requests == [(0, 40), (0, 20), (0, 10)]
+
+
+def test_iter_list_raises_other_faults():
+    api = FakeListAPI(names(30), max_first=5, fault="Item not valid: The specified Phone was not found")
+    with pytest.raises(Fault):
+        list(api.iter_list(SEARCH, TAGS, page_size=40))
+    assert api.requests == [(0, 40)]
+
+
+class FakeSQLAPI(ThinAXLAPI):
+    """_query_rows() served from a list of device names; errors are raised by the first requests"""
+
+    def __init__(self, names, errors=(), connector=None):
+        super().__init__(connector, None)
+        self.names = names
+        self.errors = list(errors)
+        self.statements = []
+
+    def _query_rows(self, sql_statement):
+        self.statements.append(sql_statement)
+        if self.errors:
+            raise self.errors.pop(0)
+        skip, first = map(int, re.match(r"SELECT SKIP (\d+) FIRST (\d+) ", sql_statement).groups())
+        return [{"name": name} for name in self.names[skip:skip + first]]
+
+
+def test_query_iter_sends_skip_first_chunks():
+    api = FakeSQLAPI(names(5))
+    rows = list(api.query_iter("select d.name from device d order by d.name;", chunk_size=2))
+    assert [row["name"] for row in rows] == names(5)
+    assert api.statements == ["SELECT SKIP 0 FIRST 2 d.name from device d order by d.name",
+                              "SELECT SKIP 2 FIRST 2 d.name from device d order by d.name",
+                              "SELECT SKIP 4 FIRST 2 d.name from device d order by d.name"]
+
+
+@pytest.mark.parametrize("sql_statement", [
+    "update device set description='x'",
+    "select first 10 name from device",
+    "SELECT SKIP 10 name from device",
+])
+def test_query_iter_requires_plain_select(sql_statement):
+    with pytest.raises(IllegalSQLStatement):
+        next(FakeSQLAPI([]).query_iter(sql_statement))
+
+
+def test_query_iter_reduces_chunk_size_after_size_fault():
+    api = FakeSQLAPI(names(5), errors=[Fault("Query request too large. Suggestive Row Fetch: less than 3 rows")])
+    chunk_timings = []
+    rows = list(api.query_iter("select name from device order by name", chunk_size=10, min_chunk_size=2,
+                               chunk_timings=chunk_timings))
+    assert len(rows) == 5
+    assert [(timing["skip"], timing["first"], timing["rows"]) for timing in chunk_timings] == \
+        [(0, 10, 0), (0, 3, 3), (3, 3, 2)]
+
+
+def test_query_iter_raises_other_faults_as_illegal_sql():
+    api = FakeSQLAPI(names(5), errors=[Fault("Cannot find column name")])
+    with pytest.raises(IllegalSQLStatement):
+        list(api.query_iter("select nmae from device"))
+
+
+def test_query_iter_retries_throttling_with_smaller_chunks():
+    api = FakeSQLAPI(names(5), errors=[TransportError(status_code=503), TransportError(status_code=429)])
+    rows = list(api.query_iter("select name from device order by name", chunk_size=8, min_chunk_size=2,
+                               backoff=0))
+    assert len(rows) == 5
+    assert [re.match(r"SELECT SKIP \d+ FIRST (\d+)", s).group(1) for s in api.statements] == ["8", "4", "2", "2", "2"]
+
+
+def test_query_iter_gives_up_after_max_retries():
+    api = FakeSQLAPI(names(5), errors=[TransportError(status_code=503)] * 3)
+    with pytest.raises(TransportError):
+        list(api.query_iter("select name from device", max_retries=2, backoff=0))
+    assert len(api.statements) == 3
+
+
+class FakeScheduledConnector(object):
+    scheduler = object()
+
+
+def test_query_iter_leaves_throttling_to_the_scheduler():
+    api = FakeSQLAPI(names(5), errors=[TransportError(status_code=503)], connector=FakeScheduledConnector())
+    with pytest.raises(TransportError):
+        list(api.query_iter("select name from device", backoff=0))
+    assert len(api.statements) == 1
+
+
+class FakeReconcileAPI(SimpleAXLAPI):
+    """add()/update() recorded, iter_list() answers the existing keys, models and choices fixed"""
+
+    _add_defaults = {"callManagerGroupName": "Default"}
+    models = {"add": {"name": None, "description": None, "callManagerGroupName": None},
+              "update": {"name": None, "description": None, "newName": None}}
+
+    def __init__(self, existing=(), get_choices=("uuid", "name"), bad=()):
+        super().__init__(None, None)
+        self.existing = list(existing)
+        self.get_choices = get_choices
+        self.bad = set(bad)
+        self.list_tags = []
+        self.sent = []
+
+    def _cached_model(self, target_model="add"):
+        return self.models[target_model]
+
+    def _get_choices(self):
+        return self.get_choices
+
+    def iter_list(self, searchCriteria=None, returnedTags=None, **kwargs):
+        self.list_tags.append(returnedTags)
+        return iter(self.existing)
+
+    def add(self, **kwargs):
+        return self._send("add", kwargs)
+
+    def update(self, **kwargs):
+        return self._send("update", kwargs)
+
+    def _send(self, action, kwargs):
+        if kwargs.get("name") in self.bad:
+            raise Fault(f"{action} rejected")
+        self.sent.append((action, kwargs))
+        return f"{{{action}-{kwargs['name']}}}"
+
+
+def test_add_update_many_adds_missing_and_updates_existing():
+    api = FakeReconcileAPI(existing=[{"name": "DP1"}])
+    records = [{"name": "DP1", "description": "old", "locationName": "HQ"},
+               {"name": "DP2", "description": "new", "newName": "DP3"}]
+    results = api.add_update_many(records, workers=2)
+
+    assert [(r["action"], r["result"], r["error"]) for r in results] == [("update", "{update-DP1}", None),
+                                                                      ("add", "{add-DP2}", None)]
+    assert api.list_tags == [{"name": ""}]
+    # data filtered to the add/update models; add defaults only applied on add
+    assert sorted(api.sent) == [("add", {"callManagerGroupName": "Default", "name": "DP2", "description": "new"}),
+                                ("update", {"name": "DP1", "description": "old"})]
+    assert records[0] == {"name": "DP1", "description": "old", "locationName": "HQ"}
+
+
+def test_add_update_many_matches_reference_and_empty_key_fields():
+    api = FakeReconcileAPI(existing=[{"name": "1000", "partition": {"_value_1": "PT_INTERNAL", "uuid": "{1}"}},
+                                     {"name": "2000", "partition": {"_value_1": None, "uuid": None}}])
+    records = [{"name": "1000", "partition": "PT_INTERNAL"},
+               {"name": "1000", "partition": "PT_OTHER"},
+               {"name": "2000", "partition": ""}]
+    results = api.add_update_many(records, key_fields=("name", "partition"))
+    assert [r["action"] for r in results] == ["update", "add", "update"]
+
+
+def test_add_update_many_key_fields_skip_uuid_choice():
+    api = FakeReconcileAPI(existing=[{"pattern": "1000", "routePartitionName": "PT"}],
+                           get_choices=("uuid", ["pattern", "routePartitionName"]))
+    assert api._add_update_key_fields() == ("pattern", "routePartitionName")
+
+
+def test_add_update_many_with_existing_keys_skips_list():
+    api = FakeReconcileAPI()
+    results = api.add_update_many([{"name": "DP1"}, {"name": "DP2"}], existing_keys={("DP2",)})
+    assert [r["action"] for r in results] == ["add", "update"]
+    assert api.list_tags == []
+
+
+def test_add_update_many_isolates_record_errors():
+    api = FakeReconcileAPI(existing=[{"name": "DP2"}], bad={"DP1", "DP2"})
+    records = [{"name": "DP1"}, {"name": "DP2"}, {"name": "DP3"}]
+    results = api.add_update_many(records)
+
+    assert [r["action"] for r in results] == ["add", "update", "add"]
+    assert [str(r["error"]) for r in results[:2]] == ["add rejected", "update rejected"]
+    assert [r["result"] for r in results] == [None, None, "{add-DP3}"]
+    assert results[2]["error"] is None
+
+
+def test_add_update_many_keeps_add_update_overrides():
+    class OverrideAPI(FakeReconcileAPI):
+        def add_update(self, obj_data):
+            return self._send("add_update", obj_data)
+
+    api = OverrideAPI()
+    results = api.add_update_many([{"name": "R1"}, {"name": "R2"}])
+    assert [(r["action"], r["result"]) for r in results] == [("add_update", "{add_update-R1}"),
+                                                             ("add_update", "{add_update-R2}")]
+    assert api.list_tags == []
@@ -1,10 +1,21 @@
 """CUCM AXL Device APIs."""
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from zeep.exceptions import Fault
+
 from .._internal_utils import flatten_signature_kwargs
+from ..exceptions import IllegalSQLStatement
+from ..helpers import extract_pkid_from_uuid
 from .base import DeviceAXLAPI
 from .base import SimpleAXLAPI
+from .base import axl_size_fault_page_size
+from .vendorconfig import VENDOR_CONFIG_BATCH_SIZE
 from .vendorconfig import VendorConfig
 
+PHONE_GET_WORKERS = 8       # getPhone requests in flight for Phone.get_many
+
 class CommonDeviceConfig(DeviceAXLAPI):
     _factory_descriptor = "common_device_config"
     supported_methods = ["model", "create", "add", "get", "list", "update", "remove", "apply", "reset", "add_update"]
@@ -319,6 +330,69 @@ class Phone(DeviceAXLAPI):
 
         return g
 
+    def get_many(self, names, returnedTags=None, workers=PHONE_GET_WORKERS, batch_size=VENDOR_CONFIG_BATCH_SIZE):
+        """Get many phones: concurrent getPhone requests plus a bulk vendorConfig read
+
+        get() spends two more serial round trips per phone on vendorConfig (a pkid lookup and a
+        dbreaddevicexml call).  Here the getPhone requests go over a thread pool and vendorConfig is
+        read for batch_size phones per SQL statement, then merged into each phone locally.
+        A batch AXL rejects as too large is retried with a smaller batch_size; the phones of a batch
+        that still fails, or whose xml is not found in bulk, fall back to dbreaddevicexml.  A failed
+        fallback sets the phone's 'error' and keeps its getPhone result.
+
+        :param names: iterable of phone names
+        :param returnedTags: returnedTags for getPhone.  vendorConfig is read only if included (or None).
+        :param workers: (int) getPhone requests in flight
+        :param batch_size: (int) phones per vendorConfig SQL statement
+        :return: list (in names order) of dicts {'name': name, 'result': phone dict or None,
+                 'error': Exception or None}
+        """
+        def get_phone(name):
+            try:
+                return {"name": name, "result": SimpleAXLAPI.get(self, name=name, returnedTags=returnedTags),
+                        "error": None}
+            except Exception as e:
+                logging.error(f"{self.__class__.__name__} get failed for {name}: {e}")
+                return {"name": name, "result": None, "error": e}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(get_phone, names))
+
+        if returnedTags is not None and "vendorConfig" not in returnedTags:
+            return results
+
+        # same rule as get(): only phones with a vendorConfig get it replaced with the parsed SQL version
+        phones = {extract_pkid_from_uuid(r["result"]["uuid"]): r for r in results
+                  if r["result"] is not None and (r["result"].get("vendorConfig") or {}).get("_value_1") is not None}
+        pkids = list(phones)
+        vendor_configs = {}
+        start = 0
+        while start < len(pkids):
+            batch = pkids[start:start + batch_size]
+            try:
+                vendor_configs.update(self.vendor_config.get_phone_vendor_configs(batch, batch_size=batch_size))
+            except (Fault, IllegalSQLStatement) as fault:
+                smaller_batch_size = axl_size_fault_page_size(fault, batch_size)
+                if smaller_batch_size:
+                    logging.debug(f"vendorConfig batch size {batch_size} too large, retrying with {smaller_batch_size}")
+                    batch_size = smaller_batch_size
+                    continue
+                logging.warning(f"bulk vendorConfig read failed for {len(batch)} phones, "
+                                f"falling back to dbreaddevicexml: {fault.message}")
+            start += len(batch)
+
+        for pkid, r in phones.items():
+            phone = r["result"]
+            if pkid in vendor_configs:
+                phone["vendorConfig"] = vendor_configs[pkid]
+                continue
+            try:
+                phone["vendorConfig"] = self.vendor_config._get_phone_vendor_config(phone["name"])["vendorConfig"]
+            except Exception as e:
+                logging.error(f"{self.__class__.__name__} vendorConfig read failed for {phone['name']}: {e}")
+                r["error"] = e
+        return results
+
     def update(self, **kwargs):
 
         LOCAL_DEBUG = True
@@ -342,7 +416,8 @@ class Phone(DeviceAXLAPI):
             vc_xml = self.vendor_config._dict_to_xml_str(vc_data)
 
             # run update - will return 'u' from original update regardless of outcome if VC update
-            r = self.vendor_config._update_phone_vendor_config(kwargs.get['name'], vc_xml)
+            r = self.vendor_config._update_phone_vendor_config(kwargs.get('name'), vc_xml,
+                                                             pkid=kwargs.get('uuid'))
 
             if LOCAL_DEBUG:
                 print(r)
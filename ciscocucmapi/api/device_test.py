@@ -0,0 +1,85 @@
+"""Phone.get_many: concurrent getPhone plus bulk vendorConfig reads against stubbed AXL responses"""
+
+import pytest
+from zeep.exceptions import Fault
+
+from ciscocucmapi.api.base import SimpleAXLAPI
+from ciscocucmapi.api.device import Phone
+from ciscocucmapi.exceptions import IllegalSQLStatement
+
+
+def pkid(n):
+    return f"00000000-0000-0000-0000-{n:012d}"
+
+
+class FakeVendorConfig(object):
+    """get_phone_vendor_configs() raises the listed errors first; dbreaddevicexml fails for names in bad"""
+
+    def __init__(self, errors=(), bad=()):
+        self.errors = list(errors)
+        self.bad = set(bad)
+        self.batches = []
+        self.single_reads = []
+
+    def get_phone_vendor_configs(self, pkids, batch_size):
+        self.batches.append(len(pkids))
+        if self.errors:
+            raise self.errors.pop(0)
+        return {pkid: {"source": "bulk"} for pkid in pkids}
+
+    def _get_phone_vendor_config(self, name):
+        self.single_reads.append(name)
+        if name in self.bad:
+            raise IllegalSQLStatement(message="dbreaddevicexml failed")
+        return {"pkid": None, "vendorConfig": {"source": "dbreaddevicexml"}}
+
+
+@pytest.fixture
+def phone(monkeypatch):
+    def get(self, name, returnedTags=None):
+        n = int(name[3:])
+        return {"name": name, "uuid": "{" + pkid(n).upper() + "}", "vendorConfig": {"_value_1": ["<x/>"]}}
+
+    monkeypatch.setattr(SimpleAXLAPI, "get", get)
+    api = object.__new__(Phone)
+    api.vendor_config = FakeVendorConfig()
+    return api
+
+
+def names(count):
+    return [f"SEP{n:012d}" for n in range(count)]
+
+
+def vendor_config_sources(results):
+    return [r["result"]["vendorConfig"]["source"] for r in results]
+
+
+def test_get_many_merges_bulk_vendor_configs(phone):
+    results = phone.get_many(names(5), batch_size=2)
+    assert [r["name"] for r in results] == names(5)
+    assert vendor_config_sources(results) == ["bulk"] * 5
+    assert phone.vendor_config.batches == [2, 2, 1]
+
+
+def test_size_fault_retries_the_batch_smaller(phone):
+    phone.vendor_config.errors = [Fault("Query request too large. Suggestive Row Fetch: less than 2 rows")]
+    results = phone.get_many(names(5), batch_size=4)
+    assert vendor_config_sources(results) == ["bulk"] * 5
+    assert phone.vendor_config.batches == [4, 2, 2, 1]
+    assert phone.vendor_config.single_reads == []
+
+
+def test_failed_batch_falls_back_to_dbreaddevicexml(phone):
+    phone.vendor_config.errors = [IllegalSQLStatement(message="Cannot find table")]
+    results = phone.get_many(names(5), batch_size=2)
+    assert vendor_config_sources(results) == ["dbreaddevicexml"] * 2 + ["bulk"] * 3
+    assert phone.vendor_config.single_reads == names(2)
+
+
+def test_failed_fallback_keeps_the_get_phone_result(phone):
+    phone.vendor_config.errors = [Fault("Cannot find table")]
+    phone.vendor_config.bad = {"SEP000000000001"}
+    results = phone.get_many(names(3), batch_size=2)
+    assert results[1]["result"]["name"] == "SEP000000000001"
+    assert isinstance(results[1]["error"], IllegalSQLStatement)
+    assert [r["error"] for r in (results[0], results[2])] == [None, None]
@@ -1,6 +1,8 @@
 """CUCM AXL User APIs."""
 
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from zeep.helpers import serialize_object
 
@@ -12,6 +14,10 @@ import logging
 
 # TODO: UserRank settings not fully deployed
 
+# UserRole permission writes
+PERMISSION_BATCH_SIZE = 200         # tkresources per INSERT ... SELECT statement
+PERMISSION_WRITE_WORKERS = 4        # Thin AXL requests in flight for row by row writes
+
 # Experiementally adding user_role
 # IN PROCESS NOW
 class AppUser(SimpleAXLAPI):
@@ -515,6 +521,7 @@ class UserRole(SimpleAXLAPI):
 
     def __init__(self, connector, object_factory):
         super().__init__(connector, object_factory)
+        self.permission_write_times = {}        # role name: seconds spent writing its permissions
 
     def _fetch_add_model(self):
         return {'name', 'description', 'permissions'}
@@ -1005,7 +1012,7 @@ class UserRole(SimpleAXLAPI):
         
         if application_name == '':
             sql_delete_all_resources = ("delete from functionroleresourcemap "
-                                        " where fkfunctionrole=(select pkid from functionrole as f where f.name='{role_name}')")
+                                        f" where fkfunctionrole=(select pkid from functionrole as f where f.name='{role_name}')")
         else:
             sql_delete_all_resources = ("delete from functionroleresourcemap "
                                         " where fkfunctionrole=(select pkid from functionrole as f where f.name='{role_name}')")
@@ -1028,55 +1035,120 @@ class UserRole(SimpleAXLAPI):
 
         return r        # count of deleted permissions
 
-    # NOT TESTED
-    def _add_all_permissions(self, role_name=None, role_pkid=None, permissions={}):
+    def _add_all_permissions(self, role_name=None, role_pkid=None, permissions={}, write_mode='batch'):
         """Add all permissions.
         Can assume that (a) role_name exists and that (b) no permissions exist yet
         If pkid for role is known it can be passed to speed up method
 
+        write_mode:
+            'batch'         one INSERT ... SELECT FROM typeresource per permission value (up to
+                            PERMISSION_BATCH_SIZE resources each).  Informix has no multi-row VALUES
+                            so resources sharing a permission value are inserted together.
+            'concurrent'    one INSERT per permission over a pool of PERMISSION_WRITE_WORKERS threads
+            'serial'        one INSERT per permission, one at a time (original behaviour)
+
+        The write time for the role is logged and kept in self.permission_write_times so the
+        modes can be compared.
+
         :param role_name:   userRole name
         :param role_pkid:   userRole by PKID (if known will speed up method)
         :param permissions: DICT of K/V pairs which are tkresource/permission already formatted and checked
-        
-        :return:  tbd
+        :param write_mode:  'batch' | 'concurrent' | 'serial'
+
+        :return:  (int) number of permission mappings inserted
         """
 
         LOCAL_DEBUG = False
 
         if role_pkid is None:
-            pass
             # have to get pkid with sql query
+            r = self.connector.sql.query(f"select pkid from functionrole where name='{role_name}'")
+            if len(r) == 0:
+                logging.error(f'_add_all_permissions: userRole {role_name} not found')
+                return 0
+            role_pkid = r[0].get('pkid', '')
 
         # check that permissions is not blank
         if permissions == {}:
-            pass
-        
-        current_count = len(permissions.keys())
+            return 0
 
-        for k, v in permissions.items():
-            # TEMP item: print out where we are in writing permissions due to it taking so long...
-            print(f'Role permissions to set: {current_count}')
-            current_count -= 1
-            # FUTURE ENHANCEMENT: This would be great as a call to a click function
-            # since this is the core library, this would need to be triggered by a passed variable.
-            # it doesn't belong here long-term
-
-            values = f"('{role_pkid}','{k}','{v}')"
-            sql_insert = f'INSERT INTO functionroleresourcemap (fkfunctionrole,tkresource,permission) VALUES {values};'
-            
-            if LOCAL_DEBUG:
-                print(sql_insert)
+        start_time = time.time()
+        if write_mode == 'batch':
+            inserted, statements = self._insert_permissions_batch(role_pkid, permissions)
+        elif write_mode == 'concurrent':
+            inserted = self._insert_permissions_concurrent(role_pkid, permissions)
+            statements = len(permissions)
+        else:
+            inserted = sum(self._insert_permission(role_pkid, k, v) for k, v in permissions.items())
+            statements = len(permissions)
+        elapsed_time = time.time() - start_time
 
-            try:
-                u = self.connector.sql.update(sql_insert)
-                if LOCAL_DEBUG:
-                    print('update returned:')
-                    print(u)
-            except Exception as e:
-                if LOCAL_DEBUG:
-                    print(e)
+        self.permission_write_times[role_name or role_pkid] = elapsed_time
+        logging.info(f'userRole [{role_name or role_pkid}] {inserted}/{len(permissions)} permissions written '
+                     f'({write_mode}, {statements} SQL statements) in {elapsed_time:.2f} seconds')
+        if LOCAL_DEBUG:
+            print(self.permission_write_times)
 
-        return '_add_all_permissions returned no value'       # TODO: give a better return for this (it's internal anyways)
+        return inserted
+
+    def _insert_permission(self, role_pkid, tkresource, permission):
+        """Single permission INSERT.  Returns number of rows inserted (0 on error)"""
+        values = f"('{role_pkid}','{tkresource}','{permission}')"
+        sql_insert = f'INSERT INTO functionroleresourcemap (fkfunctionrole,tkresource,permission) VALUES {values};'
+        try:
+            return int(self.connector.sql.update(sql_insert))
+        except Exception as e:
+            logging.debug(f'permission insert failed for tkresource {tkresource}: {e}')
+            return 0
+
+    def _insert_permissions_concurrent(self, role_pkid, permissions):
+        """Single permission INSERTs over a bounded thread pool.  Returns number of rows inserted"""
+        with ThreadPoolExecutor(max_workers=PERMISSION_WRITE_WORKERS) as executor:
+            results = executor.map(lambda item: self._insert_permission(role_pkid, *item), permissions.items())
+            return sum(results)
+
+    def _insert_permissions_batch(self, role_pkid, permissions):
+        """Grouped INSERT ... SELECT statements, one per permission value and batch of resources.
+
+        A batch that fails (or inserts fewer rows than expected) is retried row by row over the
+        thread pool so one bad tkresource does not lose the whole batch.
+
+        :return: tuple of (rows inserted, SQL statements sent)
+        """
+        by_permission = defaultdict(list)
+        for tkresource, permission in permissions.items():
+            by_permission[permission].append(tkresource)
+
+        inserted = 0
+        statements = 0
+        for permission, tkresources in by_permission.items():
+            for i in range(0, len(tkresources), PERMISSION_BATCH_SIZE):
+                batch = tkresources[i:i + PERMISSION_BATCH_SIZE]
+                enums = ','.join(f"'{tkresource}'" for tkresource in batch)
+                sql_insert = ('INSERT INTO functionroleresourcemap (fkfunctionrole,tkresource,permission) '
+                              f"SELECT '{role_pkid}', enum, '{permission}' FROM typeresource WHERE enum IN ({enums})")
+                statements += 1
+                try:
+                    rows = int(self.connector.sql.update(sql_insert))
+                except Exception as e:
+                    logging.warning(f'batched permission insert failed, retrying row by row: {e}')
+                    rows = 0
+
+                if rows == len(batch):
+                    inserted += rows
+                    continue
+
+                # partial or failed batch - insert what is missing one row at a time
+                existing = self.connector.sql.query(
+                    'SELECT tkresource FROM functionroleresourcemap '
+                    f"WHERE fkfunctionrole='{role_pkid}' AND tkresource IN ({enums})")
+                # rows, not the column: a query with no rows has no header to index
+                done = {str(row.get('tkresource')) for row in existing}
+                missing = {k: permission for k in batch if str(k) not in done}
+                statements += 1 + len(missing)
+                inserted += len(done) + self._insert_permissions_concurrent(role_pkid, missing)
+
+        return inserted, statements
 
     def _update_resource_permissions(self, role_name, permissions={}):
         """
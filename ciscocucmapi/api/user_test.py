@@ -0,0 +1,62 @@
+"""UserRole batched permission inserts (user.UserRole._insert_permissions_batch)"""
+
+import re
+
+from ciscocucmapi.api.user import UserRole
+from ciscocucmapi.result_table import ResultTable
+
+
+class FakeSQL(object):
+    """Thin AXL stand-in: batches write batch_rows rows, single inserts succeed unless listed in bad"""
+
+    def __init__(self, batch_rows=None, batch_error=False, existing=(), bad=()):
+        self.batch_rows = batch_rows
+        self.batch_error = batch_error
+        self.existing = list(existing)
+        self.bad = set(bad)
+        self.single_inserts = []
+
+    def update(self, sql):
+        if 'SELECT' in sql:
+            if self.batch_error:
+                raise Exception('batch rejected')
+            return self.batch_rows
+        tkresource = re.search(r"VALUES \('[^']*','([^']*)'", sql).group(1)
+        if tkresource in self.bad:
+            raise Exception('bad tkresource')
+        self.single_inserts.append(tkresource)
+        return 1
+
+    def query(self, sql):
+        if not self.existing:
+            return ResultTable()
+        return ResultTable(('tkresource',), [(tkresource,) for tkresource in self.existing])
+
+
+def user_role(sql):
+    role = object.__new__(UserRole)
+    role.connector = type('FakeConnector', (), {'sql': sql})()
+    return role
+
+
+def test_full_batch():
+    sql = FakeSQL(batch_rows=3)
+    inserted, statements = user_role(sql)._insert_permissions_batch('role', {'1': 1, '2': 1, '3': 1})
+    assert (inserted, statements) == (3, 1)
+    assert sql.single_inserts == []
+
+
+def test_failed_batch_with_empty_result_retries_row_by_row():
+    sql = FakeSQL(batch_error=True, bad={'2'})
+    inserted, statements = user_role(sql)._insert_permissions_batch('role', {'1': 1, '2': 1, '3': 1})
+    assert inserted == 2
+    assert statements == 1 + 1 + 3
+    assert sorted(sql.single_inserts) == ['1', '3']
+
+
+def test_partial_batch_inserts_only_missing_rows():
+    sql = FakeSQL(batch_rows=2, existing=['1', '3'])
+    inserted, statements = user_role(sql)._insert_permissions_batch('role', {'1': 1, '2': 1, '3': 1})
+    assert inserted == 3
+    assert statements == 1 + 1 + 1
+    assert sql.single_inserts == ['2']
@@ -26,22 +26,27 @@ STATUS:
         -GET
         -UDPATE
 
-    TODO: ALSO, determined that the DEPTH of the vendorConfig is not 1 ...it is multiple depths
-    Need to update PATCH and parsing methods to ensure they can handle this.
-    UPDATE/GET should be fine as is
-    Then LOCAL_DEBUG lines should be removed and clean up       1/2024
+    vendorConfig has multiple depths.  Parsing, writing and patching go through
+    vendorconfig_codec which handles any depth (patch params use '/' for depth).
+    TODO: LOCAL_DEBUG lines should be removed and clean up       1/2024
 
 """
 
 #from .base import SimpleAXLAPI
+from ..helpers import extract_pkid_from_uuid
 from ..sql_utils import get_device_pkid
+from ..vendorconfig_codec import dict_to_xml
+from ..vendorconfig_codec import parse_fragment
+from ..vendorconfig_codec import patch_xml
+from ..vendorconfig_codec import xml_to_dict
 
-from lxml import etree
 import xmltodict 
-import re
-from collections import OrderedDict
 import click  # delete me after initial testin gis done
 
+# Phone vendorConfig xml is stored in one of these tables depending on its size (read by dbreaddevicexml)
+DEVICE_XML_TABLES = ("devicexml4k", "devicexml8k", "devicexml16k")
+VENDOR_CONFIG_BATCH_SIZE = 500     # device pkids per bulk vendorConfig SQL statement
+
 
 # Experimental
 class VendorConfig(object):
@@ -72,9 +77,7 @@ class VendorConfig(object):
         _xml_string_to_dict
         _dict_to_xml_str
 
-    TODO: Determined that the vendor config DOES have depth greater than 1 and the routines
-        where written assuming a flat list of XML tags.  Need to update the PATCH items
-        to support additional depth
+    vendorConfig can have depth greater than 1.  Conversion and patching use vendorconfig_codec.
 
     """
             
@@ -101,8 +104,8 @@ class VendorConfig(object):
         
         current_dict = input_dict
         for key in keys[:-1]:
-            if key not in current_dict:
-                current_dict[key] = {}  # Creating a nested dictionary if the key doesn't exist
+            if current_dict.get(key) is None:
+                current_dict[key] = {}  # Creating a nested dictionary if the key doesn't exist or is empty
             current_dict = current_dict[key]  # Traversing the dictionary based on the path
         
         current_dict[keys[-1]] = value  # Adding/updating the value at the specified path
@@ -110,28 +113,8 @@ class VendorConfig(object):
         return input_dict  # Returning the updated dictionary
 
     def _xml_str_to_dict(self, xml_string):
-        # Parse the XML string using etree.XMLParser to handle XML with multiple levels of depth
-
-        def _process_element(element):
-            result = {}
-            if element.text and element.text.strip():
-                return element.text.strip()
-
-            for child in element:
-                result[child.tag] = _process_element(child)
-
-            return result
-
-        if xml_string is None:
-            xml_string = ''
-            
-        root = etree.fromstring('<root>' + xml_string + '</root>')
-
-        result_dict = {}
-        for element in root:
-            result_dict[element.tag] = _process_element(element)
-
-        return result_dict
+        """vendorConfig xml string (any depth) to dict.  See vendorconfig_codec.xml_to_dict"""
+        return xml_to_dict(xml_string)
 
     def _dict_to_xml_str(self, vc):
         """ Utility to pre-process vendorConfig.
@@ -141,42 +124,12 @@ class VendorConfig(object):
         :param vc:   string or dict of vendorConfig object (just the value without 'vendorConfig' as a key)        
         :return:     string formatted for xml
         """
-
-        LOCAL_DEBUG = False
-
-        if isinstance(vc, (dict, OrderedDict)):
-            if LOCAL_DEBUG:
-                print(f'TYPE OF VENDORCONFIG: {type(vc)}')
-
-            # convert dict to XML string using xmltodict.  First add a root node (which we will later remove)
-            #data = {'_temp_tag_' : vc['vendorConfig']}
-            data = {'_temp_tag_' : vc}
-            vc_xml = xmltodict.unparse(data, encoding='unicode')
-            vc_xml = re.sub('<\?xml.*\?>', '', str(vc_xml))  # strip initial XML declaration
-            vc_xml = re.sub('<_temp_tag_>', '', str(vc_xml))
-            vc_xml = re.sub('</_temp_tag_>', '', str(vc_xml))
-            vc_xml = re.sub('\n', '', str(vc_xml))
-            #vc['vendorConfig'] = vc_xml
-            vc = vc_xml
-        else:
-            # if already a string then don't process it
-            pass
-            if LOCAL_DEBUG:
-                print('Already found a STRING - SKIP Processing')
-
-        return vc
+        return dict_to_xml(vc)
 
     # experimental for getting update to work without sql
     def _dict_to_lxml_elements(self, input_dict):
-        elements_list = []  # List to store individual LXML elements
-        
-        for key, value in input_dict.items():
-            # Creating an element with the key as the tag name and value as text
-            element = etree.Element(key)
-            element.text = str(value)
-            elements_list.append(element)  # Appending the element to the list
-    
-        return elements_list  # Returning the list of independent LXML elements
+        # independent LXML elements (any depth) of the vendorConfig built by the codec
+        return list(parse_fragment(dict_to_xml(input_dict)))
 
     # experimental
     def _vc_to_dict(self, vc_data):
@@ -299,32 +252,12 @@ class VendorConfig(object):
 
         LOCAL_DEBUG = False
 
-        # get pkid of device
-        g = get_device_pkid(self.connector, name)
-        pkid = g[0].get('pkid','')
+        pkid, vc_str = self._read_phone_vendor_config_xml(name)
 
-        if LOCAL_DEBUG:
-            print(g)
-            print(pkid)
-        
         # default return dictionary - assumed vendorConfig does not exist
         ret = {'pkid': pkid, 'vendorConfig': {}}
 
-        # run stored procedure on pkid
-        sql = f"execute procedure dbreaddevicexml('{pkid}')"
-        u = self.connector.sql.query(sql)
-
-        if LOCAL_DEBUG:
-            print('RESPONSES FROM DB READ')
-            print(u)
-            print('LAST SENT XML')
-            print(self.connector.history.last_sent_xml)
-            print('LAST RECEIVED XML')
-            print(self.connector.history.last_received_xml)
-
-
-        # get xml string and return it as a dict
-        vc_str = u[0].get('expression','')
+        # return xml string as a dict
         vc_dict = self._xml_str_to_dict(vc_str)
 
         if LOCAL_DEBUG:
@@ -337,12 +270,65 @@ class VendorConfig(object):
 
         return ret
 
-    def _update_phone_vendor_config(self, name, vc_xml):
+    def _read_phone_vendor_config_xml(self, name):
+        """Return (pkid, vendorConfig xml string) of a phone using dbreaddevicexml"""
+
+        LOCAL_DEBUG = False
 
+        # get pkid of device
         g = get_device_pkid(self.connector, name)
         pkid = g[0].get('pkid','')
 
-        sql = f"execute procedure dbwritedevicexml('{pkid}','{vc_xml}'"
+        # run stored procedure on pkid
+        sql = f"execute procedure dbreaddevicexml('{pkid}')"
+        u = self.connector.sql.query(sql)
+
+        if LOCAL_DEBUG:
+            print('RESPONSES FROM DB READ')
+            print(u)
+            print('LAST SENT XML')
+            print(self.connector.history.last_sent_xml)
+            print('LAST RECEIVED XML')
+            print(self.connector.history.last_received_xml)
+
+        return pkid, u[0].get('expression','') or ''
+
+    def get_phone_vendor_configs(self, pkids, batch_size=VENDOR_CONFIG_BATCH_SIZE):
+        """Bulk version of _get_phone_vendor_config: read the vendorConfig of many phones with one
+        SQL statement per batch_size phones instead of a dbreaddevicexml call (plus a pkid lookup) each
+
+        Reads the devicexml tables dbreaddevicexml reads from.  Phones with no xml row are not in the result.
+
+        :param pkids:       iterable of device pkids (or uuids)
+        :param batch_size:  device pkids per SQL statement
+        :return:            dict of pkid -> vendorConfig dict
+        """
+        pkids = [extract_pkid_from_uuid(pkid) for pkid in pkids]
+        vendor_configs = {}
+        for i in range(0, len(pkids), batch_size):
+            pkid_list = ",".join(f"'{pkid}'" for pkid in pkids[i:i + batch_size])
+            sql = " union all ".join(f"select fkdevice, xml from {table} where fkdevice in ({pkid_list})"
+                                     for table in DEVICE_XML_TABLES)
+            _, rows = self.connector.sql.query_tuples(sql)
+            for fkdevice, xml in rows:
+                if xml and fkdevice not in vendor_configs:
+                    vendor_configs[fkdevice] = self._xml_str_to_dict(xml)
+        return vendor_configs
+
+    def _update_phone_vendor_config(self, name, vc_xml, pkid=None):
+        """Write a phone's vendorConfig xml with dbwritedevicexml
+
+        :param name:    name of phone (used to look up the pkid when not given)
+        :param vc_xml:  vendorConfig xml string
+        :param pkid:    optional pkid or uuid of the phone (saves the pkid lookup)
+        """
+        if pkid:
+            pkid = extract_pkid_from_uuid(pkid)
+        else:
+            g = get_device_pkid(self.connector, name)
+            pkid = g[0].get('pkid','')
+
+        sql = f"execute procedure dbwritedevicexml('{pkid}','{vc_xml}')"
 
         r = self.connector.sql.update(sql)
 
@@ -372,34 +358,18 @@ class VendorConfig(object):
         """
         LOCAL_DEBUG = False
 
-        g = self._get_phone_vendor_config(name)
-
-        if LOCAL_DEBUG:
-            print('UPDATE_PHONE_VENDOR_CONFIG: Just called Get_phone_vendor_config and returned')
-            print(g)
-
-        if g['vendorConfig'] is None:           #confirm we have a dictionary
-            g['vendorConfig'] = {}
-        
-        # add/udpate parameter  in 
-        updated_vc = self._patch_dict(g['vendorConfig'], param, value)
-        #g['vendorConfig'][param] = value        # add or update the item passed (syntax is NOT checked)
+        # patch the xml read from the database directly (no dict round trip)
+        pkid, vc_xml = self._read_phone_vendor_config_xml(name)
+        v_xml = patch_xml(vc_xml, param, value)
 
         if LOCAL_DEBUG:
             print(f'New Settings:')
-            print(updated_vc)
-        
-        # convert dict to XML string using xmltodict.  First add a root node (which we will later remove)
-        data = {'data' : updated_vc}
-        v_xml = xmltodict.unparse(data, encoding='unicode')
-        v_xml = re.sub('<\?xml.*\?>\n', '', str(v_xml))  # strip initial XML declaration
-        v_xml = re.sub('<data>', '', str(v_xml))
-        v_xml = re.sub('</data>', '', str(v_xml))
-        
+            print(v_xml)
+
         if LOCAL_DEBUG:
             print('\n\nTRYING DB WRITE')
 
-        sql = "execute procedure dbwritedevicexml('" + g['pkid'] + "','"  + str(v_xml) + "')"
+        sql = "execute procedure dbwritedevicexml('" + pkid + "','"  + str(v_xml) + "')"
 
         if LOCAL_DEBUG: 
             print ('\n\n')
@@ -446,14 +416,8 @@ class VendorConfig(object):
             # perform check for open tag, if found then proceed
             vc_xml = vc_data
         
-        if isinstance(vc_data, (dict,OrderedDict)):
-            # convert dict to XML string using xmltodict.  First add a root node (which we will later remove)
-            data = {'_temp_tag_' : vc_data}
-            vc_xml = xmltodict.unparse(data, encoding='unicode')
-            vc_xml = re.sub('<\?xml.*\?>', '', str(vc_xml))  # strip initial XML declaration
-            vc_xml = re.sub('<_temp_tag_>', '', str(vc_xml))
-            vc_xml = re.sub('</_temp_tag_>', '', str(vc_xml))
-            vc_xml = re.sub('\n', '', str(vc_xml))
+        if isinstance(vc_data, dict):
+            vc_xml = dict_to_xml(vc_data)
 
         # Q: do we need any other checks for characters like ' " to prevent sql injection issues?
 
@@ -479,7 +443,7 @@ class VendorConfig(object):
         replacing the entire value.
 
         NOTE: There is no error checking to validate that "param" is a valid entry
-        TODO: Need to handle a parameter that is multiple depth by using a delimiter (/)
+        Nested parameters use a delimiter (/), ex: 'webAdmin/adminPassword'
 
         :param: parameter string within vendorConfig to be edited (case sensitive)
         :value: value to apply to the single parameter
@@ -501,9 +465,8 @@ class VendorConfig(object):
         if vc is None:           #confirm we have a dictionary
             vc = {}
 
-        # TODO: this add needs to parse for the delimiter and add the element at whatever
-        # depth is required.  Parent dicts should be created alone the way
-        vc[param] = value        # add or update the item passed (syntax is NOT checked)
+        # add or update the item passed (syntax is NOT checked).  '/' in param gives the depth
+        vc = self._patch_dict(vc, param, value)
 
         u = self.update_sql(vc, pkid)
 
@@ -0,0 +1,359 @@
+"""Asynchronous AXL connector using zeep's AsyncClient
+
+Bulk audits (thousands of independent getPhone/getLine calls) are latency bound.  This connector
+sends AXL requests over zeep's httpx based AsyncTransport so many can be in flight at once:
+
+    async def audit(names):
+        async with UCMAXLAsyncConnector(username=..., password=..., fqdn=..., wsdl=...) as axl:
+            return await asyncio.gather(*(axl.phone.get(name=name) for name in names))
+
+The number of requests in flight is capped by max_concurrency (a semaphore) and throttled requests
+(HTTP 503/429 from AXL) are retried with exponential backoff, so gather() can be handed thousands
+of calls without overrunning CUCM's AXL throttling.  With a scheduler (AXLScheduler, the same
+argument as UCMAXLConnector) requests go through its adaptive pacing (AsyncScheduledTransport),
+shared with the synchronous connectors to the cluster, and the transport does the retrying instead.
+
+add/update/remove and sql.update drop the object cache entries they make stale, the same as the
+synchronous wrappers.
+
+API wrappers support the base AXL verbs (get, list, add, update, remove, options, add_update and
+sql.query/sql.update).  get and list go through the object cache like the synchronous wrappers.
+A verb the wrapper class overrides (ex: Phone.update writing vendorConfig with SQL, UserRole,
+DevicePool.add defaults) runs the synchronous wrapper in a worker thread, over a UCMAXLConnector
+built on first use with the same credentials, scheduler and object cache.  model() and create()
+need no I/O and are passed through to the synchronous wrapper.
+
+Requires httpx (pip install "zeep[async]").
+"""
+
+import asyncio
+import logging
+from copy import deepcopy
+
+from zeep import AsyncClient
+from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
+from zeep.helpers import serialize_object
+from zeep.proxy import AsyncServiceProxy
+from zeep.transports import AsyncTransport
+
+from ._internal_utils import filter_get_choice_criteria
+from ._internal_utils import nullstring_dict
+from .api.base import AXL_THROTTLE_STATUS_CODES
+from .api.base import SimpleAXLAPI
+from .api.base import ThinAXLAPI
+from .connectors import LazyAPI
+from .connectors import UCMAXLConnector
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .exceptions import IllegalSQLStatement
+from .scheduler import AsyncScheduledTransport
+from .helpers import filter_attributes_depth_one
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# AXL requests in flight per connector.  CUCM queues (then throttles with HTTP 503) above a
+# handful of concurrent AXL requests per node, so keep this modest.
+DEFAULT_MAX_CONCURRENCY = 10
+THROTTLE_RETRIES = 5
+THROTTLE_BACKOFF = 2.0
+
+
+class UCMAXLAsyncConnector(UCSOAPConnector):
+    """UCM AXL API Connector with awaitable API wrappers
+
+    Takes the same arguments as UCMAXLConnector plus:
+
+    :param max_concurrency: (int) AXL requests allowed in flight at once
+    :param max_retries: (int) retries of a throttled request before the TransportError is raised
+                        (not used with a scheduler, its transport retries)
+    :param backoff: (float) seconds to wait after the first throttled response (doubles each retry)
+    """
+
+    _ENV = UCMAXLConnector._ENV
+    _client_class = AsyncClient
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, max_retries=THROTTLE_RETRIES,
+                 backoff=THROTTLE_BACKOFF, **kwargs):
+        if httpx is None:
+            raise ImportError('UCMAXLAsyncConnector requires httpx (pip install "zeep[async]")')
+
+        self._sync_kwargs = kwargs
+        self._sync_connector = None
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        connection_kwargs["binding_name"] = "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding"
+        connection_kwargs["address"] = "https://{fqdn}:8443/axl/".format(**connection_kwargs)
+        del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
+        super().__init__(**connection_kwargs)
+        # Client.create_service() builds a synchronous ServiceProxy even on an AsyncClient
+        binding = self._client.wsdl.bindings[connection_kwargs["binding_name"]]
+        self._service = AsyncServiceProxy(self._client, binding, address=connection_kwargs["address"])
+
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._api_wrappers = {}
+
+        # counters for tuning max_concurrency
+        self.requests = 0
+        self.throttled = 0
+
+    def _build_transport(self, username, password, tls_verify):
+        """zeep AsyncTransport (httpx) with basic auth.  WSDL loading stays synchronous."""
+        auth = httpx.BasicAuth(username or "", password or "")
+        clients = {"client": httpx.AsyncClient(auth=auth, verify=tls_verify, timeout=self._timeout),
+                   "wsdl_client": httpx.Client(auth=auth, verify=tls_verify, timeout=self._timeout)}
+        if self.scheduler:
+            return AsyncScheduledTransport(self.scheduler, **clients)
+        return AsyncTransport(**clients)
+
+    def __getattr__(self, name):
+        """Build the async wrapper for any API attribute of UCMAXLConnector (sql, phone, udp, ...)"""
+        lazy_api = vars(UCMAXLConnector).get(name)
+        if not isinstance(lazy_api, LazyAPI):
+            raise AttributeError(f"{self.__class__.__name__} has no attribute '{name}'")
+
+        api = self._api_wrappers.get(lazy_api.api_class)
+        if api is None:
+            sync_api = lazy_api.api_class(self, lazy_api.object_factory)
+            if isinstance(sync_api, ThinAXLAPI):
+                api = AsyncThinAXLAPI(sync_api)
+            else:
+                api = AsyncAXLAPI(sync_api, name)
+            self._api_wrappers[lazy_api.api_class] = api
+        setattr(self, name, api)
+        return api
+
+    async def call(self, operation, **kwargs):
+        """Await one AXL operation, limited by the semaphore and retried while AXL is throttling
+
+        With a scheduler, AsyncScheduledTransport has already retried a throttled request.
+
+        :param operation: AXL operation name (ex: 'getPhone')
+        :param kwargs: operation arguments
+        :return: zeep response object
+        """
+        retries = 0
+        while True:
+            async with self._semaphore:
+                self.requests += 1
+                try:
+                    return await getattr(self.service, operation)(**kwargs)
+                except TransportError as e:
+                    if (e.status_code not in AXL_THROTTLE_STATUS_CODES or retries >= self.max_retries
+                            or self.scheduler):
+                        raise
+                    self.throttled += 1
+                    status_code = e.status_code
+
+            # back off outside the semaphore so other requests are not blocked by the wait
+            delay = self.backoff * 2 ** retries
+            retries += 1
+            logging.warning(f"{operation}: AXL throttled (HTTP {status_code}), "
+                            f"retry {retries}/{self.max_retries} in {delay:.1f} seconds")
+            await asyncio.sleep(delay)
+
+    @property
+    def sync_connector(self):
+        """UCMAXLConnector to the same cluster (built on first use) for the wrapper overrides
+
+        It shares this connector's scheduler and object cache.
+        """
+        if self._sync_connector is None:
+            self._sync_connector = UCMAXLConnector(**dict(self._sync_kwargs, scheduler=self.scheduler,
+                                                          object_cache=self.object_cache))
+        return self._sync_connector
+
+    async def call_sync(self, method, *args, **kwargs):
+        """Run a synchronous connector method in a worker thread, limited by the semaphore"""
+        async with self._semaphore:
+            self.requests += 1
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def get_ccm_version(self, processNodeName=None):
+        axl_resp = await self.call("getCCMVersion", processNodeName=processNodeName)
+        return serialize_object(axl_resp)["return"]["componentVersion"]["version"]
+
+    async def close(self):
+        await self.client.transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class AsyncAXLAPI(object):
+    """Awaitable version of a SimpleAXLAPI wrapper
+
+    Request building and response serialization are shared with the synchronous wrapper;
+    only the AXL request itself is awaited.  Verbs the wrapper class overrides are sent to the
+    synchronous wrapper of connector.sync_connector (see _sync_override).
+    """
+
+    def __init__(self, api, name):
+        self.api = api
+        self.connector = api.connector
+        self._name = name
+
+    def __getattr__(self, name):
+        # model(), create(), factory_descriptor, etc. do not talk to AXL
+        return getattr(self.api, name)
+
+    def _check_supported(self, method):
+        if method not in self.api.supported_methods:
+            raise AttributeError(f"{self.api.__class__.__name__} API does not support '{method}' method.")
+
+    async def _call(self, action, **kwargs):
+        return await self.connector.call("".join([action, self.api.__class__.__name__]), **kwargs)
+
+    def _sync_override(self, method):
+        """The synchronous wrapper's method when the wrapper class overrides the SimpleAXLAPI verb, else None
+
+        Overrides add request logic the awaitable verbs do not have (extra SQL, defaults, ...), so they
+        are run as they are on a synchronous connector.
+        """
+        if getattr(type(self.api), method) is getattr(SimpleAXLAPI, method):
+            return None
+        return getattr(getattr(self.connector.sync_connector, self._name), method)
+
+    async def _read_through(self, action, criteria, fetch):
+        """Awaitable BaseAXLAPI._read_through (same cache entries as the synchronous wrapper)"""
+        obj_type = self.api.__class__.__name__
+        cache = self.api._object_cache(obj_type)
+        if cache is None:
+            return await fetch()
+        hit, value = cache.get(self.connector.cluster_key, obj_type, action, criteria)
+        if not hit:
+            value = await fetch()
+            cache.set(self.connector.cluster_key, obj_type, action, criteria, value)
+        return value
+
+    async def _write(self, action, **kwargs):
+        axl_resp = await self._call(action, **kwargs)
+        self.api._invalidate_cache()
+        return serialize_object(axl_resp)["return"]
+
+    async def get(self, returnedTags=None, **kwargs):
+        """Get method for API endpoint"""
+        self._check_supported("get")
+        override = self._sync_override("get")
+        if override:
+            if returnedTags is not None:
+                kwargs["returnedTags"] = returnedTags
+            return await self.connector.call_sync(override, **kwargs)
+        if isinstance(returnedTags, list):
+            returnedTags = nullstring_dict(returnedTags)
+        get_kwargs = dict(kwargs, returnedTags=returnedTags)
+
+        async def fetch():
+            return self.api._axl_object_result(await self._call("get", **get_kwargs))
+        return await self._read_through("get", get_kwargs, fetch)
+
+    async def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None):
+        """Fetch a list of API endpoint objects (see SimpleAXLAPI.list)"""
+        self._check_supported("list")
+        override = self._sync_override("list")
+        if override:
+            list_kwargs = {"searchCriteria": searchCriteria, "returnedTags": returnedTags, "skip": skip, "first": first}
+            return await self.connector.call_sync(override, **{k: v for k, v in list_kwargs.items() if v is not None})
+        searchCriteria, returnedTags = self.api._list_defaults(searchCriteria, returnedTags)
+        list_kwargs = {"searchCriteria": searchCriteria, "returnedTags": returnedTags, "skip": skip, "first": first}
+
+        async def fetch():
+            return self.api._axl_list_result(await self._call("list", **list_kwargs))
+        return await self._read_through("list", list_kwargs, fetch)
+
+    async def add(self, **kwargs):
+        """Add method for API endpoint"""
+        self._check_supported("add")
+        override = self._sync_override("add")
+        if override:
+            return await self.connector.call_sync(override, **kwargs)
+        return await self._write("add", **{self.api._return_name: kwargs})
+
+    async def update(self, **kwargs):
+        """Update method for API endpoint"""
+        self._check_supported("update")
+        override = self._sync_override("update")
+        if override:
+            return await self.connector.call_sync(override, **kwargs)
+        return await self._write("update", **kwargs)
+
+    async def remove(self, **kwargs):
+        """Remove method for API endpoint"""
+        self._check_supported("remove")
+        override = self._sync_override("remove")
+        if override:
+            return await self.connector.call_sync(override, **kwargs)
+        return await self._write("remove", **kwargs)
+
+    async def options(self, uuid, returnedChoices=None):
+        """Return options for selected API endpoints"""
+        self._check_supported("options")
+        operation = "".join(["get", self.api.__class__.__name__, "Options"])
+        axl_resp = await self.connector.call(operation, uuid=uuid, returnedChoices=returnedChoices)
+        return serialize_object(axl_resp)["return"][self.api._return_name]
+
+    async def add_update(self, obj_data):
+        """Awaitable add_update: GET by the identifiers in obj_data, then UPDATE if found or ADD if not
+
+        Same rules as SimpleAXLAPI.add_update.
+        """
+        self._check_supported("add_update")
+        override = self._sync_override("add_update")
+        if override:
+            return await self.connector.call_sync(override, obj_data)
+        choice_criteria = filter_get_choice_criteria(choice_criteria=obj_data, valid_choices=self.api._get_choices())
+        returned_tags = nullstring_dict(choice_criteria)
+
+        try:
+            await self._call("get", returnedTags=returned_tags, **choice_criteria)
+        except Fault:
+            # ADD routine if not found
+            add_data = deepcopy(self.api._add_defaults)
+            add_data.update(obj_data)
+            add_data = filter_attributes_depth_one(self.api._cached_model("add"), add_data)
+            return await self.add(**add_data)
+
+        # UPDATE routine
+        update_data = filter_attributes_depth_one(self.api._cached_model("update"), deepcopy(obj_data))
+        return await self.update(**update_data)
+
+
+class AsyncThinAXLAPI(object):
+    """Awaitable version of the Thin AXL (sql) wrapper"""
+
+    def __init__(self, api):
+        self.api = api
+        self.connector = api.connector
+
+    async def query(self, sql_statement):
+        """Execute SQL query via Thin AXL
+
+        :param sql_statement: Informix-compliant SQL statement
+        :return: ResultTable
+        """
+        try:
+            axl_resp = await self.connector.call("executeSQLQuery", sql=sql_statement)
+        except Fault as fault:
+            raise IllegalSQLStatement(message=fault.message)
+        return self.api._sql_result(axl_resp)
+
+    async def update(self, sql_statement):
+        """Execute SQL update via Thin AXL
+
+        :param sql_statement: Informix-compliant SQL statement
+        :return: (int) number of rows updated
+        """
+        try:
+            axl_resp = await self.connector.call("executeSQLUpdate", sql=sql_statement)
+        except Fault as fault:
+            raise IllegalSQLStatement(message=fault.message)
+        self.api._invalidate_cluster_cache()
+        return serialize_object(axl_resp)["return"]["rowsUpdated"]
@@ -0,0 +1,229 @@
+"""UCMAXLAsyncConnector over a mocked httpx transport (httpx itself is not needed)"""
+
+import asyncio
+import threading
+
+import pytest
+import zeep.transports
+from zeep.exceptions import TransportError
+from zeep.proxy import AsyncServiceProxy
+
+from ciscocucmapi import async_connector
+from ciscocucmapi.async_connector import UCMAXLAsyncConnector
+from ciscocucmapi.connectors import UCMAXLConnector
+from ciscocucmapi.scheduler import AsyncScheduledTransport
+from ciscocucmapi.scheduler import AXLScheduler
+
+WSDL = "ciscocucmapi/schema/12.5/AXLAPI.wsdl"
+UUID = "{11111111-2222-3333-4444-555555555555}"
+
+RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+<soapenv:Body>{body}</soapenv:Body>
+</soapenv:Envelope>"""
+
+BODIES = {
+    "updateDevicePool": f'<ns:updateDevicePoolResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+                        f'<return>{UUID}</return></ns:updateDevicePoolResponse>',
+    "executeSQLUpdate": '<ns:executeSQLUpdateResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5">'
+                        '<return><rowsUpdated>1</rowsUpdated></return></ns:executeSQLUpdateResponse>',
+    "getDevicePool": f'<ns:getDevicePoolResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5"><return>'
+                     f'<devicePool uuid="{UUID}"><name>DP1</name></devicePool></return></ns:getDevicePoolResponse>',
+    "listDevicePool": f'<ns:listDevicePoolResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5"><return>'
+                      f'<devicePool uuid="{UUID}"><name>DP1</name></devicePool></return></ns:listDevicePoolResponse>',
+}
+
+
+class FakeHTTPResponse(object):
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"Content-Type": "text/xml; charset=utf-8"}
+        self.cookies = {}
+        self.encoding = "utf-8"
+
+    def read(self):
+        return self.content
+
+
+class FakeAsyncClient(object):
+    """httpx.AsyncClient stand-in: answers AXL operations, the first 'throttle' posts with HTTP 503"""
+
+    throttle = 0
+
+    def __init__(self, **kwargs):
+        self.headers = {}
+        self.posts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def post(self, address, content=None, headers=None):
+        operation = headers["SOAPAction"].strip('"').split(" ")[-1]
+        self.posts.append(operation)
+        if len(self.posts) <= self.throttle:
+            return FakeHTTPResponse(503, b"Service Unavailable")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return FakeHTTPResponse(200, RESPONSE.format(body=BODIES[operation]).encode())
+
+    async def aclose(self):
+        pass
+
+
+class FakeClient(object):
+    def __init__(self, **kwargs):
+        self.headers = {}
+
+
+class FakeHTTPX(object):
+    AsyncClient = FakeAsyncClient
+    Client = FakeClient
+
+    @staticmethod
+    def BasicAuth(username, password):
+        return (username, password)
+
+
+@pytest.fixture
+def fake_httpx(monkeypatch):
+    monkeypatch.setattr(async_connector, "httpx", FakeHTTPX)
+    monkeypatch.setattr(zeep.transports, "httpx", FakeHTTPX)
+
+
+def connector(**kwargs):
+    return UCMAXLAsyncConnector(username="axl", password="axl", fqdn="cucm", wsdl=WSDL, **kwargs)
+
+
+def test_operations_are_awaited_over_an_async_service_proxy(fake_httpx):
+    axl = connector()
+    assert isinstance(axl.service, AsyncServiceProxy)
+
+    assert asyncio.run(axl.device_pool.update(name="DP1", newName="DP2")) == UUID
+    assert int(asyncio.run(axl.sql.update("update device set description='x' where name='SEP001122334455'"))) == 1
+    assert axl.client.transport.client.posts == ["updateDevicePool", "executeSQLUpdate"]
+
+
+def test_requests_in_flight_are_capped(fake_httpx):
+    axl = connector(max_concurrency=3)
+
+    async def updates():
+        return await asyncio.gather(*(axl.device_pool.update(name=f"DP{n}", newName=f"DPX{n}") for n in range(20)))
+
+    assert asyncio.run(updates()) == [UUID] * 20
+    assert axl.client.transport.client.max_in_flight == 3
+    assert axl.requests == 20
+
+
+def test_throttled_requests_are_retried(fake_httpx, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "throttle", 2)
+    axl = connector(backoff=0.01)
+
+    assert int(asyncio.run(axl.sql.update("update device set description='x'"))) == 1
+    assert (axl.requests, axl.throttled) == (3, 2)
+
+
+def test_throttling_is_raised_after_max_retries(fake_httpx, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "throttle", 5)
+    axl = connector(max_retries=1, backoff=0.01)
+
+    with pytest.raises(TransportError):
+        asyncio.run(axl.sql.update("update device set description='x'"))
+    assert (axl.requests, axl.throttled) == (2, 1)
+
+
+def test_scheduler_wraps_async_transport_and_retries_throttling(fake_httpx, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "throttle", 2)
+    scheduler = AXLScheduler(backoff=0.01)
+    axl = connector(scheduler=scheduler)
+    assert isinstance(axl.client.transport, AsyncScheduledTransport)
+
+    rows = asyncio.run(axl.sql.update("update device set description='x' where name='SEP001122334455'"))
+
+    assert int(rows) == 1
+    assert axl.client.transport.client.posts == ["executeSQLUpdate"] * 3
+    stats = scheduler.stats()
+    assert (stats["requests"], stats["throttled"], stats["retries"], stats["in_flight"]) == (3, 2, 2, 0)
+    assert "executeSQLUpdate" in stats["latency_baselines"]
+    assert (axl.requests, axl.throttled) == (1, 0)
+
+
+def test_scheduler_throttling_is_not_retried_again(fake_httpx, monkeypatch):
+    monkeypatch.setattr(FakeAsyncClient, "throttle", 5)
+    axl = connector(scheduler=AXLScheduler(backoff=0.01), backoff=0.01)
+    axl.client.transport.max_retries = 1
+
+    with pytest.raises(TransportError):
+        asyncio.run(axl.sql.update("update device set description='x'"))
+    assert axl.client.transport.client.posts == ["executeSQLUpdate"] * 2
+    assert (axl.requests, axl.throttled) == (1, 0)
+
+
+def test_async_writes_invalidate_object_cache(fake_httpx):
+    axl = connector(object_cache=True)
+    cache = axl.object_cache
+    cache.set(axl.cluster_key, "DevicePool", "list", {"name": "%"}, [{"name": "DP1"}])
+    cache.set(axl.cluster_key, "Css", "list", {"name": "%"}, [{"name": "CSS1"}])
+
+    assert asyncio.run(axl.device_pool.update(name="DP1", newName="DP2")) == UUID
+    assert not cache.get(axl.cluster_key, "DevicePool", "list", {"name": "%"})[0]
+    assert cache.get(axl.cluster_key, "Css", "list", {"name": "%"})[0]
+
+    asyncio.run(axl.sql.update("update callingsearchspace set description='x'"))
+    assert not cache.get(axl.cluster_key, "Css", "list", {"name": "%"})[0]
+
+
+def test_get_and_list_read_through_the_object_cache(fake_httpx):
+    axl = connector(object_cache=True)
+
+    for _ in range(2):
+        assert asyncio.run(axl.device_pool.get(name="DP1", returnedTags=["name"]))["name"] == "DP1"
+        assert [row["name"] for row in asyncio.run(axl.device_pool.list(returnedTags=["name"]))] == ["DP1"]
+
+    assert axl.client.transport.client.posts == ["getDevicePool", "listDevicePool"]
+    # same cache entry as the synchronous wrapper
+    assert axl.object_cache.get(axl.cluster_key, "DevicePool", "get",
+                                {"name": "DP1", "returnedTags": {"name": ""}})[0]
+
+
+class FakeSyncWrapper(object):
+    def __init__(self):
+        self.calls = []
+
+    def update(self, **kwargs):
+        self.calls.append(("update", kwargs, threading.current_thread()))
+        return UUID
+
+    def add(self, **kwargs):
+        self.calls.append(("add", kwargs, threading.current_thread()))
+        return UUID
+
+
+def test_overridden_verbs_run_the_synchronous_wrapper(fake_httpx):
+    axl = connector()
+    phone = FakeSyncWrapper()
+    device_pool = FakeSyncWrapper()
+    axl._sync_connector = type("FakeSyncConnector", (), {"phone": phone, "device_pool": device_pool})()
+
+    # Phone.update writes vendorConfig with SQL, DevicePool.add fills in defaults
+    assert asyncio.run(axl.phone.update(name="SEP001122334455", vendorConfig={"sshAccess": 0})) == UUID
+    assert asyncio.run(axl.device_pool.add(name="DP1")) == UUID
+    # a verb DevicePool does not override stays on the async transport
+    assert asyncio.run(axl.device_pool.update(name="DP1", newName="DP2")) == UUID
+
+    assert [call[:2] for call in phone.calls] == [("update", {"name": "SEP001122334455",
+                                                              "vendorConfig": {"sshAccess": 0}})]
+    assert [call[:2] for call in device_pool.calls] == [("add", {"name": "DP1"})]
+    assert phone.calls[0][2] is not threading.main_thread()
+    assert axl.client.transport.client.posts == ["updateDevicePool"]
+
+
+def test_sync_connector_shares_scheduler_and_object_cache(fake_httpx):
+    scheduler = AXLScheduler()
+    axl = connector(scheduler=scheduler, object_cache=True)
+    sync = axl.sync_connector
+
+    assert isinstance(sync, UCMAXLConnector)
+    assert (sync.scheduler, sync.object_cache, sync.cluster_key) == (scheduler, axl.object_cache, axl.cluster_key)
+    assert axl.sync_connector is sync
@@ -0,0 +1,261 @@
+"""Micro-benchmarks for the AXL connector
+
+No AXL server is needed.  Connectors are built against a local schema and pointed at 127.0.0.1.
+
+Usage:
+    python -c "from ciscocucmapi.benchmarks import bench_lazy_wrappers; bench_lazy_wrappers()"
+    python -c "from ciscocucmapi.benchmarks import bench_sql_fastpath; bench_sql_fastpath()"
+    python -c "from ciscocucmapi.benchmarks import bench_metadata_cache; bench_metadata_cache()"
+    python -c "from ciscocucmapi.benchmarks import bench_vendor_config_codec; bench_vendor_config_codec()"
+"""
+
+import time
+import tracemalloc
+
+from .connectors import LazyAPI
+from .connectors import UCMAXLConnector
+
+
+def _connector(wsdl):
+    return UCMAXLConnector(username="bench", password="bench", fqdn="127.0.0.1", wsdl=wsdl)
+
+
+def _measure(func):
+    """Return (seconds, bytes allocated and still held) for func()"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func()
+    elapsed_time = time.perf_counter() - start_time
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_time, held, result
+
+
+def bench_lazy_wrappers(wsdl="ciscocucmapi/schema/current/AXLAPI.wsdl", runs=5):
+    """Cost of the API wrappers on top of connector construction
+
+    Compares touching no wrappers, only sql (a connector built for sql.query) and every wrapper
+    attribute (what the old eager __init__ did).  Connectors are built outside the measurement.
+    """
+    names = [name for name, attr in vars(UCMAXLConnector).items() if isinstance(attr, LazyAPI)]
+    build_time, _, _ = _measure(lambda: _connector(wsdl))
+
+    def touch(attr_names):
+        results = []
+        for _ in range(runs):
+            connector = _connector(wsdl)
+            results.append(_measure(lambda: [getattr(connector, name) for name in attr_names]))
+        return min(results, key=lambda _: _[0]), connector
+
+    none, _ = touch([])
+    sql_only, _ = touch(["sql"])
+    eager, connector = touch(names)
+
+    print(f"connector construction: {build_time * 1000:.1f}ms")
+    print(f"{len(names)} wrapper attributes, {len(connector._api_wrappers)} distinct wrapper instances")
+    print(f"{'wrappers used':<20} {'time':>9} {'memory':>10}")
+    for label, (elapsed_time, held, _) in (("none", none), ("sql only", sql_only), ("all", eager)):
+        print(f"{label:<20} {elapsed_time * 1000:>7.2f}ms {held / 1024:>8.1f}KB")
+
+
+def sql_response_fixture(rows=50000):
+    """Synthetic executeSQLQuery response with rows of a typical device inventory query"""
+    row_xml = ("<row><pkid>{i:08d}-7b3e-11ea-9a0c-000c29a1b2c3</pkid><name>SEP0000{i:08X}</name>"
+               "<description>Phone {i} - Building A</description><productname>Cisco 8845</productname>"
+               "<licensetype>Enhanced</licensetype><extension>{ext}</extension></row>")
+    body = "".join(row_xml.format(i=i, ext=10000 + i) for i in range(rows))
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+            '<ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/14.0"><return>'
+            f'{body}</return></ns:executeSQLQueryResponse></soapenv:Body></soapenv:Envelope>').encode()
+
+
+def _peak(func):
+    """Return (seconds, peak bytes allocated, result) for func()"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func()
+    elapsed_time = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_time, peak, result
+
+
+def bench_sql_fastpath(rows=50000, wsdl="ciscocucmapi/schema/14.0/AXLAPI.wsdl"):
+    """sql.query (zeep) vs sql.query(fast_path=True) vs sql.query_tuples on a fixture response
+
+    The connector's transport returns the fixture instead of sending the request, so the
+    whole client side (zeep deserialization or lxml iterparse) is measured.
+    """
+    from requests import Response
+
+    content = sql_response_fixture(rows)
+    connector = _connector(wsdl)
+
+    def post_xml(address, envelope, headers):
+        response = Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/xml; charset=utf-8"
+        response._content = content
+        return response
+
+    connector.client.transport.post_xml = post_xml
+    sql = "select * from device"
+
+    assert connector.sql.query(sql) == connector.sql.query(sql, fast_path=True)
+
+    print(f"{rows} rows, {len(content) / 1024 / 1024:.1f}MB response")
+    print(f"{'path':<22} {'time':>8} {'peak memory':>12}")
+    for label, func in (("query (zeep)", lambda: connector.sql.query(sql)),
+                        ("query fast_path", lambda: connector.sql.query(sql, fast_path=True)),
+                        ("query_tuples", lambda: connector.sql.query_tuples(sql))):
+        # timed without tracemalloc, which slows allocation heavy code down
+        start_time = time.perf_counter()
+        func()
+        elapsed_time = time.perf_counter() - start_time
+        _, peak, _ = _peak(func)
+        print(f"{label:<22} {elapsed_time:>7.2f}s {peak / 1024 / 1024:>10.1f}MB")
+
+
+def bench_metadata_cache(calls=2000, wsdl="ciscocucmapi/schema/current/AXLAPI.wsdl"):
+    """Per-call cost of the WSDL derived metadata with and without the schema metadata cache
+
+    'uncached' rebuilds the metadata the way every list/add_update/flatten_signature_kwargs call
+    used to; 'cached' is the lookup done now.  'other connector' is the first lookup from a second
+    connector on the same schema, which reuses the first connector's entries.
+    """
+    from inspect import signature
+
+    from ._internal_utils import fetch_choices
+    from ._internal_utils import signature_parameters
+    from .api.base import clear_schema_metadata
+    from .helpers import get_model_dict
+
+    def list_defaults_uncached(api):
+        list_method = api._get_wsdl_obj(api._list_method_name)
+        key = list_method.elements[0][1].type.elements[0][0]
+        return {key: "%"}, get_model_dict(api._get_wsdl_obj(api._list_model_name))
+
+    def signature_uncached(api):
+        parameters = signature(api.add).parameters
+        return [k for k, v in parameters.items() if v.kind == v.VAR_KEYWORD], parameters
+
+    cases = (
+        ("list defaults", list_defaults_uncached, lambda api: api._list_defaults(None, None)),
+        ("get choices", lambda api: fetch_choices(api._fetch_get_method().elements_nested[0][1][0]),
+         lambda api: api._get_choices()),
+        ("add model", lambda api: api.model(target_model="add"), lambda api: api._cached_model("add")),
+        ("update model", lambda api: api.model(target_model="update"), lambda api: api._cached_model("update")),
+        ("signature", signature_uncached, lambda api: signature_parameters(api.add)),
+    )
+
+    def per_call(func, api):
+        start_time = time.perf_counter()
+        for _ in range(calls):
+            func(api)
+        return (time.perf_counter() - start_time) / calls
+
+    clear_schema_metadata()
+    api = _connector(wsdl).phone
+    other_api = _connector(wsdl).phone
+
+    print(f"{calls} calls each, phone API")
+    print(f"{'metadata':<16} {'uncached':>10} {'cached':>10} {'first build':>12} {'other connector':>16}")
+    for label, uncached, cached in cases:
+        first_time, _, _ = _measure(lambda: cached(api))
+        other_time, _, _ = _measure(lambda: cached(other_api))
+        print(f"{label:<16} {per_call(uncached, api) * 1e6:>8.1f}us {per_call(cached, api) * 1e6:>8.2f}us "
+              f"{first_time * 1000:>10.2f}ms {other_time * 1e6:>14.1f}us")
+
+
+# vendorConfig of a Cisco 8845 (CUCM 14.0 dbreaddevicexml layout): flat settings plus nested blocks
+VENDOR_CONFIG_8845 = (
+    "<disableSpeaker>false</disableSpeaker><disableSpeakerAndHeadset>false</disableSpeakerAndHeadset>"
+    "<pcPort>0</pcPort><settingsAccess>1</settingsAccess><garp>1</garp><voiceVlanAccess>0</voiceVlanAccess>"
+    "<videoCapability>1</videoCapability><autoSelectLineEnable>0</autoSelectLineEnable>"
+    "<webAccess>0</webAccess><spanToPCPort>1</spanToPCPort><loggingDisplay>1</loggingDisplay>"
+    "<recordingTone>0</recordingTone><recordingToneLocalVolume>100</recordingToneLocalVolume>"
+    "<recordingToneRemoteVolume>50</recordingToneRemoteVolume><recordingToneDuration></recordingToneDuration>"
+    "<moreKeyReversionTimer>5</moreKeyReversionTimer><displayOnTime>07:30</displayOnTime>"
+    "<displayOnDuration>10:30</displayOnDuration><displayIdleTimeout>00:10</displayIdleTimeout>"
+    "<daysDisplayNotActive>1,7</daysDisplayNotActive><displayOnWhenIncomingCall>1</displayOnWhenIncomingCall>"
+    "<lldpAssetId></lldpAssetId><powerPriority>0</powerPriority><ipv6LogServer></ipv6LogServer>"
+    "<cdpEnable>true</cdpEnable><lldpEnable>true</lldpEnable><sshAccess>0</sshAccess>"
+    "<wifi>1</wifi><bluetooth>1</bluetooth><bluetoothProfile>0,1</bluetoothProfile>"
+    "<ehookEnable>0</ehookEnable><headsetWidebandUIControl>1</headsetWidebandUIControl>"
+    "<headsetWidebandEnable>1</headsetWidebandEnable><energyEfficientEthernet>0</energyEfficientEthernet>"
+    "<webAdmin><adminPassword></adminPassword><webAccess>0</webAccess></webAdmin>"
+    "<wirelessProfiles><profile><ssid>corp</ssid><securityMode>3</securityMode></profile>"
+    "<profile><ssid>guest</ssid><securityMode>0</securityMode></profile></wirelessProfiles>"
+    "<featureControl><callRecording><mode>1</mode><tone><local>100</local><remote>50</remote></tone>"
+    "</callRecording></featureControl>"
+)
+
+
+def _legacy_xml_str_to_dict(xml_string):
+    """VendorConfig._xml_str_to_dict before vendorconfig_codec (repeated tags overwrite each other)"""
+    from lxml import etree
+
+    def _process_element(element):
+        result = {}
+        if element.text and element.text.strip():
+            return element.text.strip()
+        for child in element:
+            result[child.tag] = _process_element(child)
+        return result
+
+    root = etree.fromstring('<root>' + (xml_string or '') + '</root>')
+    return {element.tag: _process_element(element) for element in root}
+
+
+def _legacy_dict_to_xml_str(vc):
+    """VendorConfig._dict_to_xml_str before vendorconfig_codec (xmltodict.unparse + regex clean up)"""
+    import re
+    import xmltodict
+
+    vc_xml = xmltodict.unparse({'_temp_tag_': vc}, encoding='unicode')
+    vc_xml = re.sub(r'<\?xml.*\?>', '', str(vc_xml))
+    vc_xml = re.sub('<_temp_tag_>', '', str(vc_xml))
+    vc_xml = re.sub('</_temp_tag_>', '', str(vc_xml))
+    return re.sub('\n', '', str(vc_xml))
+
+
+def bench_vendor_config_codec(calls=2000, xml_string=VENDOR_CONFIG_8845):
+    """vendorConfig parse / write / patch with the old VendorConfig helpers vs vendorconfig_codec
+
+    The old patch is what patch_phone_vendor_config did: parse to dict, _patch_dict, unparse.
+    """
+    from .api.vendorconfig import VendorConfig
+    from .vendorconfig_codec import dict_to_xml
+    from .vendorconfig_codec import parse_fragment
+    from .vendorconfig_codec import patch_xml
+    from .vendorconfig_codec import xml_to_dict
+
+    patch_dict = VendorConfig(None, "phone")._patch_dict
+    path, value = "featureControl/callRecording/tone/local", "80"
+    legacy_dict = _legacy_xml_str_to_dict(xml_string)
+    codec_dict = xml_to_dict(xml_string)
+
+    def element_count(fragment):
+        return sum(1 for _ in parse_fragment(fragment).iter()) - 1
+
+    print(f"{len(xml_string)} character vendorConfig, {calls} calls each")
+    print(f"elements after a dict round trip: original {element_count(xml_string)}, "
+          f"legacy {element_count(_legacy_dict_to_xml_str(legacy_dict))}, "
+          f"codec {element_count(dict_to_xml(codec_dict))}")
+
+    cases = (
+        ("xml -> dict", lambda: _legacy_xml_str_to_dict(xml_string), lambda: xml_to_dict(xml_string)),
+        ("dict -> xml", lambda: _legacy_dict_to_xml_str(legacy_dict), lambda: dict_to_xml(codec_dict)),
+        ("patch path", lambda: _legacy_dict_to_xml_str(patch_dict(_legacy_xml_str_to_dict(xml_string), path, value)),
+         lambda: patch_xml(xml_string, path, value)),
+    )
+    print(f"{'operation':<14} {'legacy':>10} {'codec':>10} {'speedup':>8}")
+    for label, legacy, codec in cases:
+        times = []
+        for func in (legacy, codec):
+            start_time = time.perf_counter()
+            for _ in range(calls):
+                func()
+            times.append((time.perf_counter() - start_time) / calls)
+        print(f"{label:<14} {times[0] * 1e6:>8.1f}us {times[1] * 1e6:>8.1f}us {times[0] / times[1]:>7.1f}x")
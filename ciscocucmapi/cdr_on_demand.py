@@ -0,0 +1,387 @@
+"""CDRonDemand connector and resumable CDR/CMR flat file downloads
+
+CUCM does not serve CDR files itself.  CDRonDemand get_file_list() lists the flat files of a time
+window (at most one hour per request) and get_file() has the publisher push one file to an SFTP
+(or FTP) server.  The files are then read from that server.  Clusters with a billing server
+configured already push every file there, so a report can skip CDRonDemand and list the server's
+directory instead (file names carry their UTC time).
+
+CDRFileDownloader copies files from an SFTP, HTTP or local directory source over a thread pool.
+Each file is written to '<name>.part' and renamed once its size matches the source, so an
+interrupted run (or a failed transfer, retried) continues from the bytes already on disk instead of
+starting over.  A plain 'python -m http.server' in a directory of CDR files is enough of a stand-in
+to run a report without a cluster (it ignores Range requests, so partial files restart from 0).
+
+Usage:
+    cdr = UCMCDRonDemandConnector(username=..., password=..., fqdn=...)
+    source = SFTPFileSource('billing.example.com', 'cdr', pwd, '/cdr')
+    downloader = CDRFileDownloader(source, 'cdr_files')
+
+    # files already on the billing server
+    results = downloader.download(source_window(source, start, end))
+
+    # have CUCM push the window's files first (10 requests/min, 1 hour per listing)
+    results = cdr.fetch_files(start, end, downloader, push_to={'host': ..., 'username': ...,
+                                                              'password': ..., 'directory': '/cdr'})
+"""
+
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from requests import Session
+
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import WSDL_URLS
+from .risport import RateLimiter
+
+CDR_MAX_WINDOW = timedelta(hours=1)     # longest get_file_list interval CUCM accepts
+CDR_RATE_LIMIT = 10                     # CDRonDemand requests per CDR_RATE_PERIOD
+CDR_RATE_PERIOD = 60.0                  # seconds
+CDR_WORKERS = 4                         # files pushed/downloaded in parallel
+CDR_CHUNK_SIZE = 1024 * 1024            # bytes per read
+CDR_RETRIES = 2                         # extra attempts per file, each resumes the .part file
+PART_SUFFIX = '.part'
+
+# cdr_<cluster>_<node id>_<YYYYMMDDHHMM>_<sequence> (cmr_... for CMR files)
+CDR_FILE_NAME = re.compile(r'^(cdr|cmr)_.+_(\d{12})_\d+$')
+
+
+def cdr_time(value):
+    """datetime to the CDRonDemand UTC 'YYYYMMDDHHMM' format (naive datetimes are taken as UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y%m%d%H%M')
+
+
+def time_windows(start, end, window=CDR_MAX_WINDOW):
+    """Split start..end into consecutive (start, end) intervals of at most window"""
+    windows = []
+    while start < end:
+        windows.append((start, min(start + window, end)))
+        start += window
+    return windows
+
+
+def file_time(name):
+    """UTC datetime of a CDR/CMR flat file name, None for other names"""
+    match = CDR_FILE_NAME.match(os.path.basename(name))
+    if not match:
+        return None
+    return datetime.strptime(match.group(2), '%Y%m%d%H%M').replace(tzinfo=timezone.utc)
+
+
+def source_window(source, start, end, cmr=False):
+    """Names of the CDR (and CMR) files of a source with a file time in start..end"""
+    start, end = [t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t for t in (start, end)]
+    names = []
+    for name in source.list():
+        time = file_time(name)
+        if time is not None and start <= time < end and (cmr or name.startswith('cdr_')):
+            names.append(name)
+    return sorted(names)
+
+
+class UCMCDRonDemandConnector(UCSOAPConnector):
+    """UCM CDRonDemand Connector
+
+    :param rate_limit: (int) requests allowed per rate_period
+    :param rate_period: (float) seconds of the rate limit window
+    :param workers: (int) requests in flight
+    """
+
+    _ENV = {
+        "username": "CDR_USERNAME",
+        "password": "CDR_PASSWORD",
+        "fqdn": "CDR_FQDN",
+        "wsdl": "CDR_WSDL_URL"
+    }
+
+    def __init__(self, rate_limit=CDR_RATE_LIMIT, rate_period=CDR_RATE_PERIOD, workers=CDR_WORKERS, **kwargs):
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        fqdn = connection_kwargs.pop("fqdn")
+        if not connection_kwargs.get("wsdl"):
+            connection_kwargs["wsdl"] = WSDL_URLS["CDRonDemand"].format(fqdn=fqdn)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}CDRonDemandSoapBinding"
+        connection_kwargs["address"] = f"https://{fqdn}:8443/realtimeservice2/services/CDRonDemandService"
+        super().__init__(**connection_kwargs)
+
+        self.rate_limiter = RateLimiter(rate_limit, rate_period)
+        self.workers = workers
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _request(self, operation, **kwargs):
+        self.rate_limiter.acquire()
+        with self._lock:
+            self.requests += 1
+        return getattr(self.service, operation)(**kwargs)
+
+    def get_file_list(self, start, end, cmr=False):
+        """File names of one interval of at most CDR_MAX_WINDOW
+
+        :param start: datetime (UTC if naive)
+        :param end: datetime
+        :param cmr: include CMR files
+        :return: list of file names
+        """
+        names = self._request("get_file_list", in0=cdr_time(start), in1=cdr_time(end), in2=cmr)
+        return list(names or [])
+
+    def file_list(self, start, end, cmr=False):
+        """File names of any interval (one rate limited get_file_list per hour)"""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda window: self.get_file_list(*window, cmr=cmr), time_windows(start, end))
+            return sorted({name for names in results for name in names})
+
+    def get_file(self, name, host, username, password, directory, sftp=True, compress=False):
+        """Have CUCM push one file to an SFTP (or FTP) server
+
+        :return: True when CUCM reports the transfer done
+        """
+        return bool(self._request("get_file", in0=host, in1=username, in2=password, in3=directory, in4=name,
+                                  in5=sftp, in6=compress))
+
+    def fetch_files(self, start, end, downloader, push_to, cmr=False):
+        """List the files of start..end, push the ones not yet downloaded to push_to and download them
+
+        :param downloader: CDRFileDownloader reading the push_to server
+        :param push_to: dict of get_file() server arguments (host, username, password, directory, sftp)
+        :return: list of download results (see CDRFileDownloader.download)
+        """
+        names = [name for name in self.file_list(start, end, cmr=cmr) if not downloader.is_complete(name)]
+
+        def push(name):
+            try:
+                if self.get_file(name, **push_to):
+                    return name
+                logging.error(f'CDRonDemand get_file failed for {name}')
+            except Exception as e:
+                logging.error(f'CDRonDemand get_file failed for {name}: {e}')
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pushed = [name for name in executor.map(push, names) if name]
+        logging.info(f'CDRonDemand pushed {len(pushed)} of {len(names)} files to {push_to.get("host")}')
+        return downloader.download(pushed)
+
+
+class DirectoryFileSource(object):
+    """Files in a local (or mounted) directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def list(self):
+        return os.listdir(self.directory)
+
+    def size(self, name):
+        return os.path.getsize(os.path.join(self.directory, name))
+
+    def read(self, name, offset=0, chunk_size=CDR_CHUNK_SIZE):
+        """Yield (offset, chunk) from offset to the end of the file"""
+        with open(os.path.join(self.directory, name), 'rb') as file:
+            file.seek(offset)
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield offset, chunk
+                offset += len(chunk)
+
+
+class HTTPFileSource(object):
+    """Files under an HTTP(S) URL.  list() reads the links of the directory index page.
+
+    Range requests resume partial files, servers that answer 200 restart them from 0.
+    """
+
+    def __init__(self, base_url, username=None, password=None, tls_verify=False, timeout=60):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.timeout = timeout
+        self._session = Session()
+        if username:
+            self._session.auth = (username, password)
+        self._session.verify = tls_verify
+
+    def list(self):
+        resp = self._session.get(self.base_url, timeout=self.timeout)
+        resp.raise_for_status()
+        return [os.path.basename(link.rstrip('/')) for link in re.findall(r'href="([^"?#]+)"', resp.text)]
+
+    def size(self, name):
+        resp = self._session.head(self.base_url + name, timeout=self.timeout)
+        resp.raise_for_status()
+        return int(resp.headers['Content-Length'])
+
+    def read(self, name, offset=0, chunk_size=CDR_CHUNK_SIZE):
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        with self._session.get(self.base_url + name, headers=headers, stream=True, timeout=self.timeout) as resp:
+            resp.raise_for_status()
+            if resp.status_code != 206:
+                offset = 0
+            for chunk in resp.iter_content(chunk_size):
+                yield offset, chunk
+                offset += len(chunk)
+
+
+class SFTPFileSource(object):
+    """Files in a directory of an SFTP server (paramiko, installed with netmiko)
+
+    One SSH transport is shared, each download thread opens its own SFTP channel on it.
+    """
+
+    def __init__(self, host, username, password, directory='.', port=22, timeout=60):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.directory = directory
+        self.port = port
+        self.timeout = timeout
+        self._transport = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _sftp(self):
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is None:
+            import paramiko
+            with self._lock:
+                if self._transport is None or not self._transport.is_active():
+                    self._transport = paramiko.Transport((self.host, self.port))
+                    self._transport.banner_timeout = self.timeout
+                    self._transport.connect(username=self.username, password=self.password)
+            sftp = self._local.sftp = paramiko.SFTPClient.from_transport(self._transport)
+            sftp.get_channel().settimeout(self.timeout)
+            sftp.chdir(self.directory)
+        return sftp
+
+    def list(self):
+        return self._sftp().listdir()
+
+    def size(self, name):
+        return self._sftp().stat(name).st_size
+
+    def read(self, name, offset=0, chunk_size=CDR_CHUNK_SIZE):
+        with self._sftp().open(name, 'rb') as file:
+            file.seek(offset)
+            file.prefetch()
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                yield offset, chunk
+                offset += len(chunk)
+
+    def close(self):
+        with self._lock:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+
+
+class CDRFileDownloader(object):
+    """Parallel, resumable copy of files from a source (DirectoryFileSource, HTTPFileSource,
+    SFTPFileSource) into a local directory
+
+    :param source: object with size(name) and read(name, offset) -> (offset, chunk) generator
+    :param directory: local directory for the files
+    :param workers: (int) files downloaded in parallel
+    :param retries: (int) extra attempts per file.  Each attempt continues the .part file.
+    """
+
+    def __init__(self, source, directory, workers=CDR_WORKERS, retries=CDR_RETRIES, chunk_size=CDR_CHUNK_SIZE):
+        self.source = source
+        self.directory = directory
+        self.workers = workers
+        self.retries = retries
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        # counters
+        self.files = 0
+        self.skipped = 0
+        self.resumed = 0
+        self.bytes = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def is_complete(self, name):
+        """True when name was downloaded before (the .part file is gone once the size matched)"""
+        return os.path.isfile(self.path(name))
+
+    def _count(self, counter, value=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def _download(self, name):
+        """Download (or continue) one file and return its local path"""
+        path = self.path(name)
+        if os.path.isfile(path):
+            self._count('skipped')
+            return path
+
+        part_path = path + PART_SUFFIX
+        size = self.source.size(name)
+        for attempt in range(self.retries + 1):
+            offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+            if offset > size:
+                offset = 0
+            if offset:
+                self._count('resumed')
+            try:
+                with open(part_path, 'r+b' if offset else 'wb') as file:
+                    file.seek(offset)
+                    for chunk_offset, chunk in self.source.read(name, offset, self.chunk_size):
+                        if chunk_offset != file.tell():
+                            # source ignored the offset, start over
+                            file.seek(chunk_offset)
+                            file.truncate()
+                        file.write(chunk)
+                        self._count('bytes', len(chunk))
+                    file.truncate()
+                if os.path.getsize(part_path) == size:
+                    os.replace(part_path, path)
+                    self._count('files')
+                    return path
+                logging.warning(f'{name}: {os.path.getsize(part_path)} of {size} bytes, retrying')
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logging.warning(f'{name}: download attempt {attempt + 1} failed ({e}), resuming')
+        raise IOError(f'{name}: size mismatch after {self.retries + 1} attempts')
+
+    def _download_item(self, name):
+        try:
+            return {'name': name, 'path': self._download(name), 'error': None}
+        except Exception as e:
+            self._count('errors')
+            logging.error(f'CDR download of {name} failed: {e}')
+            return {'name': name, 'path': None, 'error': str(e)}
+
+    def download(self, names):
+        """Download files in parallel
+
+        :param names: source file names
+        :return: list of dicts {'name', 'path' (None on error), 'error'} in names order
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self._download_item, names))
+
+    def stats(self):
+        """Return dict of download counters"""
+        return {'files': self.files,
+                'skipped': self.skipped,
+                'resumed': self.resumed,
+                'bytes': self.bytes,
+                'errors': self.errors,
+                }
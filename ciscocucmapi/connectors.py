@@ -15,6 +15,10 @@ from zeep import Settings   # JRE attempting fix for SIP_PROFILE Bug
 
 from .api import *
 from .model import axl_factory
+from .object_cache import AXLObjectCache
+from .scheduler import AXLScheduler
+from .scheduler import ScheduledTransport
+from .schema_cache import load_document
 
 from pprint import pprint
 
@@ -54,11 +58,41 @@ class AXLHistoryPlugin(HistoryPlugin):
             return self._parse_envelope(last_tx['sent']['envelope'])
 
 
+class LazyAPI(object):
+    """Connector attribute that builds its API wrapper on first access
+
+    The wrapper is memoized per connector and per API class, so aliases (ex: udp / device_profile)
+    return the same instance.  After the first access the instance is stored on the connector
+    and later lookups are plain attribute reads.
+    """
+
+    def __init__(self, api_class, object_factory=axl_factory):
+        self.api_class = api_class
+        self.object_factory = object_factory
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, connector, owner=None):
+        if connector is None:
+            return self
+        wrappers = connector.__dict__.setdefault("_api_wrappers", {})
+        api = wrappers.get(self.api_class)
+        if api is None:
+            api = wrappers.setdefault(self.api_class, self.api_class(connector, self.object_factory))
+        connector.__dict__[self.name] = api
+        return api
+
+
 class UCSOAPConnector(object):
     """Parent class for all Cisco UC SOAP Connectors"""
 
+    _client_class = Client      # zeep client class built over the transport from _build_transport()
+
     def __init__(self, username=None, password=None, wsdl=None, binding_name=None, address=None, tls_verify=False,
-                 timeout=10, history=True, history_maxlen=1, strict=True):
+                 timeout=10, history=True, history_maxlen=1, strict=True, schema_cache=True, scheduler=None,
+                 object_cache=None):
         """Instantiate UC SOAP Client Connector
 
         :param username: SOAP client connector username
@@ -67,34 +101,42 @@ class UCSOAPConnector(object):
         :param binding_name: QName of the binding
         :param address: address of the endpoint
         :param tls_verify: /path/to/certificate.pem or False.  Certificate must be a CA_BUNDLE. Supports .pem and .crt
-        :param is_async: create async client
         :param strict:   Zeep uses strict interpretation of WSDL (True by default.  Experimental for testing)
         :param timeout: timeout in seconds.  Overrides zeep 300 default to timeout after 30sec
+        :param schema_cache: load the compiled WSDL/XSD from the on-disk schema cache (local WSDL only)
+        :param scheduler: AXLScheduler pacing and retrying throttled requests (True to create one).
+                          Share one instance between connectors to the same cluster.
+        :param object_cache: AXLObjectCache for get/list of reference objects (True to create one).
+                             One instance can be shared by connectors to several clusters.
         """
         self._username = username
         self._wsdl = wsdl
+        # identifies the schema for the API metadata cache shared by connectors (see api.base)
+        self.schema_key = os.path.abspath(wsdl) if wsdl and os.path.isfile(wsdl) else wsdl
         self._timeout = timeout
-
-        self._session = Session()
-        self._session.auth = HTTPBasicAuth(username, password)
-        self._session.verify = tls_verify
         self._plugins = []
+        self.scheduler = AXLScheduler() if scheduler is True else scheduler
+        self.object_cache = AXLObjectCache() if object_cache is True else object_cache
+        self.cluster_key = address      # object cache key of the cluster
 
         self._settings = Settings(strict=strict)    
 
-        if not self._session.verify:
+        if not tls_verify:
             urllib3.disable_warnings(InsecureRequestWarning)
 
         if history:
             self._history = AXLHistoryPlugin(maxlen=history_maxlen)
             self._plugins.append(self._history)
 
-        transport = Transport(cache=SqliteCache(),
-                              session=self._session,
-                              timeout=self._timeout)
+        transport = self._build_transport(username, password, tls_verify)
 
+        if schema_cache:
+            wsdl_document = load_document(wsdl, transport, self._settings)
+        else:
+            wsdl_document = wsdl
 
-        self._client = Client(wsdl=wsdl, transport=transport, plugins=self._plugins, settings=self._settings)
+        self._client = self._client_class(wsdl=wsdl_document, transport=transport, plugins=self._plugins,
+                                          settings=self._settings)
         if binding_name and address:
             self._service = self._client.create_service(binding_name, address)
         elif binding_name or address:
@@ -102,6 +144,20 @@ class UCSOAPConnector(object):
                              "Requires 'binding_name' and 'address'")
         self.model_factory = self._client.type_factory('ns0')
 
+    def _build_transport(self, username, password, tls_verify):
+        """zeep Transport over a requests.Session with basic auth"""
+        self._session = Session()
+        self._session.auth = HTTPBasicAuth(username, password)
+        self._session.verify = tls_verify
+        if self.scheduler:
+            return ScheduledTransport(self.scheduler,
+                                      cache=SqliteCache(),
+                                      session=self._session,
+                                      timeout=self._timeout)
+        return Transport(cache=SqliteCache(),
+                         session=self._session,
+                         timeout=self._timeout)
+
     @property
     def timeout(self):
         return self._timeout
@@ -136,6 +192,200 @@ class UCMAXLConnector(UCSOAPConnector):
         "wsdl": "AXL_WSDL_URL"
     }
 
+    # sql API wrapper
+    sql = LazyAPI(ThinAXLAPI)
+
+    # device
+    device = LazyAPI(Device)
+
+    # device API wrappers
+    common_device_config = LazyAPI(CommonDeviceConfig)
+    common_phone_config = LazyAPI(CommonPhoneConfig)             # proper schema name
+    common_phone_profile = LazyAPI(CommonPhoneConfig)            # alias
+    cti_route_point = LazyAPI(CtiRoutePoint)
+    feature_control_policy = LazyAPI(FeatureControlPolicy)
+    ip_phone_services = LazyAPI(IpPhoneServices)                 # proper schema name (note it's plural)
+    ip_phone_service = LazyAPI(IpPhoneServices)                  # alias
+    line = LazyAPI(Line)
+    network_access_profile = LazyAPI(NetworkAccessProfile)
+    phone = LazyAPI(Phone)
+    phone_line = LazyAPI(PhoneLine)                              # jre added, not in schema
+    default_device_profile = LazyAPI(DefaultDeviceProfile)
+    device_profile = LazyAPI(DeviceProfile)                      # proper schema name
+    udp = LazyAPI(DeviceProfile)                                 # alias
+    phone_button_template = LazyAPI(PhoneButtonTemplate)
+    phone_security_profile = LazyAPI(PhoneSecurityProfile)
+    recording_profile = LazyAPI(RecordingProfile)
+    sdp_transparency_profile = LazyAPI(SdpTransparencyProfile)
+    sip_trunk = LazyAPI(SipTrunk)
+    sip_trunk_security_profile = LazyAPI(SipTrunkSecurityProfile)
+    sip_profile = LazyAPI(SipProfile)
+    sip_normalization_script = LazyAPI(SIPNormalizationScript)
+    soft_key_template = LazyAPI(SoftKeyTemplate)                     # proper schema name
+    softkey_template = LazyAPI(SoftKeyTemplate)                      # alias
+    soft_key_set = LazyAPI(SoftKeySet)                               # proper schema name
+    softkey_set = LazyAPI(SoftKeySet)                                # alias
+    universal_device_template = LazyAPI(UniversalDeviceTemplate)     # proper schema name
+    udt = LazyAPI(UniversalDeviceTemplate)                           # alias
+    universal_line_template = LazyAPI(UniversalLineTemplate)         # proper schema name
+    ult = LazyAPI(UniversalLineTemplate)                             # alias
+    remote_destination_profile = LazyAPI(RemoteDestinationProfile)   # proper schema name
+    rdp = LazyAPI(RemoteDestinationProfile)                          # alias
+    remote_destination = LazyAPI(RemoteDestination)
+    wifi_hotspot = LazyAPI(WifiHotspot)
+    wlan_profile = LazyAPI(WLANProfile)                              # Case issue in name
+    wlan_profile_group = LazyAPI(WlanProfileGroup)
+
+    # user API wrappers
+    app_user = LazyAPI(AppUser)                                      # proper schema name
+    application_user = LazyAPI(AppUser)                              # alias
+    application_user_capf_profile = LazyAPI(ApplicationUserCapfProfile)
+    credential_policy = LazyAPI(CredentialPolicy)
+    credential_policy_default = LazyAPI(CredentialPolicyDefault)
+    end_user_capf_profile = LazyAPI(EndUserCapfProfile)
+    feature_group_template = LazyAPI(FeatureGroupTemplate)
+    user = LazyAPI(User)
+    uc_service = LazyAPI(UcService)
+    sip_realm = LazyAPI(SipRealm)
+    self_provisioning = LazyAPI(SelfProvisioning)
+    service_profile = LazyAPI(ServiceProfile)
+    user_group = LazyAPI(UserGroup)
+    user_profile_provision = LazyAPI(UserProfileProvision)           # proper schema name
+    user_profile = LazyAPI(UserProfileProvision)                     # alias
+    user_rank = LazyAPI(UserRank)                                    # ADD-ON (not in Cisco spec)
+    user_role = LazyAPI(UserRole)                                    # ADD-ON (not in Cisco spec)
+
+    # dialplan API wrappers
+    caller_filter_list = LazyAPI(CallerFilterList)
+    advertised_patterns = LazyAPI(AdvertisedPatterns)
+    aar_group = LazyAPI(AarGroup)
+    application_dial_rules = LazyAPI(ApplicationDialRules)
+    blocked_learned_patterns = LazyAPI(BlockedLearnedPatterns)
+    call_pickup_group = LazyAPI(CallPickupGroup)
+    call_park = LazyAPI(CallPark)
+    called_party_transformation_pattern = LazyAPI(CalledPartyTransformationPattern)      # proper schema name
+    called_party_xform_pattern = LazyAPI(CalledPartyTransformationPattern)               # alias
+    calling_party_transformation_pattern = LazyAPI(CallingPartyTransformationPattern)    # proper schema name
+    calling_party_xform_pattern = LazyAPI(CallingPartyTransformationPattern)             # alias
+    transformation_profile = LazyAPI(TransformationProfile)
+    conference_now = LazyAPI(ConferenceNow)
+    cmc_info = LazyAPI(CmcInfo)                                  # proper schema name
+    cmc = LazyAPI(CmcInfo)                                       # alias
+    css = LazyAPI(Css)
+    directed_call_park = LazyAPI(DirectedCallPark)
+    directory_lookup_dial_rules = LazyAPI(DirectoryLookupDialRules)          # proper schema name
+    directory_lookup_rules = LazyAPI(DirectoryLookupDialRules)               # alias
+    enterprise_feature_access_configuration = LazyAPI(EnterpriseFeatureAccessConfiguration)  # proper schema name
+    mobility_enterprise_feature_access_number = LazyAPI(EnterpriseFeatureAccessConfiguration)    # alias
+    fac_info = LazyAPI(FacInfo)                                  # proper schema name
+    fac = LazyAPI(FacInfo)                                       # alias
+    handoff_mobility = LazyAPI(Mobility)
+    handoff_configuration = LazyAPI(HandoffConfiguration)
+    http_profile = LazyAPI(HttpProfile)
+    meet_me = LazyAPI(MeetMe)
+    mobility_profile = LazyAPI(MobilityProfile)
+    hunt_list = LazyAPI(HuntList)
+    hunt_pilot = LazyAPI(HuntPilot)
+    line_group = LazyAPI(LineGroup)
+    local_route_group = LazyAPI(LocalRouteGroup)
+    route_filter = LazyAPI(RouteFilter)
+    route_group = LazyAPI(RouteGroup)
+    route_list = LazyAPI(RouteList)
+    route_partition = LazyAPI(RoutePartition)
+    route_pattern = LazyAPI(RoutePattern)
+    route_plan = LazyAPI(RoutePlan)                      # proper schema name
+    route_plan_report = LazyAPI(RoutePlan)               # alias
+    sip_dial_rules = LazyAPI(SipDialRules)
+    sip_route_pattern = LazyAPI(SipRoutePattern)
+    time_period = LazyAPI(TimePeriod)
+    time_schedule = LazyAPI(TimeSchedule)
+    trans_pattern = LazyAPI(TransPattern)                # proper schema name
+    translation_pattern = LazyAPI(TransPattern)          # alias
+    route_partitions_for_learned_patterns = LazyAPI(RoutePartitionsForLearnedPatterns)
+    elin_group = LazyAPI(ElinGroup)
+
+    # system API wrappers
+    application_server = LazyAPI(ApplicationServer)
+    audio_codec_preference_list = LazyAPI(AudioCodecPreferenceList)
+    call_manager_group = LazyAPI(CallManagerGroup)       # proper schema name
+    callmanager_group = LazyAPI(CallManagerGroup)        # alias
+    date_time_group = LazyAPI(DateTimeGroup)
+    device_mobility_group = LazyAPI(DeviceMobilityGroup)
+    device_mobility = LazyAPI(DeviceMobility)            # proper schema name
+    device_mobility_info = LazyAPI(DeviceMobility)       # alias
+    device_pool = LazyAPI(DevicePool)
+    ldap_directory = LazyAPI(LdapDirectory)
+    ldap_filter = LazyAPI(LdapFilter)
+    ldap_sync_custom_field = LazyAPI(LdapSyncCustomField)
+    lbm_group = LazyAPI(LbmGroup)
+    lbm_hub_group = LazyAPI(LbmHubGroup)
+    location = LazyAPI(Location)
+    presence_redundancy_group = LazyAPI(PresenceRedundancyGroup)
+    phone_ntp = LazyAPI(PhoneNtp)                        # proper schema name
+    phone_ntp_reference = LazyAPI(PhoneNtp)              # alias
+    physical_location = LazyAPI(PhysicalLocation)
+    presence_group = LazyAPI(PresenceGroup)
+    region = LazyAPI(Region)
+    srst = LazyAPI(Srst)
+    service_parameter = LazyAPI(ServiceParameter)
+    enterprise_parameter = LazyAPI(EnterpriseParameter)
+    ldap_system = LazyAPI(LdapSystem)
+    ldap_authentication = LazyAPI(LdapAuthentication)
+    ldap_search = LazyAPI(LdapSearch)
+    call_manager = LazyAPI(CallManager)                  # proper schema name
+    callmanager = LazyAPI(CallManager)                   # alias
+    process_node = LazyAPI(ProcessNode)
+    dhcp_server = LazyAPI(DhcpServer)
+    dhcp_subnet = LazyAPI(DhcpSubnet)
+    enterprise_phone_config = LazyAPI(EnterprisePhoneConfig)
+
+    smart_license_status = LazyAPI(SmartLicenseStatus)   # Experimental
+    licensed_user = LazyAPI(LicensedUser)                # Experimental
+
+    # media API wrappers
+    announcement = LazyAPI(Announcement)
+    annunciator = LazyAPI(Annunciator)
+    conference_bridge = LazyAPI(ConferenceBridge)
+    fixed_moh_audio_source = LazyAPI(FixedMohAudioSource)
+    media_resource_group = LazyAPI(MediaResourceGroup)       # proper schema name
+    mrg = LazyAPI(MediaResourceGroup)                        # alias
+    media_resource_list = LazyAPI(MediaResourceList)         # proper schema name
+    mrgl = LazyAPI(MediaResourceList)                        # alias
+    mtp = LazyAPI(Mtp)
+    transcoder = LazyAPI(Transcoder)
+    mobile_voice_access = LazyAPI(MobileVoiceAccess)
+    moh_audio_source = LazyAPI(MohAudioSource)
+    moh_server = LazyAPI(MohServer)
+    voh_server = LazyAPI(VohServer)
+
+    # advanced API wrappers
+    called_party_tracing = LazyAPI(CalledPartyTracing)
+    dir_number_alias_lookupand_sync = LazyAPI(DirNumberAliasLookupandSync)   # proper schema name
+    directory_number_alias_sync = LazyAPI(DirNumberAliasLookupandSync)       # alias
+    ils_config = LazyAPI(IlsConfig)
+    message_waiting = LazyAPI(MessageWaiting)            # proper schema name
+    mra_service_domain = LazyAPI(MraServiceDomain)
+    mwi_number = LazyAPI(MessageWaiting)                 # alias
+    remote_cluster = LazyAPI(RemoteCluster)
+    voice_mail_pilot = LazyAPI(VoiceMailPilot)           # proper schema name
+    voicemail_pilot = LazyAPI(VoiceMailPilot)            # alias
+    voice_mail_profile = LazyAPI(VoiceMailProfile)       # proper schema name
+    voicemail_profile = LazyAPI(VoiceMailProfile)        # alias
+    vpn_gateway = LazyAPI(VpnGateway)
+    vpn_group = LazyAPI(VpnGroup)
+    vpn_profile = LazyAPI(VpnProfile)
+    secure_config = LazyAPI(SecureConfig)
+    infrastructure_device = LazyAPI(InfrastructureDevice)
+
+    # serviceability API wrappers
+    billing_server = LazyAPI(BillingServer)
+    snmp_community_string = LazyAPI(SNMPCommunityString)     # alias (schema name not used)
+    snmp_user = LazyAPI(SNMPUser)                            # alias (schema name not used)
+    snmp_mib2_system_group = LazyAPI(SNMPMIB2List)           # alias (schema name not used)
+    syslog_configuration = LazyAPI(SyslogConfiguration)
+    process_node_service = LazyAPI(ProcessNodeService)
+
+
     def __init__(self, **kwargs):
         connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
         connection_kwargs["binding_name"] = "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding"
@@ -143,199 +393,6 @@ class UCMAXLConnector(UCSOAPConnector):
         del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
         super().__init__(**connection_kwargs)
 
-        # sql API wrapper
-        self.sql = ThinAXLAPI(self, axl_factory)
-
-        # device
-        self.device = Device(self, axl_factory)
-
-        # device API wrappers
-        self.common_device_config = CommonDeviceConfig(self, axl_factory)
-        self.common_phone_config = CommonPhoneConfig(self, axl_factory)             # proper schema name
-        self.common_phone_profile = CommonPhoneConfig(self, axl_factory)            # alias 
-        self.cti_route_point = CtiRoutePoint(self, axl_factory)
-        self.feature_control_policy = FeatureControlPolicy(self, axl_factory)
-        self.ip_phone_services = IpPhoneServices(self, axl_factory)                 # proper schema name (note it's plural)
-        self.ip_phone_service = IpPhoneServices(self, axl_factory)                  # alias
-        self.line = Line(self, axl_factory)
-        self.network_access_profile = NetworkAccessProfile(self, axl_factory)
-        self.phone = Phone(self, axl_factory)
-        self.phone_line = PhoneLine(self, axl_factory)                              # jre added, not in schema
-        self.default_device_profile = DefaultDeviceProfile(self, axl_factory)
-        self.device_profile = DeviceProfile(self, axl_factory)                      # proper schema name
-        self.udp = DeviceProfile(self, axl_factory)                                 # alias
-        self.phone_button_template = PhoneButtonTemplate(self, axl_factory)
-        self.phone_security_profile = PhoneSecurityProfile(self, axl_factory)
-        self.recording_profile = RecordingProfile(self, axl_factory)
-        self.sdp_transparency_profile = SdpTransparencyProfile(self, axl_factory)
-        self.sip_trunk = SipTrunk(self, axl_factory)
-        self.sip_trunk_security_profile = SipTrunkSecurityProfile(self, axl_factory)
-        self.sip_profile = SipProfile(self, axl_factory)
-        self.sip_normalization_script = SIPNormalizationScript(self, axl_factory)
-        self.soft_key_template = SoftKeyTemplate(self, axl_factory)                     # proper schema name
-        self.softkey_template = SoftKeyTemplate(self, axl_factory)                      # alias
-        self.soft_key_set = SoftKeySet(self, axl_factory)                               # proper schema name
-        self.softkey_set = SoftKeySet(self, axl_factory)                                # alias
-        self.universal_device_template = UniversalDeviceTemplate(self, axl_factory)     # proper schema name
-        self.udt = UniversalDeviceTemplate(self, axl_factory)                           # alias
-        self.universal_line_template = UniversalLineTemplate(self, axl_factory)         # proper schema name
-        self.ult = UniversalLineTemplate(self, axl_factory)                             # alias
-        self.remote_destination_profile = RemoteDestinationProfile(self, axl_factory)   # proper schema name
-        self.rdp = RemoteDestinationProfile(self, axl_factory)                          # alias
-        self.remote_destination = RemoteDestination(self, axl_factory)
-        self.wifi_hotspot = WifiHotspot(self, axl_factory)
-        self.wlan_profile = WLANProfile(self, axl_factory)                              # Case issue in name
-        self.wlan_profile_group = WlanProfileGroup(self, axl_factory)
-
-        # user API wrappers
-        self.app_user = AppUser(self, axl_factory)                                      # proper schema name
-        self.application_user = AppUser(self, axl_factory)                              # alias
-        self.application_user_capf_profile = ApplicationUserCapfProfile(self, axl_factory)
-        self.credential_policy = CredentialPolicy(self, axl_factory)
-        self.credential_policy_default = CredentialPolicyDefault(self, axl_factory)
-        self.end_user_capf_profile = EndUserCapfProfile(self, axl_factory)
-        self.feature_group_template = FeatureGroupTemplate(self, axl_factory)
-        self.user = User(self, axl_factory)
-        self.uc_service = UcService(self, axl_factory)
-        self.sip_realm = SipRealm(self, axl_factory)
-        self.self_provisioning = SelfProvisioning(self, axl_factory)
-        self.service_profile = ServiceProfile(self, axl_factory)
-        self.user_group = UserGroup(self, axl_factory)
-        self.user_profile_provision = UserProfileProvision(self, axl_factory)           # proper schema name
-        self.user_profile = UserProfileProvision(self, axl_factory)                     # alias
-        self.user_rank = UserRank(self, axl_factory)                                    # ADD-ON (not in Cisco spec)
-        self.user_role = UserRole(self, axl_factory)                                    # ADD-ON (not in Cisco spec)
-        
-        # dialplan API wrappers
-        self.caller_filter_list = CallerFilterList(self, axl_factory)
-        self.advertised_patterns = AdvertisedPatterns(self, axl_factory)
-        self.aar_group = AarGroup(self, axl_factory)
-        self.application_dial_rules = ApplicationDialRules(self, axl_factory)
-        self.blocked_learned_patterns = BlockedLearnedPatterns(self, axl_factory)
-        self.call_pickup_group = CallPickupGroup(self, axl_factory)
-        self.call_park = CallPark(self, axl_factory)
-        self.called_party_transformation_pattern = CalledPartyTransformationPattern(self, axl_factory)      # proper schema name
-        self.called_party_xform_pattern = CalledPartyTransformationPattern(self, axl_factory)               # alias
-        self.calling_party_transformation_pattern = CallingPartyTransformationPattern(self, axl_factory)    # proper schema name
-        self.calling_party_xform_pattern = CallingPartyTransformationPattern(self, axl_factory)             # alias
-        self.transformation_profile = TransformationProfile(self, axl_factory)
-        self.conference_now = ConferenceNow(self, axl_factory)
-        self.cmc_info = CmcInfo(self, axl_factory)                                  # proper schema name
-        self.cmc = CmcInfo(self, axl_factory)                                       # alias
-        self.css = Css(self, axl_factory)
-        self.directed_call_park = DirectedCallPark(self, axl_factory)
-        self.directory_lookup_dial_rules = DirectoryLookupDialRules(self, axl_factory)          # proper schema name
-        self.directory_lookup_rules = DirectoryLookupDialRules(self, axl_factory)               # alias
-        self.enterprise_feature_access_configuration = EnterpriseFeatureAccessConfiguration(self, axl_factory)  # proper schema name
-        self.mobility_enterprise_feature_access_number = EnterpriseFeatureAccessConfiguration(self, axl_factory)    # alias
-        self.fac_info = FacInfo(self, axl_factory)                                  # proper schema name
-        self.fac = FacInfo(self, axl_factory)                                       # alias
-        self.handoff_mobility = Mobility(self, axl_factory)
-        self.handoff_configuration = HandoffConfiguration(self, axl_factory)
-        self.http_profile = HttpProfile(self, axl_factory)
-        self.meet_me = MeetMe(self, axl_factory)
-        self.mobility_profile = MobilityProfile(self, axl_factory)
-        self.hunt_list = HuntList(self, axl_factory)
-        self.hunt_pilot = HuntPilot(self, axl_factory)
-        self.line_group = LineGroup(self, axl_factory)
-        self.local_route_group = LocalRouteGroup(self, axl_factory)
-        self.route_filter = RouteFilter(self, axl_factory)
-        self.route_group = RouteGroup(self, axl_factory)
-        self.route_list = RouteList(self, axl_factory)
-        self.route_partition = RoutePartition(self, axl_factory)
-        self.route_pattern = RoutePattern(self, axl_factory)
-        self.route_plan = RoutePlan(self, axl_factory)                      # proper schema name
-        self.route_plan_report = RoutePlan(self, axl_factory)               # alias
-        self.sip_dial_rules = SipDialRules(self, axl_factory)
-        self.sip_route_pattern = SipRoutePattern(self, axl_factory)
-        self.time_period = TimePeriod(self, axl_factory)
-        self.time_schedule = TimeSchedule(self, axl_factory)
-        self.trans_pattern = TransPattern(self, axl_factory)                # proper schema name
-        self.translation_pattern = TransPattern(self, axl_factory)          # alias
-        self.route_partitions_for_learned_patterns = RoutePartitionsForLearnedPatterns(self, axl_factory)
-        self.elin_group = ElinGroup(self, axl_factory)
-
-        # system API wrappers
-        self.application_server = ApplicationServer(self, axl_factory)
-        self.audio_codec_preference_list = AudioCodecPreferenceList(self, axl_factory)
-        self.call_manager_group = CallManagerGroup(self, axl_factory)       # proper schema name
-        self.callmanager_group = CallManagerGroup(self, axl_factory)        # alias
-        self.date_time_group = DateTimeGroup(self, axl_factory)
-        self.device_mobility_group = DeviceMobilityGroup(self, axl_factory)
-        self.device_mobility = DeviceMobility(self, axl_factory)            # proper schema name
-        self.device_mobility_info = DeviceMobility(self, axl_factory)       # alias
-        self.device_pool = DevicePool(self, axl_factory)
-        self.ldap_directory = LdapDirectory(self, axl_factory)
-        self.ldap_filter = LdapFilter(self, axl_factory)
-        self.ldap_sync_custom_field = LdapSyncCustomField(self, axl_factory)
-        self.lbm_group = LbmGroup(self, axl_factory)
-        self.lbm_hub_group = LbmHubGroup(self, axl_factory)
-        self.location = Location(self, axl_factory)
-        self.presence_redundancy_group = PresenceRedundancyGroup(self, axl_factory)
-        self.phone_ntp= PhoneNtp(self, axl_factory)                         # proper schema name
-        self.phone_ntp_reference = PhoneNtp(self, axl_factory)              # alias
-        self.physical_location = PhysicalLocation(self, axl_factory)
-        self.presence_group = PresenceGroup(self, axl_factory)
-        self.region = Region(self, axl_factory)
-        self.srst = Srst(self, axl_factory)
-        self.service_parameter = ServiceParameter(self, axl_factory)
-        self.enterprise_parameter = EnterpriseParameter(self, axl_factory)
-        self.ldap_system = LdapSystem(self, axl_factory)
-        self.ldap_authentication = LdapAuthentication(self, axl_factory)
-        self.ldap_search = LdapSearch(self, axl_factory)
-        self.call_manager = CallManager(self, axl_factory)                  # proper schema name
-        self.callmanager = CallManager(self, axl_factory)                   # alias
-        self.process_node = ProcessNode(self, axl_factory)
-        self.dhcp_server = DhcpServer(self, axl_factory)
-        self.dhcp_subnet = DhcpSubnet(self, axl_factory)
-        self.enterprise_phone_config = EnterprisePhoneConfig(self, axl_factory)
-
-        self.smart_license_status = SmartLicenseStatus(self, axl_factory)   # Experimental
-        self.licensed_user = LicensedUser(self, axl_factory)                # Experimental
-
-        # media API wrappers
-        self.announcement = Announcement(self, axl_factory)
-        self.annunciator = Annunciator(self, axl_factory)
-        self.conference_bridge = ConferenceBridge(self, axl_factory)
-        self.fixed_moh_audio_source = FixedMohAudioSource(self, axl_factory)
-        self.media_resource_group = MediaResourceGroup(self, axl_factory)       # proper schema name
-        self.mrg = MediaResourceGroup(self, axl_factory)                        # alias
-        self.media_resource_list = MediaResourceList(self, axl_factory)         # proper schema name
-        self.mrgl = MediaResourceList(self, axl_factory)                        # alias
-        self.mtp = Mtp(self, axl_factory)
-        self.transcoder = Transcoder(self, axl_factory)
-        self.mobile_voice_access = MobileVoiceAccess(self, axl_factory)
-        self.moh_audio_source = MohAudioSource(self, axl_factory)
-        self.moh_server = MohServer(self, axl_factory)
-        self.voh_server = VohServer(self, axl_factory)
-
-        # advanced API wrappers
-        self.called_party_tracing = CalledPartyTracing(self, axl_factory)
-        self.dir_number_alias_lookupand_sync = DirNumberAliasLookupandSync(self, axl_factory)   # proper schema name
-        self.directory_number_alias_sync = DirNumberAliasLookupandSync(self, axl_factory)       # alias
-        self.ils_config = IlsConfig(self, axl_factory)
-        self.message_waiting = MessageWaiting(self, axl_factory)            # proper schema name
-        self.mra_service_domain = MraServiceDomain(self, axl_factory)
-        self.mwi_number = MessageWaiting(self, axl_factory)                 # alias
-        self.remote_cluster = RemoteCluster(self, axl_factory)
-        self.voice_mail_pilot = VoiceMailPilot(self, axl_factory)           # proper schema name
-        self.voicemail_pilot = VoiceMailPilot(self, axl_factory)            # alias
-        self.voice_mail_profile = VoiceMailProfile(self, axl_factory)       # proper schema name
-        self.voicemail_profile = VoiceMailProfile(self, axl_factory)        # alias
-        self.vpn_gateway = VpnGateway(self, axl_factory)
-        self.vpn_group = VpnGroup(self, axl_factory)
-        self.vpn_profile = VpnProfile(self, axl_factory)
-        self.secure_config = SecureConfig(self, axl_factory)
-        self.infrastructure_device = InfrastructureDevice(self, axl_factory)  
-
-        # serviceability API wrappers
-        self.billing_server = BillingServer(self, axl_factory)
-        self.snmp_community_string = SNMPCommunityString(self, axl_factory)     # alias (schema name not used)
-        self.snmp_user = SNMPUser(self, axl_factory)                            # alias (schema name not used)
-        self.snmp_mib2_system_group = SNMPMIB2List(self, axl_factory)           # alias (schema name not used)
-        self.syslog_configuration = SyslogConfiguration(self, axl_factory)
-        self.process_node_service = ProcessNodeService(self, axl_factory)
-
     def get_ccm_version(self, processNodeName=None):
         axl_resp = self.service.getCCMVersion(processNodeName=processNodeName)
         return serialize_object(axl_resp)["return"]["componentVersion"]["version"]
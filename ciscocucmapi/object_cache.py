@@ -0,0 +1,202 @@
+"""Read-through cache for slow-changing AXL objects
+
+Reports and provisioning scripts resolve the same reference objects (device pools, partitions,
+CSSes, locations, regions, product/model enums) over and over, each one a fresh AXL request.
+AXLObjectCache keeps get/list responses of selected API classes in memory (LRU with a TTL) and
+optionally in a SQLite file so the cache survives between runs.
+
+Entries are keyed by cluster (AXL address), object type and the request criteria.  Any add, update
+or remove of an object type through the connector drops every entry of that type for the cluster,
+so a cached list never misses an object added by the same script.
+
+Thin AXL selects that only read CUCM's type* enum tables (typeproduct, typemodel, ...) are cached
+under the 'sql' object type.  sql.update can write any table behind any cached type, so it drops
+every entry of the cluster.
+
+Usage:
+    axl = UCMAXLConnector(..., object_cache=True)                       # in memory, defaults
+    axl = UCMAXLConnector(..., object_cache=AXLObjectCache(ttl=3600, path='axl_cache.db'))
+    axl.device_pool.list()      # AXL request
+    axl.device_pool.list()      # from the cache
+    axl.object_cache.stats()
+"""
+
+import json
+import logging
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from copy import deepcopy
+
+# API classes cached by default (slow-changing reference objects)
+DEFAULT_CACHED_APIS = (
+    "CallManagerGroup", "Css", "DateTimeGroup", "DevicePool", "Location", "MediaResourceGroup",
+    "MediaResourceList", "PhoneButtonTemplate", "PhoneSecurityProfile", "PhysicalLocation", "Region",
+    "RoutePartition", "SoftKeyTemplate", "Srst", "sql",
+)
+DEFAULT_TTL = 300           # seconds
+DEFAULT_MAXSIZE = 1024      # entries held in memory
+
+# Thin AXL select reading only CUCM enum tables (type*), see is_type_table_select()
+SQL_KEYWORD = re.compile(r"\b(select|union|intersect|minus|except|join)\b", re.IGNORECASE)
+SQL_FROM = re.compile(r"^\s*select\s.+?\sfrom\s(?P<tables>.+?)(\s(where|group\s+by|order\s+by)\s.*)?;?\s*$",
+                      re.IGNORECASE | re.DOTALL)
+TYPE_TABLE = re.compile(r"^type\w+(\s+(as\s+)?\w+)?$", re.IGNORECASE)
+
+
+def is_type_table_select(sql_statement):
+    """True for a single select whose FROM list is only CUCM enum tables (type*)
+
+    Statements with a subquery, a set operation (union, ...) or a join are not enum-only even when
+    every table they name starts with 'type', so they are never cached.
+    """
+    if [keyword.lower() for keyword in SQL_KEYWORD.findall(sql_statement)] != ["select"]:
+        return False
+    match = SQL_FROM.match(sql_statement)
+    if match is None:
+        return False
+    return all(TYPE_TABLE.match(table.strip()) for table in match.group("tables").split(","))
+
+
+def cache_key(criteria):
+    """Stable text key for request criteria (dicts in any key order give the same key)"""
+    return json.dumps(criteria, sort_keys=True, default=str)
+
+
+class AXLObjectCache(object):
+    """Thread safe TTL + LRU cache of AXL responses with an optional SQLite store
+
+    :param ttl: (float) seconds an entry stays valid
+    :param maxsize: (int) entries held in memory, least recently used are evicted
+    :param path: optional SQLite file.  Entries are written through and read on a memory miss.
+    :param api_classes: API class names to cache ('sql' for type* enum table selects)
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAXSIZE, path=None, api_classes=DEFAULT_CACHED_APIS):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = path
+        self.api_classes = frozenset(api_classes)
+        self._entries = OrderedDict()   # (cluster, obj_type, action, criteria key) -> (created, value)
+        self._lock = threading.Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if path:
+            with self._db() as db:
+                db.execute("CREATE TABLE IF NOT EXISTS axl_cache (cluster TEXT, obj_type TEXT, action TEXT, "
+                           "criteria TEXT, created REAL, value BLOB, "
+                           "PRIMARY KEY (cluster, obj_type, action, criteria))")
+
+    @contextmanager
+    def _db(self):
+        # connection per operation, connector threads share the cache
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def caches(self, obj_type):
+        return obj_type in self.api_classes
+
+    def get(self, cluster, obj_type, action, criteria):
+        """Return (True, value) for a valid entry, (False, None) on a miss
+
+        The value is a copy, callers may modify it.
+        """
+        key = (cluster, obj_type, action, cache_key(criteria))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, deepcopy(entry[1])
+                del self._entries[key]
+
+        if self.path:
+            with self._db() as db:
+                row = db.execute("SELECT created, value FROM axl_cache WHERE cluster=? AND obj_type=? AND action=? "
+                                 "AND criteria=?", key).fetchone()
+            if row and now - row[0] < self.ttl:
+                value = pickle.loads(row[1])
+                with self._lock:
+                    self.hits += 1
+                    self._store(key, row[0], value)
+                return True, deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def set(self, cluster, obj_type, action, criteria, value):
+        """Cache a response (a copy is stored)"""
+        key = (cluster, obj_type, action, cache_key(criteria))
+        created = time.time()
+        value = deepcopy(value)
+        with self._lock:
+            self._store(key, created, value)
+        if self.path:
+            with self._db() as db:
+                db.execute("INSERT OR REPLACE INTO axl_cache VALUES (?, ?, ?, ?, ?, ?)",
+                           key + (created, pickle.dumps(value)))
+
+    def _store(self, key, created, value):
+        """Add entry to the in memory LRU (lock held)"""
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, cluster, obj_type):
+        """Drop every entry of an object type for a cluster"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == cluster and key[1] == obj_type]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+        if self.path:
+            with self._db() as db:
+                db.execute("DELETE FROM axl_cache WHERE cluster=? AND obj_type=?", (cluster, obj_type))
+        logging.debug(f"AXL object cache: {obj_type} invalidated for {cluster} ({len(stale)} entries)")
+
+    def invalidate_cluster(self, cluster):
+        """Drop every entry of a cluster (a SQL write can change any cached object type)"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == cluster]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+        if self.path:
+            with self._db() as db:
+                db.execute("DELETE FROM axl_cache WHERE cluster=?", (cluster,))
+        logging.debug(f"AXL object cache: all types invalidated for {cluster} ({len(stale)} entries)")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._db() as db:
+                db.execute("DELETE FROM axl_cache")
+
+    def stats(self):
+        """Return dict of cache counters"""
+        with self._lock:
+            return {'entries': len(self._entries),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    }
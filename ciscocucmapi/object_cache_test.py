@@ -0,0 +1,165 @@
+"""AXL object cache: TTL/LRU store, SQLite persistence and the Thin AXL enum table selects"""
+
+import time
+
+import pytest
+
+from ciscocucmapi.api.base import ThinAXLAPI
+from ciscocucmapi.object_cache import AXLObjectCache
+from ciscocucmapi.object_cache import is_type_table_select
+from ciscocucmapi.result_table import ResultTable
+
+CLUSTER = "https://cucm:8443/axl/"
+CRITERIA = {"searchCriteria": {"name": "%"}, "returnedTags": {"name": ""}}
+
+
+def test_get_set_returns_copies():
+    cache = AXLObjectCache()
+    value = [{"name": "DP1"}]
+    cache.set(CLUSTER, "DevicePool", "list", CRITERIA, value)
+    value.append({"name": "DP2"})
+
+    hit, cached = cache.get(CLUSTER, "DevicePool", "list", dict(reversed(list(CRITERIA.items()))))
+    assert (hit, cached) == (True, [{"name": "DP1"}])
+    cached.append({"name": "DP3"})
+    assert cache.get(CLUSTER, "DevicePool", "list", CRITERIA)[1] == [{"name": "DP1"}]
+    assert cache.get(CLUSTER, "DevicePool", "get", CRITERIA) == (False, None)
+
+
+def test_entries_expire_after_ttl():
+    cache = AXLObjectCache(ttl=0.05)
+    cache.set(CLUSTER, "Css", "list", CRITERIA, ["CSS1"])
+    time.sleep(0.06)
+    assert cache.get(CLUSTER, "Css", "list", CRITERIA) == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = AXLObjectCache(maxsize=2)
+    for name in ("DP1", "DP2"):
+        cache.set(CLUSTER, "DevicePool", "get", {"name": name}, name)
+    cache.get(CLUSTER, "DevicePool", "get", {"name": "DP1"})
+    cache.set(CLUSTER, "DevicePool", "get", {"name": "DP3"}, "DP3")
+
+    assert cache.get(CLUSTER, "DevicePool", "get", {"name": "DP2"})[0] is False
+    assert cache.get(CLUSTER, "DevicePool", "get", {"name": "DP1"})[0] is True
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_one_type_of_one_cluster():
+    cache = AXLObjectCache()
+    cache.set(CLUSTER, "DevicePool", "list", CRITERIA, ["DP1"])
+    cache.set(CLUSTER, "Css", "list", CRITERIA, ["CSS1"])
+    cache.set("https://other:8443/axl/", "DevicePool", "list", CRITERIA, ["DP9"])
+
+    cache.invalidate(CLUSTER, "DevicePool")
+
+    assert cache.get(CLUSTER, "DevicePool", "list", CRITERIA)[0] is False
+    assert cache.get(CLUSTER, "Css", "list", CRITERIA)[0] is True
+    assert cache.get("https://other:8443/axl/", "DevicePool", "list", CRITERIA)[0] is True
+
+
+def test_sqlite_store_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "axl_cache.db")
+    AXLObjectCache(path=path).set(CLUSTER, "Region", "list", CRITERIA, [{"name": "R1"}])
+
+    cache = AXLObjectCache(path=path)
+    assert cache.get(CLUSTER, "Region", "list", CRITERIA) == (True, [{"name": "R1"}])
+    cache.invalidate(CLUSTER, "Region")
+    assert AXLObjectCache(path=path).get(CLUSTER, "Region", "list", CRITERIA) == (False, None)
+
+
+class FakeService(object):
+    def __init__(self):
+        self.updates = 0
+
+    def executeSQLUpdate(self, sql):
+        self.updates += 1
+        return {"return": {"rowsUpdated": 1}}
+
+
+class FakeConnector(object):
+    cluster_key = CLUSTER
+
+    def __init__(self):
+        self.object_cache = AXLObjectCache()
+        self.service = FakeService()
+
+
+def thin_axl(connector):
+    api = ThinAXLAPI(connector, None)
+    api.queries = 0
+
+    def query_rows(sql_statement):
+        api.queries += 1
+        return ResultTable(("enum",), [(api.queries,)])
+
+    api._query_rows = query_rows
+    return api
+
+
+def test_enum_table_select_is_served_from_cache():
+    api = thin_axl(FakeConnector())
+    first = api.query("select enum, name from typemodel order by enum")
+    assert api.query("select enum, name from typemodel order by enum") == first
+    assert api.queries == 1
+
+
+def test_device_select_is_not_cached():
+    api = thin_axl(FakeConnector())
+    api.query("select name from device")
+    api.query("select name from device")
+    assert api.queries == 2
+
+
+def test_sql_update_invalidates_cached_selects():
+    api = thin_axl(FakeConnector())
+    api.query("select enum from typemodel")
+    assert api.update("update typemodel set name='x' where enum=1") == 1
+    api.query("select enum from typemodel")
+    assert api.queries == 2
+
+
+@pytest.mark.parametrize("sql_statement", [
+    "select enum, name from typemodel",
+    "SELECT m.name FROM typemodel m, typeproduct AS p WHERE m.enum=p.tkmodel ORDER BY m.name",
+    "select * from typeclass;",
+])
+def test_enum_table_selects_are_cached(sql_statement):
+    assert is_type_table_select(sql_statement)
+
+
+@pytest.mark.parametrize("sql_statement", [
+    "select d.name from device d where d.tkmodel in (select enum from typemodel)",
+    "select name from typemodel union select name from device",
+    "select m.name from typemodel m join device d on d.tkmodel=m.enum",
+    "select m.name from typemodel m, device d where d.tkmodel=m.enum",
+    "select name from device where name like 'type%'",
+])
+def test_other_selects_are_not_cached(sql_statement):
+    assert not is_type_table_select(sql_statement)
+
+
+def test_subquery_select_is_not_served_from_cache():
+    api = thin_axl(FakeConnector())
+    sql_statement = "select d.name from device d where d.tkmodel in (select enum from typemodel)"
+    api.query(sql_statement)
+    api.query(sql_statement)
+    assert api.queries == 2
+
+
+def test_sql_update_invalidates_every_cached_type_of_the_cluster():
+    connector = FakeConnector()
+    cache = connector.object_cache
+    api = thin_axl(connector)
+    cache.set(CLUSTER, "DevicePool", "list", {"name": "%"}, [{"name": "DP1"}])
+    cache.set("https://other:8443/axl/", "DevicePool", "list", {"name": "%"}, [{"name": "DP9"}])
+    api.query("select enum from typemodel")
+    api.query("select enum from typemodel")
+    assert api.queries == 1
+
+    api.update("update devicepool set name='DP2' where name='DP1'")
+
+    assert cache.get(CLUSTER, "DevicePool", "list", {"name": "%"}) == (False, None)
+    assert cache.get("https://other:8443/axl/", "DevicePool", "list", {"name": "%"})[0]
+    api.query("select enum from typemodel")
+    assert api.queries == 2
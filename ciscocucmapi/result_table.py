@@ -0,0 +1,120 @@
+"""Compact table type for Thin AXL SQL and list responses"""
+
+import csv
+from collections import OrderedDict
+
+
+class ResultTable(object):
+    """Rows of a query result stored as tuples with one shared header
+
+    A list of OrderedDicts repeats every column name in every row.  ResultTable keeps the column
+    names once and each row as a plain tuple, while still behaving like the old list of dicts:
+
+        for row in table:           # rows are yielded as OrderedDicts
+            row['pkid']
+        table[0].get('name')        # single row as an OrderedDict
+        len(table), bool(table)
+
+    Column and tuple access avoid building the dicts:
+
+        table['name']               # list of values for the column
+        table.tuples()              # iterator of row tuples in header order
+    """
+
+    __slots__ = ("header", "rows", "_index")
+
+    def __init__(self, header=(), rows=None):
+        """
+        :param header: column names
+        :param rows: list of row tuples (values in header order)
+        """
+        self.header = tuple(header)
+        self.rows = rows if rows is not None else []
+        self._index = {column: i for i, column in enumerate(self.header)}
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        """Build a table from an iterable of dict rows (ex: a query_iter or list response)
+
+        The header is taken from the first row.  Keys missing in later rows are stored as None.
+        """
+        header = None
+        rows = []
+        for row in dicts:
+            if header is None:
+                header = tuple(row.keys())
+            rows.append(tuple(row.get(column) for column in header))
+        return cls(header or (), rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        header = self.header
+        for row in self.rows:
+            yield OrderedDict(zip(header, row))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, slice):
+            return ResultTable(self.header, self.rows[key])
+        return OrderedDict(zip(self.header, self.rows[key]))
+
+    def __eq__(self, other):
+        if isinstance(other, ResultTable):
+            return self.header == other.header and self.rows == other.rows
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(columns={list(self.header)}, rows={len(self.rows)})"
+
+    @property
+    def columns(self):
+        return list(self.header)
+
+    def column(self, name):
+        """Return list of values for one column
+
+        :param name: column name
+        :raises KeyError: if the column is not in the header
+        """
+        i = self._index[name]
+        return [row[i] for row in self.rows]
+
+    def tuples(self):
+        """Iterate rows as tuples in header order"""
+        return iter(self.rows)
+
+    def filter(self, predicate=None, **equals):
+        """Return a new table with the rows that match
+
+        :param predicate: optional callable taking the row as an OrderedDict
+        :param equals: column=value pairs the row must match (ex: filter(licensetype='Enhanced'))
+        :return: ResultTable
+        """
+        tests = [(self._index[column], value) for column, value in equals.items()]
+        rows = [row for row in self.rows if all(row[i] == value for i, value in tests)]
+        if predicate is not None:
+            rows = [row for row in rows if predicate(OrderedDict(zip(self.header, row)))]
+        return ResultTable(self.header, rows)
+
+    def to_dicts(self):
+        """Return the old list of OrderedDicts"""
+        return list(self)
+
+    def to_csv(self, path_or_file, header=True):
+        """Write the table as CSV
+
+        :param path_or_file: file path or an open text file
+        :param header: (bool) write the column names as the first line
+        """
+        if isinstance(path_or_file, str):
+            with open(path_or_file, "w", newline="") as _:
+                return self.to_csv(_, header=header)
+        writer = csv.writer(path_or_file)
+        if header:
+            writer.writerow(self.header)
+        writer.writerows(self.rows)
@@ -0,0 +1,101 @@
+"""ResultTable and the SQL row serializers that build it"""
+
+from collections import OrderedDict
+
+from lxml import etree
+
+from ciscocucmapi._internal_utils import element_list_to_result_table
+from ciscocucmapi._internal_utils import iterparse_sql_rows
+from ciscocucmapi.result_table import ResultTable
+
+SQL_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+<soapenv:Body><ns:executeSQLQueryResponse xmlns:ns="http://www.cisco.com/AXL/API/12.5"><return>
+{rows}
+</return></ns:executeSQLQueryResponse></soapenv:Body></soapenv:Envelope>"""
+
+
+def table():
+    return ResultTable(("name", "model"), [("SEP001", "Cisco 8845"), ("SEP002", "Cisco 7841"),
+                                           ("CSFJDOE", "Cisco Unified Client Services Framework")])
+
+
+def sql_rows(*rows):
+    return ["".join(f"<{tag}>{text}</{tag}>" for tag, text in row) for row in rows]
+
+
+def test_rows_behave_like_the_old_list_of_dicts():
+    rows = table()
+    assert len(rows) == 3 and rows
+    assert not ResultTable()
+    assert rows[0] == OrderedDict([("name", "SEP001"), ("model", "Cisco 8845")])
+    assert [row["name"] for row in rows] == ["SEP001", "SEP002", "CSFJDOE"]
+    assert rows == rows.to_dicts()
+    assert rows.columns == ["name", "model"]
+
+
+def test_column_slice_and_tuples():
+    rows = table()
+    assert rows["model"][:2] == ["Cisco 8845", "Cisco 7841"]
+    assert rows[1:] == ResultTable(rows.header, rows.rows[1:])
+    assert list(rows.tuples())[2] == ("CSFJDOE", "Cisco Unified Client Services Framework")
+
+
+def test_filter_by_value_and_predicate():
+    rows = table()
+    assert rows.filter(model="Cisco 7841")["name"] == ["SEP002"]
+    assert rows.filter(lambda row: row["name"].startswith("SEP"))["name"] == ["SEP001", "SEP002"]
+    assert rows.filter(lambda row: row["name"].startswith("SEP"), model="Cisco 8845")["name"] == ["SEP001"]
+
+
+def test_from_dicts_fills_missing_keys():
+    rows = ResultTable.from_dicts([{"name": "SEP001", "model": "Cisco 8845"}, {"name": "SEP002"}])
+    assert rows.header == ("name", "model")
+    assert rows.rows == [("SEP001", "Cisco 8845"), ("SEP002", None)]
+    assert ResultTable.from_dicts([]).header == ()
+
+
+def test_to_csv(tmp_path):
+    path = str(tmp_path / "phones.csv")
+    table().to_csv(path)
+    with open(path) as csv_file:
+        assert csv_file.read().splitlines()[:2] == ["name,model", "SEP001,Cisco 8845"]
+
+
+def test_element_list_to_result_table():
+    elements = [etree.fromstring(f"<row>{row}</row>")
+                for row in sql_rows([("pkid", "1"), ("name", "SEP001")], [("pkid", "2"), ("name", "SEP002")])]
+    rows = element_list_to_result_table(elements)
+    assert rows.header == ("pkid", "name")
+    assert rows.rows == [("1", "SEP001"), ("2", "SEP002")]
+
+
+def test_iterparse_sql_rows_reorders_columns_to_header():
+    content = SQL_RESPONSE.format(rows="".join(
+        f"<row>{row}</row>" for row in sql_rows([("pkid", "1"), ("name", "SEP001")],
+                                                [("name", "SEP002"), ("pkid", "2")])))
+    header, rows = iterparse_sql_rows(content.encode())
+    assert header == ("pkid", "name")
+    assert rows == [("1", "SEP001"), ("2", "SEP002")]
+
+
+def test_iterparse_sql_rows_empty_response():
+    assert iterparse_sql_rows(SQL_RESPONSE.format(rows="").encode()) == ((), [])
+
+
+def test_element_list_to_result_table_aligns_missing_and_new_columns():
+    elements = [etree.fromstring(f"<row>{row}</row>")
+                for row in sql_rows([("pkid", "1"), ("name", "SEP001")],
+                                    [("name", "SEP002")],
+                                    [("description", "lobby"), ("pkid", "3"), ("name", "SEP003")])]
+    rows = element_list_to_result_table(elements)
+    assert rows.header == ("pkid", "name", "description")
+    assert rows.rows == [("1", "SEP001", None), (None, "SEP002", None), ("3", "SEP003", "lobby")]
+
+
+def test_iterparse_sql_rows_keeps_columns_missing_from_first_row():
+    content = SQL_RESPONSE.format(rows="".join(
+        f"<row>{row}</row>" for row in sql_rows([("name", "SEP001")], [("name", "SEP002"), ("pkid", "2")])))
+    header, rows = iterparse_sql_rows(content.encode())
+    assert header == ("name", "pkid")
+    assert rows == [("SEP001", None), ("SEP002", "2")]
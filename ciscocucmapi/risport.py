@@ -0,0 +1,194 @@
+"""RisPort70 real-time device status connector
+
+selectCmDeviceExt returns the registration status of at most 1000 devices per request
+(RISPORT['max_devices']) and CUCM rejects more than 15 RisPort requests per minute by default
+(Enterprise Parameter "Rate Control for RisPort70").  UCMRisPortConnector.device_status() splits a
+device list into 1000 device batches and sends the batches over a thread pool, paced by a sliding
+window rate limiter, so a 50k endpoint cluster takes 50 requests (a little over 3 minutes at 15/min)
+instead of one request per device.
+
+The StateInfo returned for each batch is kept.  Polling the same batches again sends it back and
+CUCM only returns devices for nodes where something changed (NoChange nodes reuse the previous
+result), so follow-up polls are small.
+
+Usage:
+    ris = UCMRisPortConnector(username=..., password=..., fqdn=...)
+    devices = ris.device_status(names)          # list of device dicts, one per node registration
+    devices = ris.device_status(names)          # incremental poll using StateInfo
+    ris.stats()
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from zeep.helpers import serialize_object
+
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import RISPORT
+from .definitions import WSDL_URLS
+
+RIS_MAX_DEVICES = RISPORT["max_devices"]["default"]
+RIS_RATE_LIMIT = 15         # requests per RIS_RATE_PERIOD (CUCM default for RisPort70)
+RIS_RATE_PERIOD = 60.0      # seconds
+RIS_WORKERS = 4             # batches in flight
+
+
+class RateLimiter(object):
+    """Sliding window limiter: at most 'requests' acquire() calls in any 'period' seconds (thread safe)"""
+
+    def __init__(self, requests=RIS_RATE_LIMIT, period=RIS_RATE_PERIOD):
+        self.requests = requests
+        self.period = period
+        self._sent = deque()        # times of the requests in the current window
+        self._lock = threading.Lock()
+        self.wait_time = 0.0
+
+    def acquire(self):
+        """Block until another request is allowed"""
+        start_time = time.time()
+        while True:
+            with self._lock:
+                now = time.time()
+                while self._sent and now - self._sent[0] >= self.period:
+                    self._sent.popleft()
+                if len(self._sent) < self.requests:
+                    self._sent.append(now)
+                    self.wait_time += now - start_time
+                    return
+                delay = self.period - (now - self._sent[0])
+            time.sleep(delay)
+
+
+class UCMRisPortConnector(UCSOAPConnector):
+    """UCM RisPort70 Connector
+
+    :param rate_limit: (int) requests allowed per rate_period (match the cluster's RisPort70 rate control)
+    :param rate_period: (float) seconds of the rate limit window
+    :param workers: (int) batch requests in flight
+    :param max_devices: (int) devices per selectCmDeviceExt request
+    """
+
+    _ENV = {
+        "username": "RIS_USERNAME",
+        "password": "RIS_PASSWORD",
+        "fqdn": "RIS_FQDN",
+        "wsdl": "RIS_WSDL_URL"
+    }
+
+    def __init__(self, rate_limit=RIS_RATE_LIMIT, rate_period=RIS_RATE_PERIOD, workers=RIS_WORKERS,
+                 max_devices=RIS_MAX_DEVICES, **kwargs):
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        fqdn = connection_kwargs.pop("fqdn")
+        if not connection_kwargs.get("wsdl"):
+            connection_kwargs["wsdl"] = WSDL_URLS["RisPort70"].format(fqdn=fqdn)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}RisBinding"
+        connection_kwargs["address"] = f"https://{fqdn}:8443/realtimeservice2/services/RISService70"
+        super().__init__(**connection_kwargs)
+
+        self.rate_limiter = RateLimiter(rate_limit, rate_period)
+        self.workers = workers
+        self.max_devices = max_devices
+        self._poll_state = {}       # batch key: (StateInfo, {node name: node devices}) of the last poll
+        self._state_lock = threading.Lock()
+
+        # counters
+        self.requests = 0
+        self.unchanged_nodes = 0
+
+    def select_cm_device(self, items, select_by="Name", device_class="Any", status="Any",
+                         model=RISPORT["all_models"], node_name=None, protocol="Any", state_info=""):
+        """One selectCmDeviceExt request (rate limited)
+
+        :param items: list of up to max_devices names/IPs/DNs (see RISPORT['type'] for select_by)
+        :param select_by: RISPORT['type'] value
+        :param device_class: RISPORT['class'] value
+        :param status: RISPORT['status'] value
+        :param model: model enum (255 for all)
+        :param node_name: limit to one node (None for all nodes)
+        :param protocol: 'Any', 'SIP', 'SCCP', ...
+        :param state_info: StateInfo of a previous identical request ('' for a full result)
+        :return: dict {'TotalDevicesFound', 'CmNodes', 'StateInfo'}
+        """
+        criteria = {
+            "MaxReturnedDevices": self.max_devices,
+            "DeviceClass": device_class,
+            "Model": model,
+            "Status": status,
+            "NodeName": node_name,
+            "SelectBy": select_by,
+            "SelectItems": {"item": [{"Item": item} for item in items]},
+            "Protocol": protocol,
+            "DownloadStatus": "Any",
+        }
+        self.rate_limiter.acquire()
+        with self._state_lock:
+            self.requests += 1
+        ris_resp = self.service.selectCmDeviceExt(CmSelectionCriteria=criteria, StateInfo=state_info)
+        return serialize_object(ris_resp)
+
+    def batches(self, items):
+        """Split items into lists of max_devices"""
+        items = list(items)
+        return [items[i:i + self.max_devices] for i in range(0, len(items), self.max_devices)]
+
+    def _poll_batch(self, batch, select_by, criteria):
+        """selectCmDeviceExt for one batch, incremental when this batch was polled before
+
+        :return: list of device dicts with a 'Node' key
+        """
+        key = (select_by, tuple(batch), tuple(sorted(criteria.items())))
+        with self._state_lock:
+            state_info, previous_nodes = self._poll_state.get(key, ("", {}))
+
+        ris_resp = self.select_cm_device(batch, select_by=select_by, state_info=state_info, **criteria)
+        result = ris_resp.get("SelectCmDeviceResult") or {}
+
+        nodes = {}
+        for node in (result.get("CmNodes") or {}).get("item") or []:
+            name = node.get("Name")
+            if node.get("NoChange") and name in previous_nodes:
+                with self._state_lock:
+                    self.unchanged_nodes += 1
+                nodes[name] = previous_nodes[name]
+                continue
+            if node.get("ReturnCode") not in ("Ok", None):
+                logging.debug(f"RisPort node {name}: {node.get('ReturnCode')}")
+            devices = (node.get("CmDevices") or {}).get("item") or []
+            nodes[name] = [dict(device, Node=name) for device in devices]
+
+        with self._state_lock:
+            self._poll_state[key] = (ris_resp.get("StateInfo") or "", nodes)
+        return [device for devices in nodes.values() for device in devices]
+
+    def device_status(self, items, select_by="Name", **criteria):
+        """Registration status of any number of devices
+
+        Devices are requested in max_devices batches over 'workers' threads within the rate limit.
+        A device has one entry per node it has registration history on.
+
+        :param items: device names (or IPs/DNs, see select_by)
+        :param select_by: RISPORT['type'] value
+        :param criteria: other select_cm_device() arguments (device_class, status, model, ...)
+        :return: list of device dicts ('Name', 'Status', 'IPAddress', ..., 'Node')
+        """
+        batches = self.batches(items)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda batch: self._poll_batch(batch, select_by, criteria), batches)
+            return [device for devices in results for device in devices]
+
+    def clear_state(self):
+        """Forget StateInfo so the next poll returns full results"""
+        with self._state_lock:
+            self._poll_state.clear()
+
+    def stats(self):
+        """Return dict of request counters"""
+        return {'requests': self.requests,
+                'unchanged_nodes': self.unchanged_nodes,
+                'rate_wait_time': round(self.rate_limiter.wait_time, 3),
+                'batches_tracked': len(self._poll_state),
+                }
@@ -0,0 +1,86 @@
+"""UCMRisPortConnector batching, StateInfo polling and rate limiting against a stubbed service"""
+
+import threading
+import time
+
+from ciscocucmapi.risport import RateLimiter
+from ciscocucmapi.risport import UCMRisPortConnector
+
+
+class FakeRisService(object):
+    """selectCmDeviceExt stand-in: every device registered on one node; with a StateInfo the node is NoChange"""
+
+    def __init__(self, node="cucm-sub1"):
+        self.node = node
+        self.requests = []
+
+    def selectCmDeviceExt(self, CmSelectionCriteria, StateInfo):
+        items = [item["Item"] for item in CmSelectionCriteria["SelectItems"]["item"]]
+        self.requests.append((items, StateInfo))
+        if StateInfo:
+            node = {"Name": self.node, "NoChange": True, "ReturnCode": "Ok", "CmDevices": None}
+        else:
+            node = {"Name": self.node, "NoChange": False, "ReturnCode": "Ok",
+                    "CmDevices": {"item": [{"Name": item, "Status": "Registered"} for item in items]}}
+        return {"SelectCmDeviceResult": {"TotalDevicesFound": len(items), "CmNodes": {"item": [node]}},
+                "StateInfo": f"<StateInfo batch='{items[0]}'/>"}
+
+
+def ris_connector(max_devices=1000, workers=2):
+    """UCMRisPortConnector without a WSDL (UCSOAPConnector.__init__ is skipped)"""
+    ris = object.__new__(UCMRisPortConnector)
+    ris._service = FakeRisService()
+    ris.rate_limiter = RateLimiter(requests=100, period=60)
+    ris.workers = workers
+    ris.max_devices = max_devices
+    ris._poll_state = {}
+    ris._state_lock = threading.Lock()
+    ris.requests = 0
+    ris.unchanged_nodes = 0
+    return ris
+
+
+def names(count):
+    return [f"SEP{n:012d}" for n in range(count)]
+
+
+def test_device_status_batches_max_devices_per_request():
+    ris = ris_connector(max_devices=1000)
+    devices = ris.device_status(names(2500))
+
+    assert sorted(len(items) for items, _ in ris.service.requests) == [500, 1000, 1000]
+    assert [device["Name"] for device in devices] == names(2500)
+    assert {device["Node"] for device in devices} == {"cucm-sub1"}
+    assert ris.stats()["requests"] == 3
+
+
+def test_second_poll_sends_state_info_and_reuses_unchanged_nodes():
+    ris = ris_connector(max_devices=2)
+    first = ris.device_status(names(3))
+    second = ris.device_status(names(3))
+
+    assert second == first
+    state_infos = [state_info for _, state_info in ris.service.requests]
+    assert state_infos[:2] == ["", ""]
+    assert sorted(state_infos[2:]) == ["<StateInfo batch='SEP000000000000'/>", "<StateInfo batch='SEP000000000002'/>"]
+    assert ris.stats()["unchanged_nodes"] == 2
+
+    ris.clear_state()
+    ris.device_status(names(3))
+    assert [state_info for _, state_info in ris.service.requests[4:]] == ["", ""]
+
+
+def test_state_info_is_kept_per_criteria():
+    ris = ris_connector()
+    ris.device_status(names(3))
+    ris.device_status(names(3), status="Registered")
+    assert [state_info for _, state_info in ris.service.requests] == ["", ""]
+
+
+def test_rate_limiter_waits_for_the_window():
+    limiter = RateLimiter(requests=2, period=0.2)
+    start_time = time.time()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.time() - start_time >= 0.19
+    assert limiter.wait_time >= 0.19
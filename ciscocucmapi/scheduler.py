@@ -0,0 +1,278 @@
+"""Adaptive AXL request scheduler
+
+CUCM throttles AXL under load: it answers HTTP 503 (or 429) or returns a
+"Maximum AXL Memory Allocation Consumed" fault.  AXLScheduler paces every AXL request sent through
+a connector and adapts to those signals AIMD style (like TCP congestion control):
+
+- each successful request adds a little to the concurrency limit and the request rate
+- a throttled request halves both
+- a request much slower than the usual latency of its operation (latency_factor x) reduces the
+  concurrency limit before CUCM starts throttling.  Each AXL operation (getCCMVersion,
+  executeSQLQuery, listPhone, ...) has its own latency baseline so fast and slow operations sharing
+  a scheduler are not compared with each other.
+
+Throttled requests were not processed by CUCM, so ScheduledTransport re-sends them after a
+jittered exponential backoff.
+
+UCMAXLAsyncConnector uses AsyncScheduledTransport, which paces and retries the same way
+without blocking the event loop.
+
+Usage:
+    axl = UCMAXLConnector(..., scheduler=True)              # scheduler for this connector
+    axl = UCMAXLConnector(..., scheduler=AXLScheduler())    # share one scheduler per cluster
+    axl.scheduler.stats()
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+
+from zeep.transports import AsyncTransport
+from zeep.transports import Transport
+
+from .api.base import AXL_THROTTLE_STATUS_CODES
+
+# text in a SOAP fault (HTTP 500) that means AXL is throttling rather than rejecting the request
+THROTTLE_FAULT_MARKERS = (b"Maximum AXL Memory Allocation Consumed", b"AXL Service is overloaded")
+
+# share of the gap a slower request moves an operation's latency baseline up (faster ones reset it)
+LATENCY_BASELINE_DECAY = 0.05
+
+# seconds between checks for a free slot by asyncio callers (AsyncScheduledTransport)
+ASYNC_SLOT_POLL = 0.05
+
+
+class AXLScheduler(object):
+    """AIMD concurrency and rate limiter shared by all threads using a connector
+
+    :param concurrency: (int) starting number of requests allowed in flight
+    :param min_concurrency: (int) lowest concurrency limit
+    :param max_concurrency: (int) highest concurrency limit
+    :param rate: (float) starting requests per second
+    :param min_rate: (float) lowest requests per second
+    :param max_rate: (float) highest requests per second
+    :param decrease: (float) multiplier applied to concurrency and rate when throttled
+    :param latency_factor: (float) latency over this multiple of the operation's baseline counts as congestion
+    :param baseline_decay: (float) share of the gap a slower request moves the operation's baseline up
+    :param backoff: (float) base seconds for the retry backoff
+    :param max_backoff: (float) longest retry wait in seconds
+    """
+
+    def __init__(self, concurrency=2, min_concurrency=1, max_concurrency=8,
+                 rate=10.0, min_rate=0.5, max_rate=50.0, decrease=0.5,
+                 latency_factor=4.0, backoff=1.0, max_backoff=60.0, baseline_decay=LATENCY_BASELINE_DECAY):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.baseline_decay = baseline_decay
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.concurrency_limit = float(concurrency)
+        self.rate = float(rate)
+
+        self._condition = threading.Condition()
+        self._next_send_time = 0.0
+        self.in_flight = 0
+        self.latency_baselines = {}     # operation name: baseline latency in seconds
+
+        # counters
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.slow = 0
+        self.wait_time = 0.0
+
+    def acquire(self):
+        """Block until a request may be sent (a free concurrency slot and the rate allows it)"""
+        start_time = time.time()
+        with self._condition:
+            while self.in_flight >= int(self.concurrency_limit):
+                self._condition.wait()
+            delay = self._take_slot()
+
+        if delay > 0:
+            time.sleep(delay)
+        self.add_wait_time(time.time() - start_time)
+
+    def try_acquire(self):
+        """Non-blocking acquire() for asyncio callers
+
+        :return: seconds to wait before sending (the slot is taken), None if no slot is free
+        """
+        with self._condition:
+            if self.in_flight >= int(self.concurrency_limit):
+                return None
+            return self._take_slot()
+
+    def _take_slot(self):
+        """Take a concurrency slot and the next send time (lock held).  Returns seconds to wait."""
+        self.in_flight += 1
+        self.requests += 1
+
+        now = time.time()
+        send_time = max(now, self._next_send_time)
+        self._next_send_time = send_time + 1.0 / self.rate
+        return send_time - now
+
+    def add_wait_time(self, seconds):
+        with self._condition:
+            self.wait_time += seconds
+
+    def release(self, latency, throttled=False, operation=None):
+        """Free the slot taken by acquire() and adjust the limits from the request's outcome
+
+        :param latency: (float) seconds the request took (None if it failed without a response)
+        :param throttled: (bool) AXL throttled the request
+        :param operation: (str) AXL operation name, selects the latency baseline
+        """
+        with self._condition:
+            self.in_flight -= 1
+
+            if latency is None:
+                pass
+            elif throttled:
+                self.throttled += 1
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease)
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                logging.debug(f"AXL throttled: concurrency {self.concurrency_limit:.1f}, rate {self.rate:.1f}/s")
+            else:
+                baseline = self.latency_baselines.get(operation)
+                if baseline is None or latency < baseline:
+                    self.latency_baselines[operation] = latency
+                else:
+                    # drifts up with the operation's typical latency so one fast outlier is forgotten
+                    self.latency_baselines[operation] = baseline + (latency - baseline) * self.baseline_decay
+                if baseline is not None and latency > self.latency_factor * baseline \
+                        and self.concurrency_limit > self.min_concurrency:
+                    self.slow += 1
+                    self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit - 1)
+                else:
+                    # additive increase: about +1 per limit's worth of successful requests
+                    self.concurrency_limit = min(self.max_concurrency,
+                                                 self.concurrency_limit + 1.0 / self.concurrency_limit)
+                    self.rate = min(self.max_rate, self.rate + 1.0 / self.rate)
+
+            self._condition.notify_all()
+
+    def record_retry(self):
+        with self._condition:
+            self.retries += 1
+
+    def backoff(self, attempt):
+        """Seconds to wait before retry number attempt (0 based): full jitter exponential backoff"""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def stats(self):
+        """Return dict of current limits and counters"""
+        with self._condition:
+            return {'concurrency_limit': int(self.concurrency_limit),
+                    'rate': round(self.rate, 2),
+                    'in_flight': self.in_flight,
+                    'requests': self.requests,
+                    'retries': self.retries,
+                    'throttled': self.throttled,
+                    'slow': self.slow,
+                    'wait_time': round(self.wait_time, 3),
+                    'latency_baselines': {operation: round(baseline, 3)
+                                          for operation, baseline in self.latency_baselines.items()},
+                    }
+
+
+class ScheduledTransport(Transport):
+    """zeep Transport that sends every AXL operation through an AXLScheduler and retries throttling
+
+    WSDL/XSD loading is not scheduled.
+    """
+
+    def __init__(self, scheduler, max_retries=5, **kwargs):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    @staticmethod
+    def operation_name(headers):
+        """AXL operation name from the SOAPAction header (ex: '"CUCM:DB ver=12.5 listPhone"')"""
+        action = headers.get("SOAPAction", "") if headers else ""
+        return action.strip('"').split(" ")[-1] or None
+
+    @staticmethod
+    def is_throttled(response):
+        if response.status_code in AXL_THROTTLE_STATUS_CODES:
+            return True
+        return response.status_code == 500 and any(marker in response.content for marker in THROTTLE_FAULT_MARKERS)
+
+    def post_xml(self, address, envelope, headers):
+        attempt = 0
+        operation = self.operation_name(headers)
+        while True:
+            self.scheduler.acquire()
+            start_time = time.time()
+            try:
+                response = super().post_xml(address, envelope, headers)
+            except Exception:
+                self.scheduler.release(None)
+                raise
+            throttled = self.is_throttled(response)
+            self.scheduler.release(time.time() - start_time, throttled=throttled, operation=operation)
+
+            if not throttled or attempt >= self.max_retries:
+                return response
+
+            delay = self.scheduler.backoff(attempt)
+            attempt += 1
+            self.scheduler.record_retry()
+            logging.warning(f"AXL throttled (HTTP {response.status_code}), retry {attempt}/{self.max_retries} "
+                            f"in {delay:.1f} seconds")
+            time.sleep(delay)
+
+
+class AsyncScheduledTransport(AsyncTransport):
+    """AsyncTransport (httpx) version of ScheduledTransport for UCMAXLAsyncConnector
+
+    Waiting for a slot, the rate and the retry backoff are awaited, so the event loop keeps running.
+    """
+
+    def __init__(self, scheduler, max_retries=5, **kwargs):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    async def _acquire(self):
+        start_time = time.time()
+        delay = self.scheduler.try_acquire()
+        while delay is None:
+            await asyncio.sleep(ASYNC_SLOT_POLL)
+            delay = self.scheduler.try_acquire()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.scheduler.add_wait_time(time.time() - start_time)
+
+    async def post_xml(self, address, envelope, headers):
+        attempt = 0
+        operation = ScheduledTransport.operation_name(headers)
+        while True:
+            await self._acquire()
+            start_time = time.time()
+            try:
+                response = await super().post_xml(address, envelope, headers)
+            except Exception:
+                self.scheduler.release(None)
+                raise
+            throttled = ScheduledTransport.is_throttled(response)
+            self.scheduler.release(time.time() - start_time, throttled=throttled, operation=operation)
+
+            if not throttled or attempt >= self.max_retries:
+                return response
+
+            delay = self.scheduler.backoff(attempt)
+            attempt += 1
+            self.scheduler.record_retry()
+            logging.warning(f"AXL throttled (HTTP {response.status_code}), retry {attempt}/{self.max_retries} "
+                            f"in {delay:.1f} seconds")
+            await asyncio.sleep(delay)
@@ -0,0 +1,260 @@
+"""Persistent cache of compiled zeep WSDL documents
+
+zeep parses and compiles the whole AXL WSDL/XSD set (3.7MB AXLSoap.xsd) every time a client is
+built.  zeep's SqliteCache only caches remote fetches, not the compiled result.
+
+This module pickles the compiled zeep Document for a local schema directory to disk.  The cache
+file name is a hash of every .wsdl/.xsd file in the directory (plus zeep/python versions and the
+strict setting) so editing a schema file invalidates it.  Later constructions load the pickle
+instead of parsing the XSD.
+
+zeep builds a class per schema type (tens of thousands for AXL) which pickle does not support
+out of the box.  SchemaPickler rebuilds those classes on load and drops values zeep recomputes
+lazily.  Loading is done with the garbage collector paused since GC passes over the large object
+graph are most of the load time.
+
+Unpickling runs code named in the file, so the cache directory is created private (0700) and a
+cache file is only loaded when it and its directory belong to the current user and are not group
+or world writable.
+
+Usage:
+    document = load_document('ciscocucmapi/schema/14.0/AXLAPI.wsdl', transport, settings)
+    client = Client(wsdl=document, transport=transport, settings=settings)
+
+Benchmark (cold parse vs warm cache load):
+    python -c "from ciscocucmapi.schema_cache import benchmark; benchmark()"
+"""
+
+import functools
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import platform
+import tempfile
+import time
+
+import zeep
+from lxml import etree
+from zeep.wsdl import Document
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CACHE_ENV = "AXL_SCHEMA_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ciscocucmapi")
+SCHEMA_FILE_SUFFIXES = (".wsdl", ".xsd")
+PICKLE_PROTOCOL = 5
+CACHE_DIR_MODE = 0o700
+
+# zeep modules holding classes created at runtime (one per schema type)
+_DYNAMIC_TYPE_MODULES = ("zeep.xsd.dynamic_types", "zeep.objects")
+
+# placeholders for connector-specific objects that are never written to the cache
+_TRANSPORT_ID = "transport"
+_SETTINGS_ID = "settings"
+
+
+def get_cache_dir(cache_dir=None):
+    """Cache directory from parameter, AXL_SCHEMA_CACHE_DIR env variable or default"""
+    return cache_dir or os.environ.get(SCHEMA_CACHE_ENV) or DEFAULT_CACHE_DIR
+
+
+def is_local_wsdl(wsdl):
+    """True if wsdl is a path to a local file (remote URLs are not cached here)"""
+    return isinstance(wsdl, (str, os.PathLike)) and os.path.isfile(wsdl)
+
+
+def schema_hash(wsdl, strict=True):
+    """Hash all schema files in the WSDL's directory
+
+    :param wsdl: path to the local WSDL file
+    :param strict: zeep strict setting (compiled output differs)
+    :return: (str) hex digest used as the cache key
+    """
+    schema_dir = os.path.dirname(os.path.abspath(wsdl))
+    digest = hashlib.sha256()
+    digest.update(f"{zeep.__version__}|{platform.python_version()}|{strict}|{os.path.basename(wsdl)}".encode())
+    for filename in sorted(os.listdir(schema_dir)):
+        if filename.endswith(SCHEMA_FILE_SUFFIXES):
+            digest.update(filename.encode())
+            with open(os.path.join(schema_dir, filename), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_property_names(cls):
+    """Names of functools.cached_property attributes zeep recomputes on demand"""
+    return frozenset(name for klass in cls.__mro__ for name, value in vars(klass).items()
+                     if isinstance(value, functools.cached_property))
+
+
+class SchemaPickler(pickle.Pickler):
+    """Pickler for compiled zeep Documents
+
+    - transport and settings are written as placeholders and swapped for the new connector's objects
+    - lxml QNames are written as their text
+    - runtime zeep type classes are rebuilt from name, bases and class attributes
+    - cached_property values are dropped and recomputed by zeep on first use
+    """
+
+    def __init__(self, file, transport, settings):
+        super().__init__(file, protocol=PICKLE_PROTOCOL)
+        self._transport = transport
+        self._settings = settings
+
+    def persistent_id(self, obj):
+        if obj is self._transport:
+            return _TRANSPORT_ID
+        if obj is self._settings:
+            return _SETTINGS_ID
+        if isinstance(obj, etree.QName):
+            return ("qname", obj.text)
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            if obj.__module__ in _DYNAMIC_TYPE_MODULES:
+                attrs = {k: v for k, v in vars(obj).items() if k not in ("__dict__", "__weakref__")}
+                return type, (obj.__name__, obj.__bases__, attrs)
+            return NotImplemented
+
+        if type(obj).__name__ in ("dict_values", "odict_values"):
+            return list, (list(obj),)
+
+        if type(obj).__module__.startswith("zeep.") and hasattr(obj, "__dict__"):
+            names = _cached_property_names(type(obj))
+            if names and names.intersection(obj.__dict__):
+                reduced = obj.__reduce_ex__(PICKLE_PROTOCOL)
+                if isinstance(reduced, tuple) and len(reduced) > 2 and isinstance(reduced[2], dict):
+                    state = {k: v for k, v in reduced[2].items() if k not in names}
+                    return (reduced[0], reduced[1], state) + tuple(reduced[3:])
+
+        return NotImplemented
+
+
+class SchemaUnpickler(pickle.Unpickler):
+    """Unpickler for documents written by SchemaPickler"""
+
+    def __init__(self, file, transport, settings):
+        super().__init__(file)
+        self._transport = transport
+        self._settings = settings
+        self._qnames = {}
+
+    def persistent_load(self, pid):
+        if pid == _TRANSPORT_ID:
+            return self._transport
+        if pid == _SETTINGS_ID:
+            return self._settings
+        _, text = pid
+        qname = self._qnames.get(text)
+        if qname is None:
+            qname = self._qnames[text] = etree.QName(text)
+        return qname
+
+
+def check_trusted_path(path):
+    """Raise PermissionError unless path is owned by the current user and not writable by group or others
+
+    Not checked where file ownership is not available (Windows).
+    """
+    if not hasattr(os, "getuid"):
+        return
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+        raise PermissionError(f"{path} is not owned by the current user or is writable by others")
+
+
+def _load_pickle(path, transport, settings):
+    """Unpickle a cached document with the garbage collector paused
+
+    :raises PermissionError: if the file or its directory could have been written by another user
+    """
+    check_trusted_path(os.path.dirname(path))
+    check_trusted_path(path)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as file:
+            return SchemaUnpickler(file, transport, settings).load()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _save_pickle(path, document, transport, settings):
+    """Write the document atomically so a partial file is never loaded"""
+    os.makedirs(os.path.dirname(path), mode=CACHE_DIR_MODE, exist_ok=True)
+    check_trusted_path(os.path.dirname(path))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")     # created 0600
+    try:
+        with os.fdopen(fd, "wb") as file:
+            SchemaPickler(file, transport, settings).dump(document)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_document(wsdl, transport, settings, cache_dir=None):
+    """Return a compiled zeep Document, from the on-disk cache when possible
+
+    Remote WSDLs and any cache read/write failure fall back to a normal zeep parse.
+
+    :param wsdl: WSDL location
+    :param transport: zeep Transport the document (and client) will use
+    :param settings: zeep Settings the document (and client) will use
+    :param cache_dir: override of the cache directory
+    :return: zeep.wsdl.Document
+    """
+    if not is_local_wsdl(wsdl):
+        return Document(wsdl, transport, settings=settings)
+
+    path = os.path.join(get_cache_dir(cache_dir), f"{schema_hash(wsdl, settings.strict)}.pickle")
+
+    if os.path.isfile(path):
+        try:
+            return _load_pickle(path, transport, settings)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable schema cache {path}: {e}")
+
+    document = Document(wsdl, transport, settings=settings)
+    try:
+        _save_pickle(path, document, transport, settings)
+    except Exception as e:
+        logger.warning(f"Unable to write schema cache {path}: {e}")
+    return document
+
+
+def benchmark(versions=("12.5", "14.0", "current"), schema_dir="ciscocucmapi/schema", runs=3):
+    """Compare cold (zeep parse) and warm (cache load) connector construction times
+
+    Uses a temporary cache directory so an existing cache is not touched.
+    """
+    from .connectors import UCMAXLConnector
+
+    previous_cache_dir = os.environ.get(SCHEMA_CACHE_ENV)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ[SCHEMA_CACHE_ENV] = cache_dir
+        try:
+            print(f"{'version':<10} {'cold':>8} {'first':>8} {'warm':>8}  speedup")
+            for version in versions:
+                wsdl = f"{schema_dir}/{version}/AXLAPI.wsdl"
+                kwargs = {"username": "bench", "password": "bench", "fqdn": "127.0.0.1", "wsdl": wsdl}
+
+                def timed(**extra):
+                    start_time = time.perf_counter()
+                    UCMAXLConnector(**kwargs, **extra)
+                    return time.perf_counter() - start_time
+
+                cold = min(timed(schema_cache=False) for _ in range(runs))
+                first = timed()                                 # parse and write the cache
+                warm = min(timed() for _ in range(runs))
+                print(f"{version:<10} {cold:>7.3f}s {first:>7.3f}s {warm:>7.3f}s  {cold / warm:.1f}x")
+        finally:
+            if previous_cache_dir is None:
+                del os.environ[SCHEMA_CACHE_ENV]
+            else:
+                os.environ[SCHEMA_CACHE_ENV] = previous_cache_dir
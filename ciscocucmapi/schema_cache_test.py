@@ -0,0 +1,85 @@
+"""Compiled WSDL cache: private cache directory and untrusted cache files"""
+
+import os
+import stat
+
+import pytest
+from zeep import Settings
+from zeep import Transport
+
+from ciscocucmapi import schema_cache
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:tns="http://example.com/echo" xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             targetNamespace="http://example.com/echo">
+  <types>
+    <xsd:schema targetNamespace="http://example.com/echo">
+      <xsd:element name="echo" type="xsd:string"/>
+    </xsd:schema>
+  </types>
+  <message name="echoMessage"><part name="body" element="tns:echo"/></message>
+  <portType name="EchoPort">
+    <operation name="echo"><input message="tns:echoMessage"/><output message="tns:echoMessage"/></operation>
+  </portType>
+  <binding name="EchoBinding" type="tns:EchoPort">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="echo">
+      <soap:operation soapAction="echo"/>
+      <input><soap:body use="literal"/></input><output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+</definitions>"""
+
+
+@pytest.fixture
+def wsdl(tmp_path):
+    path = tmp_path / "schema" / "echo.wsdl"
+    path.parent.mkdir()
+    path.write_text(WSDL)
+    return str(path)
+
+
+def load(wsdl, cache_dir):
+    return schema_cache.load_document(wsdl, Transport(), Settings(), cache_dir=cache_dir)
+
+
+def cache_files(cache_dir):
+    return [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+
+
+def test_cache_directory_is_private(wsdl, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    load(wsdl, cache_dir)
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+    assert [stat.S_IMODE(os.stat(path).st_mode) for path in cache_files(cache_dir)] == [0o600]
+
+
+def test_cached_document_is_loaded(wsdl, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    load(wsdl, cache_dir)
+    monkeypatch.setattr(schema_cache, "Document", None)     # a parse would fail
+    assert "{http://example.com/echo}EchoBinding" in load(wsdl, cache_dir).bindings
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="no file ownership")
+def test_writable_by_others_cache_file_is_not_unpickled(wsdl, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    load(wsdl, cache_dir)
+    path = cache_files(cache_dir)[0]
+    os.chmod(path, 0o666)
+    unpicklers = []
+    monkeypatch.setattr(schema_cache.SchemaUnpickler, "load", lambda self: unpicklers.append(self))
+
+    assert "{http://example.com/echo}EchoBinding" in load(wsdl, cache_dir).bindings
+    assert unpicklers == []
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600             # replaced by a fresh cache file
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="no file ownership")
+def test_writable_by_others_cache_directory_is_not_used(wsdl, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    os.chmod(cache_dir, 0o777)
+    load(wsdl, str(cache_dir))
+    assert cache_files(str(cache_dir)) == []
@@ -0,0 +1,170 @@
+"""vendorConfig xml <-> dict codec
+
+vendorConfig is an xml fragment (several top level elements, no root element) of any depth:
+
+    <disableSpeaker>false</disableSpeaker><sshAccess>0</sshAccess>
+    <lldpAssetId></lldpAssetId><webAdmin><adminPassword></adminPassword></webAdmin>
+
+Dicts follow the xmltodict conventions (also used for the SQL read of enterprise/common phone
+config) so the two can be mixed:
+
+- an element with children is a dict, a leaf is its stripped text or None when empty
+- repeated sibling elements are a list
+- attributes are '@name' keys and text next to children or attributes is '#text'
+- True/False are written as 'true'/'false'
+
+Fragments are parsed with one lxml parser per thread (comments and processing instructions
+dropped) and dicts are written straight to a string, so there is no xmltodict round trip or regex
+clean up of its output.  patch_xml() changes one path of a fragment in the lxml tree without
+converting the rest to a dict and back.
+
+Usage:
+    vc = xml_to_dict('<sshAccess>0</sshAccess><webAdmin><adminPassword/></webAdmin>')
+    xml = dict_to_xml(vc)
+    xml = patch_xml(xml, 'webAdmin/adminPassword', 'secret')
+"""
+
+import threading
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+
+# wraps the root-less fragment for parsing
+_OPEN_TAG = "<vendorConfig>"
+_CLOSE_TAG = "</vendorConfig>"
+
+_local = threading.local()
+
+
+def _parser():
+    """lxml parser for this thread (parsers must not be shared between threads)"""
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True,
+                                                 remove_comments=True, remove_pis=True)
+    return parser
+
+
+def parse_fragment(xml_string):
+    """Parse a vendorConfig fragment and return a <vendorConfig> element holding its elements"""
+    return etree.fromstring("".join([_OPEN_TAG, xml_string or "", _CLOSE_TAG]), _parser())
+
+
+def serialize_fragment(root):
+    """Return the elements of a <vendorConfig> element as a root-less xml string"""
+    if not len(root):
+        return root.text or ""
+    # one serialization of the wrapper, then drop its tags (<vendorConfig> has no attributes)
+    return etree.tostring(root, encoding="unicode")[len(_OPEN_TAG):-len(_CLOSE_TAG)]
+
+
+def _element_value(element):
+    """dict value of an element with children or attributes"""
+    value = {f"@{name}": attr for name, attr in element.items()}
+    _add_children(value, element)
+    text = element.text
+    if text and text.strip():
+        value["#text"] = text.strip()
+    return value
+
+
+def _add_children(value, element):
+    for child in element:
+        if len(child) or child.keys():
+            child_value = _element_value(child)
+        else:
+            # leaf (most of vendorConfig): stripped text, None when empty
+            text = child.text
+            child_value = (text.strip() or None) if text else None
+        tag = child.tag
+        if tag not in value:
+            value[tag] = child_value
+        elif isinstance(value[tag], list):
+            value[tag].append(child_value)
+        else:
+            value[tag] = [value[tag], child_value]
+
+
+def xml_to_dict(xml_string):
+    """vendorConfig xml fragment to dict (nested to any depth)"""
+    value = {}
+    _add_children(value, parse_fragment(xml_string))
+    return value
+
+
+def _text(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def _write(parts, tag, value):
+    """Append the xml of tag=value (a list gives repeated elements) to parts"""
+    for item in value if isinstance(value, list) else (value,):
+        if isinstance(item, dict):
+            attributes = "".join(f" {key[1:]}={quoteattr(_text(attr))}"
+                                 for key, attr in item.items() if key.startswith("@"))
+            parts.append(f"<{tag}{attributes}>")
+            if item.get("#text") is not None:
+                parts.append(escape(_text(item["#text"])))
+            for key, child_value in item.items():
+                if not key.startswith("@") and key != "#text":
+                    _write(parts, key, child_value)
+            parts.append(f"</{tag}>")
+        elif item is None:
+            parts.append(f"<{tag}></{tag}>")
+        else:
+            parts.append(f"<{tag}>{escape(_text(item))}</{tag}>")
+
+
+def dict_to_xml(vendor_config):
+    """vendorConfig dict to root-less xml fragment string (strings are returned unchanged)"""
+    if isinstance(vendor_config, str):
+        return vendor_config
+    parts = []
+    for tag, value in (vendor_config or {}).items():
+        _write(parts, tag, value)
+    return "".join(parts)
+
+
+def _set_value(element, value):
+    """Set an element's content from a dict/scalar value (replaces existing content)"""
+    for child in list(element):
+        element.remove(child)
+    element.text = None
+    if isinstance(value, dict):
+        for key, child_value in value.items():
+            if key.startswith("@"):
+                element.set(key[1:], _text(child_value))
+            elif key == "#text":
+                element.text = _text(child_value)
+            else:
+                for item in child_value if isinstance(child_value, list) else (child_value,):
+                    _set_value(etree.SubElement(element, key), item)
+    elif value is not None:
+        element.text = _text(value)
+
+
+def patch_element(root, path, value, delimiter="/"):
+    """Add or replace the element at path (ex: 'webAdmin/adminPassword') under root, creating
+    missing parents.  The first element with each tag is followed."""
+    element = root
+    for tag in path.split(delimiter):
+        child = element.find(tag)
+        element = child if child is not None else etree.SubElement(element, tag)
+    _set_value(element, value)
+    return root
+
+
+def patch_xml(xml_string, path, value, delimiter="/"):
+    """Return the vendorConfig fragment with the element at path set to value
+
+    :param xml_string: vendorConfig xml fragment
+    :param path: element path, delimiter separated for nested elements
+    :param value: scalar, None (empty element) or dict (replaces the element's children)
+    :param delimiter: path separator
+    """
+    return serialize_fragment(patch_element(parse_fragment(xml_string), path, value, delimiter))
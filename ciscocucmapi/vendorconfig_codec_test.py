@@ -0,0 +1,63 @@
+"""vendorConfig xml fragment <-> dict codec"""
+
+import xmltodict
+
+from ciscocucmapi.vendorconfig_codec import dict_to_xml
+from ciscocucmapi.vendorconfig_codec import patch_xml
+from ciscocucmapi.vendorconfig_codec import xml_to_dict
+
+FRAGMENT = ("<disableSpeaker>false</disableSpeaker><sshAccess>0</sshAccess><lldpAssetId></lldpAssetId>"
+            "<webAdmin><adminPassword></adminPassword><port>443</port></webAdmin>"
+            "<sideTone>1</sideTone><sideTone>2</sideTone>")
+
+
+def test_xml_to_dict_nests_repeats_and_empties():
+    assert xml_to_dict(FRAGMENT) == {
+        "disableSpeaker": "false",
+        "sshAccess": "0",
+        "lldpAssetId": None,
+        "webAdmin": {"adminPassword": None, "port": "443"},
+        "sideTone": ["1", "2"],
+    }
+
+
+def test_xml_to_dict_matches_xmltodict_conventions():
+    xml = ('<ciscoCamera enabled="true"><resolution> 720 </resolution></ciscoCamera>'
+           '<label lang="en">Lobby</label><notes/>')
+    expected = xmltodict.parse(f"<vendorConfig>{xml}</vendorConfig>", dict_constructor=dict)["vendorConfig"]
+    assert xml_to_dict(xml) == expected
+
+
+def test_xml_to_dict_empty_fragment():
+    assert xml_to_dict("") == {}
+    assert xml_to_dict(None) == {}
+
+
+def test_dict_to_xml_round_trip():
+    assert dict_to_xml(xml_to_dict(FRAGMENT)) == FRAGMENT
+
+
+def test_dict_to_xml_escapes_and_writes_booleans():
+    xml = dict_to_xml({"label": {"@lang": 'a"b', "#text": "R&D <lab>"}, "webAccess": True, "pcPort": False})
+    assert xml == '<label lang=\'a"b\'>R&amp;D &lt;lab&gt;</label><webAccess>true</webAccess><pcPort>false</pcPort>'
+    assert dict_to_xml("<sshAccess>0</sshAccess>") == "<sshAccess>0</sshAccess>"
+
+
+def test_xml_to_dict_drops_comments_and_processing_instructions():
+    xml = '<!-- note --><sshAccess>0</sshAccess><?pi x?>'
+    assert xml_to_dict(xml) == {"sshAccess": "0"}
+
+
+def test_patch_xml_replaces_nested_element_and_keeps_the_rest():
+    xml = patch_xml(FRAGMENT, "webAdmin/adminPassword", "secret")
+    assert xml_to_dict(xml)["webAdmin"] == {"adminPassword": "secret", "port": "443"}
+    assert xml.startswith("<disableSpeaker>false</disableSpeaker><sshAccess>0</sshAccess>")
+
+
+def test_patch_xml_creates_missing_parents_and_sets_dicts():
+    xml = patch_xml("<sshAccess>0</sshAccess>", "wifi.band", {"@mode": "auto", "width": 40}, delimiter=".")
+    assert xml_to_dict(xml) == {"sshAccess": "0", "wifi": {"band": {"@mode": "auto", "width": "40"}}}
+
+
+def test_patch_xml_empty_value():
+    assert xml_to_dict(patch_xml(FRAGMENT, "sshAccess", None))["sshAccess"] is None
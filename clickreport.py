@@ -34,6 +34,7 @@ DEFAULT_CONFIRM_EACH_ROW = config.DEFAULT_CONFIRM_EACH_ROW
 DEFAULT_IGNORE_VALUE = config.DEFAULT_IGNORE_VALUE
 DEFAULT_VALIDATE_ONLY = config.DEFAULT_VALIDATE_ONLY
 DEFAULT_AXL_VERSION = config.DEFAULT_AXL_VERSION
+DEFAULT_WORKERS = config.DEFAULT_WORKERS
 
 
 def load_env_file(ctx, param, filename='', input_dir=DEFAULT_IN_DIR):
@@ -231,10 +232,16 @@ def old_load_env_file(ctx, param, filename=''):
               default=DEFAULT_CONFIRM_EACH_ROW,
               show_default=True,
               )
+@click.option('-w', '--workers',
+              type=click.IntRange(min=1),
+              help='Number of reports to run at the same time',
+              default=DEFAULT_WORKERS,
+              show_default=True,
+              )
 @click.pass_context
 def cli(ctx: click.Context, in_file, log_dir, input_dir, output_dir,
         include, exclude, validate_only, parse_seed, testing,
-        ignore, confirm_each_row):            # master CLICK application
+        ignore, confirm_each_row, workers):            # master CLICK application
     """
     Entry point for CLI script.  ENV file has already been loaded and user
     has been prompted to confirm any input.
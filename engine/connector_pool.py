@@ -0,0 +1,125 @@
+"""
+Shared AXL connector pool
+
+Building a UCMAXLConnector parses the full AXL schema, opens a new requests.Session and probes
+authentication with getCCMVersion.  The pool builds one connector per (host, user, password,
+axl_version) and hands the same authenticated connector (and its keep-alive HTTPS session) to every
+report job on that cluster for the rest of the run.
+
+All connectors to the same host share one AXLScheduler so concurrent jobs are paced together
+against that cluster's AXL throttling.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from engine.report_config import ClickConfig
+
+
+class AXLConnectorPool(object):
+    """Pool of authenticated UCMAXLConnector objects keyed by (host, user, axl_version, password hash).
+
+    The password is part of the key (as a SHA-256 digest) so a job with a different or wrong
+    password gets its own connector and its own authentication probe.
+
+    Thread-safe.  When several jobs ask for the same cluster at the same time only the first
+    one builds the connector; the others wait for it and count as pool hits.
+    """
+
+    def __init__(self, schema_dir=ClickConfig.DEFAULT_AXL_SCHEMA_DIR):
+        self.schema_dir = schema_dir
+
+        self._connectors = {}       # pool key: (connector, ccm_version)
+        self._key_locks = {}        # pool key: lock held while that connector is built
+        self._schedulers = {}       # host: AXLScheduler shared by every connector to that cluster
+        self._lock = threading.Lock()
+
+        # counters for the whole run
+        self.hits = 0
+        self.misses = 0
+        self.build_time = 0.0
+
+    @staticmethod
+    def pool_key(host, user, pwd, axl_version):
+        pwd_hash = hashlib.sha256((pwd or '').encode('utf-8')).hexdigest()
+        return host.lower(), user, str(axl_version), pwd_hash
+
+    def get(self, host, user, pwd, axl_version, wsdl=None):
+        """Return a shared connector for the cluster, building it on first use.
+
+        A connector whose authentication probe fails is returned to the caller but is NOT
+        kept in the pool so the next job will try again.
+
+        :param host:        AXL host (fqdn or ip)
+        :param user:        AXL username
+        :param pwd:         AXL password (part of the pool key as a hash)
+        :param axl_version: AXL schema version directory (ex: '12.5', '14.0')
+        :param wsdl:        optional override of the WSDL location
+        :return:            tuple of (UCMAXLConnector, dict of pool status for the job)
+        """
+        key = self.pool_key(host, user, pwd, axl_version)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key in self._connectors:
+                connector, ccm_version = self._connectors[key]
+                with self._lock:
+                    self.hits += 1
+                return connector, self._job_status('hit', 0.0, ccm_version)
+
+            # imported here so the engine does not load zeep until an AXL report runs
+            from ciscocucmapi import UCMAXLConnector
+            from ciscocucmapi.scheduler import AXLScheduler
+
+            if not wsdl:
+                wsdl = f'{self.schema_dir}/{axl_version}/AXLAPI.wsdl'
+
+            with self._lock:
+                scheduler = self._schedulers.setdefault(key[0], AXLScheduler())
+
+            start_time = time.time()
+            connector = UCMAXLConnector(username=user, password=pwd, fqdn=host, wsdl=wsdl, scheduler=scheduler)
+            try:
+                ccm_version = connector.get_ccm_version()
+            except Exception as e:
+                logging.error(f'AXL authentication probe failed for {user}@{host}: {e}')
+                ccm_version = None
+            elapsed_time = time.time() - start_time
+
+            with self._lock:
+                self.misses += 1
+                self.build_time += elapsed_time
+
+            if ccm_version is not None:
+                self._connectors[key] = (connector, ccm_version)
+
+            return connector, self._job_status('miss', elapsed_time, ccm_version)
+
+    def _job_status(self, result, build_time, ccm_version):
+        return {'result': result,
+                'build_time': build_time,
+                'ccm_version': ccm_version,
+                'pool_hits': self.hits,
+                'pool_misses': self.misses,
+                }
+
+    def stats(self):
+        """Return dict of pool counters for the run"""
+        return {'connectors': len(self._connectors),
+                'hits': self.hits,
+                'misses': self.misses,
+                'build_time': self.build_time,
+                'schedulers': {host: scheduler.stats() for host, scheduler in self._schedulers.items()},
+                }
+
+    def clear(self):
+        """Drop all pooled connectors (closes their HTTPS sessions)"""
+        with self._lock:
+            for connector, _ in self._connectors.values():
+                connector.client.transport.session.close()
+            self._connectors.clear()
+            self._key_locks.clear()
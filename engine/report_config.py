@@ -57,6 +57,7 @@ class ClickConfig(object):
     DEFAULT_TEST_AUTH = True
     DEFAULT_CONFIRM_TO_START = True
     DEFAULT_CONFIRM_EACH_ROW = False
+    DEFAULT_WORKERS = 1                 # number of reports run at the same time (1 = sequential)
 
     DEFAULT_VALIDATE_ONLY = False
     DEFAULT_IGNORE_VALUE = '#'
@@ -27,14 +27,15 @@ from pprint import pprint
 import click
 import os
 import logging
+import threading
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
+from engine.connector_pool import AXLConnectorPool
 from engine.report_config import ClickConfig
+from engine.report_registry import ReportRegistry
 from lib_excel import ExcelManager
-from lib_vos import VOSBackupHistory, VOSBackupStatus, VOSCertListing
-from rep_license import ReportLicenseStatus, ReportLicenseUsage, ReportUnassignedDevices
-from lib_uc_cert import ReportUCCertSnapshot
-from rep_ucm_cdr import ReportUcmCdrMonthly
 
 
 class ReportEngine(object):
@@ -65,6 +66,10 @@ class ReportEngine(object):
         self.data = self.load_yaml(self.full_file_path)             # RAW Processed SEED File
 
         self.excel = ExcelManager()         # creates an openpyxl ExcelManager Object
+        self._excel_lock = threading.Lock()  # openpyxl is not thread-safe. All tab writes hold this lock
+        self.registry = ReportRegistry()    # engine name to report class.  Imports on first use
+        self.axl_pool = AXLConnectorPool()  # AXL connectors shared by all jobs on the same cluster
+        self.vos_pool = None                # VOS CLI sessions shared by all VOS jobs.  See get_vos_pool()
 
     def find_seed_file(self, filename='', input_dir=ClickConfig.DEFAULT_IN_DIR, suffix='yaml'):
 
@@ -182,6 +187,8 @@ class ReportEngine(object):
 
     # close and save
     def close_report(self):
+        if self.vos_pool is not None:
+            self.vos_pool.close_all()
         self.excel.close()
 
     def create_title_page(self, data):
@@ -207,6 +214,14 @@ class ReportEngine(object):
         click.secho('Creating Excel title page...', fg='yellow')
         self.excel.add_tab_with_formatted_data('TITLE', sample_data)
 
+    def get_vos_pool(self):
+        """VOSSessionPool shared by the run's VOS reports.  Built on first use so seed files without
+        VOS jobs never import lib_vos (netmiko)."""
+        if self.vos_pool is None:
+            from lib_vos import VOSSessionPool
+            self.vos_pool = VOSSessionPool()
+        return self.vos_pool
+
     def _init_runner(self):
         """Initialize report runner with command objects
 
@@ -260,56 +275,19 @@ class ReportEngine(object):
             #   How are we going to do that
 
             # INVOKE Report job by looking at request
-            # Launch appropriate method to instantiate report object
-            if engine in ['backup_history']:
-                rep = VOSBackupHistory(vars, metadata=metadata, excel=self.excel)
-                click.secho('BACKUP HISTORY using VOS CLI', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['backup_status']:
-                rep = VOSBackupStatus(vars, metadata=metadata, excel=self.excel)
-                click.secho('BACKUP STATUS using VOS CLI', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['VOS_CERT_LISTING']:
-                rep = VOSCertListing(vars, metadata=metadata, excel=self.excel)
-                click.secho('CERT LISTING using VOS CLI', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['UCM_LICENSE_STATUS']:
-                rep = ReportLicenseStatus(vars, metadata=metadata, excel=self.excel)
-                click.secho('UCM Smart License Status', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['UCM_LICENSE_USAGE']:
-                rep = ReportLicenseUsage(vars, metadata=metadata, excel=self.excel)
-                click.secho('UCM Smart License Usage', fg='magenta')
+            # Registry imports the engine's module the first time it is used
+            if self.registry.is_registered(engine):
+                report_class = self.registry.get(engine)
+                rep_kwargs = {'connector_pool': self.axl_pool}
+                if getattr(report_class, 'vos_sessions', False):
+                    rep_kwargs['vos_pool'] = self.get_vos_pool()
+                rep = report_class(vars, metadata=metadata, excel=self.excel, **rep_kwargs)
+                click.secho(self.registry.description(engine), fg='magenta')
                 click.secho(f'TAB NAME: {tab_name}', fg='magenta')
                 count += 1
-            elif engine in ['UCM_LICENSE_UNASSIGNED_DEVICES']:
-                rep = ReportUnassignedDevices(vars, metadata=metadata, excel=self.excel)
-                click.secho('UCM Licensing - Unassigned Devices', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['UC_CERT_API']:
-                rep = ReportUCCertSnapshot(vars, metadata=metadata, excel=self.excel)
-                click.secho('UCM CERT Snapshot', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['UCM_CDR_SELENIUM']:
-                rep = ReportUcmCdrMonthly(vars, metadata=metadata, excel=self.excel)
-                click.secho('UCM CDR Monthly Report (selenium)', fg='magenta')
-                click.secho(f'TAB NAME: {tab_name}', fg='magenta')
-                count += 1
-            elif engine in ['vos']:
-                pass
-                # response =  vos_report(vars, metadata=metadata, excel=self.excel)
-            elif engine in ['netmiko']:
-                pass
-                # response = netmiko(vars, metadata=metadata, excel=self.excel)
-            elif engine in ['cert_api']:
-                pass
-                # response = cert_api(vars, metadata=metadata, excel=self.excel)
+            elif engine in self.registry.PLANNED_ENGINES:
+                click.secho(f'REPORT NOT INITIALIZED. ENGINE "{engine}" NOT BUILT YET.', fg='red')
+                safe_to_add = False
             else:
                 # NOTE: For this runner the default case needs to be different
                 #   determine what we want to do here.  This code is currently from old method.
@@ -326,6 +304,10 @@ class ReportEngine(object):
         for r in report_runner:
             print(r.tab_name)
 
+        click.secho('Engine import times:', fg='magenta')
+        for engine_name, import_time in self.registry.import_times().items():
+            click.secho(f'  {engine_name:<32} {import_time:.3f} seconds', fg='magenta')
+
         # TODO: need a status that says how many items found in seed/report_jobs
         #   and how many were processed into jobs.
         #   IF they are not equal, then show an ERROR message to alert that the seed file
@@ -353,16 +335,85 @@ class ReportEngine(object):
         click.secho(f'TAB NAME: {tab_name}', fg='magenta')
 
         # run report and format data
-        status = report_command.run()
+        status = self._run_report(report_command)
         pprint(status)
 
         # TODO: Make writing of report contingent on status (once status has valid data)
         # write to the excel file and return status
-        status = report_command.write_excel_tab()
+        status = self._write_report(report_command)
         pprint(status)
 
         return status
 
+    def _run_report(self, report_command):
+        """Collect, parse and format a report command object.
+
+        Does NOT touch the excel workbook so it is safe to call from a worker thread.
+        Elapsed time of the job is stored in report_command.status['elapsed_time'].
+
+        :param report_command:  ReportTemplate command object
+        :return:                status returned by report_command.run()
+        """
+        start_time = time.time()
+        try:
+            return report_command.run()
+        finally:
+            report_command.status['elapsed_time'] = time.time() - start_time
+
+    def _write_report(self, report_command):
+        """Write a report command object's tab to the workbook.
+
+        All writes are serialized through self._excel_lock since openpyxl is not thread-safe.
+
+        :param report_command:  ReportTemplate command object that has already been run
+        :return:                status returned by report_command.write_excel_tab()
+        """
+        with self._excel_lock:
+            return report_command.write_excel_tab()
+
+    def _process_runner_concurrent(self, runner, workers=ClickConfig.DEFAULT_WORKERS):
+        """Process all report command objects in the runner using a bounded thread pool.
+
+        Collection, parsing and formatting of up to 'workers' reports run at the same time.
+        Tabs are written by the calling thread only, in runner (seed file) order, as each
+        report finishes.  A report that raises an exception is logged and its tab is skipped
+        so one bad job does not stop the rest of the run.
+
+        :param runner:      list of ReportTemplate command objects from _init_runner()
+        :param workers:     maximum number of reports running at the same time
+        :return:            summed elapsed time (seconds) of all individual reports
+        """
+        job_time = 0
+
+        click.secho(f'Running {len(runner)} reports with {workers} workers...', fg='yellow')
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report') as pool:
+            futures = [(rep_job, pool.submit(self._run_report, rep_job)) for rep_job in runner]
+
+            for rep_job, future in futures:
+                click.secho('*' * 80, fg='blue')
+                click.secho(f'Report tab: {rep_job.tab_name}', fg='yellow')
+                try:
+                    status = future.result()
+                except Exception as e:
+                    logging.error(f'Report [{rep_job.tab_name}] failed: {e}')
+                    rep_job.status['run_error'] = str(e)
+                    job_time += rep_job.status.get('elapsed_time', 0)
+                    continue
+
+                click.secho(f'Report returned: {status}', fg='yellow')
+                status = self._write_report(rep_job)
+                click.secho(f'Tab written: {status}', fg='yellow')
+                self.save_report()        # save but don't close
+
+                click.secho('Job status: ', fg='yellow')
+                pprint(rep_job.status)
+
+                elapsed_time = rep_job.status.get('elapsed_time', 0)
+                job_time += elapsed_time
+                click.secho(f"Elapsed Time:   {elapsed_time} seconds", fg='yellow')
+
+        return job_time
 
 def main():
     file_path = "seed.yaml"
@@ -62,9 +62,9 @@ def initialize_logging(log_directory='logs', time_uid=ClickConfig.TIME_UID):
     log_full_path = os.path.join(log_directory, log_filename)
 
     # define logging format
-    # add "[%(threadName)-10s]" if program contains threads
-    log_file_format = '[%(asctime)-15s][%(levelname)s][%(filename)s][%(funcName)s][%(lineno)s] %(message)s'
-    log_console_format = '[%(asctime)-15s][%(levelname)-8s][%(funcName)s] %(message)s'
+    # "[%(threadName)-10s]" is included because reports may run in worker threads (--workers)
+    log_file_format = '[%(asctime)-15s][%(threadName)-10s][%(levelname)s][%(filename)s][%(funcName)s][%(lineno)s] %(message)s'
+    log_console_format = '[%(asctime)-15s][%(threadName)-10s][%(levelname)-8s][%(funcName)s] %(message)s'
     logging.basicConfig(level=logging.DEBUG, format=log_file_format, filename=log_full_path)  # global logging settings
     console_log = logging.StreamHandler()  # create logging handler for console
     console_log.setFormatter(logging.Formatter(log_console_format))  # set format for console logging
@@ -95,6 +95,7 @@ class ClickMain(object):
 
         self.confirm_each_row = self.ctx.params.get('confirm_each_row', False)
         self.ignore = self.ctx.params.get('ignore', '#')
+        self.workers = self.ctx.params.get('workers', default_config.DEFAULT_WORKERS)
 
         # self.axl_version = self.ctx.params.get ('axl_version', default_config.DEFAULT_AXL_VERSION)
         # self.axl_wsdl_url = f"{default_config.DEFAULT_AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl"       # directory hardwired here
@@ -147,6 +148,7 @@ class ClickMain(object):
         click.echo(f'input_dir:      {self.input_dir}')
         click.echo(f'output_dir:     {self.output_dir}')
         click.echo(f'File UID:       {self.TIME_UID}')
+        click.echo(f'workers:        {self.workers}')
         click.echo('\n')
         click.echo(f'in_file:     {self.in_file}')
         click.echo(f'Customer:    {report.data["customer"]["customer_name"]}  ')
@@ -227,6 +229,7 @@ class ClickMain(object):
         click.secho('*' * 80, fg='bright_yellow')
 
         total_start_time = get_current_time()
+        job_time = 0            # summed elapsed time of individual reports
 
         # ###############################
         # Master FOR Loop
@@ -234,7 +237,15 @@ class ClickMain(object):
 
         # This is the main RUN Loop
         # Need to put in a conditional for when this runs
-        if True:
+        if self.workers > 1:
+            # OPTIONAL confirm_each_row functionality to skip reports
+            # asked up front since reports no longer run one at a time
+            if self.confirm_each_row:
+                runner = [rep_job for rep_job in runner
+                          if not click.confirm(f'Skip report {rep_job.tab_name}?')]
+
+            job_time = report._process_runner_concurrent(runner, workers=self.workers)
+        else:
             for rep_job in runner:
                 click.secho('*' * 80, fg='blue')
                 start_time = get_current_time()
@@ -259,6 +270,7 @@ class ClickMain(object):
 
                 end_time = get_current_time()
                 elapsed_time = end_time - start_time
+                job_time += elapsed_time
 
                 click.secho("\n\n")
                 click.secho('Individual report completed.', fg='yellow')
@@ -282,6 +294,10 @@ class ClickMain(object):
         click.secho("\n\n")
         logging.info('Script completed.')
         logging.info(f"Elapsed Time:   {elapsed_time} seconds")
+        logging.info(f"Summed Job Time: {job_time} seconds ({self.workers} workers)")
+        logging.info(f"AXL Pool:       {report.axl_pool.stats()}")
+        if report.vos_pool is not None:
+            logging.info(f"VOS Sessions:   {report.vos_pool.stats()}")
         logging.info(f'File UID:       {self.TIME_UID}')
         # logging.info('LOG file at:    ' + log_filename)
         logging.info(f'LOG file at:    {os.path.join(self.log_dir, log_filename)}')
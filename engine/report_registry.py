@@ -0,0 +1,125 @@
+"""
+Report engine registry
+
+Maps each 'engine' name used in the seed file to the ReportTemplate sub-class that runs it.
+The module holding a report class is only imported the first time a job uses that engine so a
+seed file that only runs a cert report never loads netmiko, zeep, etc.
+
+Reports outside this repo can register through the "ucreport.engines" entry point group:
+
+    [project.entry-points."ucreport.engines"]
+    MY_ENGINE = "my_package.my_module:MyReport"
+
+Entry points are also loaded lazily.  Built-in engines take precedence over entry points
+with the same name.
+"""
+
+import importlib
+import logging
+import time
+from importlib.metadata import entry_points
+
+
+ENTRY_POINT_GROUP = 'ucreport.engines'
+
+
+class ReportRegistry(object):
+    """Registry of report engines with lazy imports.
+
+    Each engine is stored as (module name, class name, description).  Use get() to
+    import the module (once) and return the ReportTemplate sub-class.
+    """
+
+    # engine name: (module, class, description shown when the job is initialized)
+    BUILTIN_ENGINES = {
+        'backup_history': ('lib_vos', 'VOSBackupHistory', 'BACKUP HISTORY using VOS CLI'),
+        'backup_status': ('lib_vos', 'VOSBackupStatus', 'BACKUP STATUS using VOS CLI'),
+        'VOS_CERT_LISTING': ('lib_vos', 'VOSCertListing', 'CERT LISTING using VOS CLI'),
+        'VOS_FANOUT': ('rep_vos_fanout', 'ReportVOSFanout', 'VOS CLI commands on every node of a cluster'),
+        'UCM_LICENSE_STATUS': ('rep_license', 'ReportLicenseStatus', 'UCM Smart License Status'),
+        'UCM_LICENSE_USAGE': ('rep_license', 'ReportLicenseUsage', 'UCM Smart License Usage'),
+        'UCM_LICENSE_UNASSIGNED_DEVICES': ('rep_license', 'ReportUnassignedDevices',
+                                           'UCM Licensing - Unassigned Devices'),
+        'UC_CERT_API': ('lib_uc_cert', 'ReportUCCertSnapshot', 'UCM CERT Snapshot'),
+        'UCM_CDR_MONTHLY': ('rep_ucm_cdr', 'ReportUcmCdrMonthly', 'UCM CDR Monthly Report (CDR flat files)'),
+        'UCM_CDR_SELENIUM': ('rep_ucm_cdr', 'ReportUcmCdrMonthly',
+                             'UCM CDR Monthly Report (alias of UCM_CDR_MONTHLY)'),
+        'UCM_RIS_REGISTRATION': ('rep_risport', 'ReportRegistrationStatus',
+                                 'UCM Device Registration Status (RisPort70)'),
+    }
+
+    # engine names reserved in the seed file format that do not have a report yet
+    PLANNED_ENGINES = ['vos', 'netmiko', 'cert_api']
+
+    def __init__(self, load_entry_points=True):
+        self._engines = {}          # engine: (module, class, description)
+        self._classes = {}          # engine: imported ReportTemplate sub-class
+        self._import_times = {}     # engine: seconds spent importing the engine's module
+
+        if load_entry_points:
+            self._discover_entry_points()
+
+        self._engines.update(self.BUILTIN_ENGINES)
+
+    def _discover_entry_points(self):
+        """Add engines registered under the ENTRY_POINT_GROUP entry point group.
+
+        Only the entry point metadata is read here.  The module is imported by get().
+        """
+        eps = entry_points()
+        if hasattr(eps, 'select'):      # python 3.10+
+            eps = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(ENTRY_POINT_GROUP, [])
+
+        for ep in eps:
+            self.register(ep.name, ep.module, ep.attr, description=f'{ep.name} (plugin {ep.value})')
+
+    def register(self, engine, module, class_name, description=''):
+        """Register (or replace) an engine without importing it.
+
+        :param engine:      engine name as used in the seed file metadata
+        :param module:      importable module name holding the report class
+        :param class_name:  name of the ReportTemplate sub-class in the module
+        :param description: text shown when a job using this engine is initialized
+        """
+        self._engines[engine] = (module, class_name, description or engine)
+        self._classes.pop(engine, None)
+
+    def is_registered(self, engine):
+        return engine in self._engines
+
+    def description(self, engine):
+        return self._engines[engine][2]
+
+    def engines(self):
+        """Return list of all registered engine names"""
+        return list(self._engines.keys())
+
+    def get(self, engine):
+        """Import (first use only) and return the report class for an engine.
+
+        :param engine:  engine name as used in the seed file metadata
+        :return:        ReportTemplate sub-class
+        :raises KeyError:   if the engine is not registered
+        """
+        if engine in self._classes:
+            return self._classes[engine]
+
+        module_name, class_name, _ = self._engines[engine]
+
+        start_time = time.time()
+        module = importlib.import_module(module_name)
+        self._import_times[engine] = time.time() - start_time
+        logging.debug(f'Engine [{engine}] imported {module_name} in {self._import_times[engine]:.3f} seconds')
+
+        self._classes[engine] = getattr(module, class_name)
+        return self._classes[engine]
+
+    def import_times(self):
+        """Return dict of engine: seconds spent importing it for engines used so far.
+
+        Engines that share a module only pay the import once.  The first engine to be
+        used carries the cost and the others show close to 0.
+        """
+        return dict(self._import_times)
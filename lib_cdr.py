@@ -0,0 +1,251 @@
+# Columnar CDR analytics
+#
+# CDR flat files are read in chunks of CDR_CHUNK_ROWS records.  Each chunk becomes a handful of
+# typed NumPy columns (times, duration, device name codes) that are folded into running
+# aggregates with bincount and discarded, so memory depends on the chunk size and the number of
+# devices, not on the number of CDRs in the month.
+#
+# Every aggregate is additive (per hour counts, per device counts and seconds, a 1 second
+# duration histogram), so chunks and files can be added in any order and percentiles are exact to
+# the second.  Device names are dictionary encoded: each chunk's names go through np.unique and only
+# the distinct names are looked up in the shared name -> code dict.
+#
+# NumPy is optional for the rest of the repo.  rep_ucm_cdr falls back to its pure Python daily
+# summary when it is not installed.
+import csv
+import itertools
+import logging
+from datetime import timedelta, timezone
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CDR_CHUNK_ROWS = 200000         # records parsed per chunk
+CDR_MAX_DURATION = 4 * 3600     # seconds, longer calls go in the last duration histogram bin
+CDR_PERCENTILES = (50, 90, 95, 99)
+
+# CDR flat file fields used and their column dtype ('name' columns are dictionary encoded)
+CDR_FIELDS = {
+    'cdrRecordType': 'int8',
+    'dateTimeOrigination': 'int64',
+    'dateTimeConnect': 'int64',
+    'duration': 'int64',
+    'origDeviceName': 'name',
+    'destDeviceName': 'name',
+}
+
+
+def iter_cdr_chunks(paths, chunk_rows=CDR_CHUNK_ROWS, fields=CDR_FIELDS):
+    """Yield dicts of typed column arrays, chunk_rows records at a time, from CDR flat files
+
+    The field name and field type rows at the top of each file are skipped, as are records with the
+    wrong number of fields and files without all of fields (not CDR flat files).  'name' columns are
+    returned as NumPy string arrays.
+
+    :param paths:   CDR flat file paths
+    :param chunk_rows:  maximum records per chunk
+    :param fields:  dict of field name: dtype
+    """
+    if np is None:
+        raise ImportError('CDR analytics requires numpy (pip install numpy)')
+
+    for path in paths:
+        with open(path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header:
+                continue
+            missing = [name for name in fields if name not in header]
+            if missing:
+                logging.warning(f'{path} skipped, not a CDR flat file (no {", ".join(missing)})')
+                continue
+            next(reader, None)      # field types
+            width = len(header)
+            getter = itemgetter(*[header.index(name) for name in fields])
+            records = (getter(row) for row in reader if len(row) == width)
+
+            while True:
+                rows = list(itertools.islice(records, chunk_rows))
+                if not rows:
+                    break
+                chunk = {}
+                for (name, dtype), values in zip(fields.items(), zip(*rows)):
+                    if dtype == 'name':
+                        chunk[name] = np.array(values)
+                    else:
+                        chunk[name] = _int_column(values, dtype)
+                yield chunk
+
+
+def _int_column(values, dtype):
+    """Integer column from CDR text fields (empty fields are 0)"""
+    try:
+        return np.array(values, dtype=dtype)
+    except ValueError:
+        return np.array([value or 0 for value in values], dtype=dtype)
+
+
+class CDRAggregator(object):
+    """Running traffic aggregates of one reporting period
+
+    :param start:   period start (datetime, UTC if naive).  With utc_offset it is the local start.
+    :param end:     period end
+    :param utc_offset:  hours added to CDR times (UTC) for days and busy hours (ex: -5)
+    :param max_duration:    seconds covered by the duration histogram
+    """
+
+    def __init__(self, start, end, utc_offset=0, max_duration=CDR_MAX_DURATION):
+        if np is None:
+            raise ImportError('CDR analytics requires numpy (pip install numpy)')
+        start, end = [t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t for t in (start, end)]
+        self.start = start
+        self.offset = int(utc_offset * 3600)
+        # CDR time + offset - origin = seconds into the period
+        self._origin = int(start.timestamp())
+        self.hours = int((end - start).total_seconds() // 3600)
+        self.max_duration = max_duration
+
+        self.calls_per_hour = np.zeros(self.hours, dtype=np.int64)
+        self.connected_per_hour = np.zeros(self.hours, dtype=np.int64)
+        self.seconds_per_hour = np.zeros(self.hours, dtype=np.int64)
+        self.duration_histogram = np.zeros(max_duration + 1, dtype=np.int64)
+
+        # per device code, originating and terminating side
+        self.device_codes = {}
+        self.orig_calls = np.zeros(0, dtype=np.int64)
+        self.orig_seconds = np.zeros(0, dtype=np.int64)
+        self.dest_calls = np.zeros(0, dtype=np.int64)
+        self.dest_seconds = np.zeros(0, dtype=np.int64)
+
+        # counters
+        self.records = 0
+        self.outside_period = 0
+
+    def _codes(self, names):
+        """Dictionary encode a string column with the shared device code dict"""
+        unique, inverse = np.unique(names, return_inverse=True)
+        codes = self.device_codes
+        lookup = np.fromiter((codes.setdefault(name, len(codes)) for name in unique.tolist()),
+                             dtype=np.int64, count=len(unique))
+        return lookup[inverse]
+
+    def _grow(self, size):
+        if size > len(self.orig_calls):
+            for name in ('orig_calls', 'orig_seconds', 'dest_calls', 'dest_seconds'):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros(size - len(array), dtype=np.int64)]))
+
+    def add(self, chunk):
+        """Fold one chunk (see iter_cdr_chunks) into the aggregates"""
+        cdrs = chunk['cdrRecordType'] == 1
+        hour = (chunk['dateTimeOrigination'] + self.offset - self._origin) // 3600
+        keep = cdrs & (hour >= 0) & (hour < self.hours)
+        self.records += int(np.count_nonzero(keep))
+        self.outside_period += int(np.count_nonzero(cdrs & ~keep))
+
+        hour = hour[keep]
+        duration = chunk['duration'][keep]
+        connected = chunk['dateTimeConnect'][keep] != 0
+
+        self.calls_per_hour += np.bincount(hour, minlength=self.hours)
+        self.connected_per_hour += np.bincount(hour[connected], minlength=self.hours)
+        self.seconds_per_hour += np.bincount(hour, weights=duration, minlength=self.hours).astype(np.int64)
+        self.duration_histogram += np.bincount(np.clip(duration[connected], 0, self.max_duration),
+                                               minlength=self.max_duration + 1)
+
+        orig = self._codes(chunk['origDeviceName'][keep])
+        dest = self._codes(chunk['destDeviceName'][keep])
+        size = len(self.device_codes)
+        self._grow(size)
+        self.orig_calls += np.bincount(orig, minlength=size)
+        self.orig_seconds += np.bincount(orig, weights=duration, minlength=size).astype(np.int64)
+        self.dest_calls += np.bincount(dest, minlength=size)
+        self.dest_seconds += np.bincount(dest, weights=duration, minlength=size).astype(np.int64)
+
+    def add_files(self, paths, chunk_rows=CDR_CHUNK_ROWS):
+        for chunk in iter_cdr_chunks(paths, chunk_rows):
+            self.add(chunk)
+        if self.outside_period:
+            logging.info(f'{self.outside_period} CDRs outside the report period ignored')
+        return self
+
+    def daily(self):
+        """Rows of [date, calls, connected calls, minutes, busy hour, busy hour calls] per day"""
+        days = self.hours // 24
+        calls = self.calls_per_hour[:days * 24].reshape(days, 24)
+        connected = self.connected_per_hour[:days * 24].reshape(days, 24).sum(axis=1)
+        minutes = self.seconds_per_hour[:days * 24].reshape(days, 24).sum(axis=1) / 60
+        busy_hour = calls.argmax(axis=1)
+        rows = []
+        for day in range(days):
+            date = (self.start + timedelta(days=day)).strftime('%Y-%m-%d')
+            rows.append([date, int(calls[day].sum()), int(connected[day]), round(float(minutes[day]), 1),
+                         f'{busy_hour[day]:02d}:00', int(calls[day, busy_hour[day]])])
+        return rows
+
+    def busy_hour(self):
+        """(datetime, calls) of the busiest hour of the period"""
+        if not self.hours:
+            return None, 0
+        hour = int(self.calls_per_hour.argmax())
+        return self.start + timedelta(hours=hour), int(self.calls_per_hour[hour])
+
+    def _names(self):
+        names = np.empty(len(self.device_codes), dtype=object)
+        for name, code in self.device_codes.items():
+            names[code] = name
+        return names
+
+    def device_volume(self):
+        """dict of device name: (calls, minutes), originating plus terminating"""
+        calls = self.orig_calls + self.dest_calls
+        seconds = self.orig_seconds + self.dest_seconds
+        return {name: (int(calls[code]), round(seconds[code] / 60, 1))
+                for code, name in enumerate(self._names()) if name}
+
+    def group_volume(self, groups, side='orig'):
+        """Calls and minutes per group of devices
+
+        :param groups:  dict of device name: group name (ex: device pool).  Other devices are not counted
+        :param side:    'orig' (calls made by the group's devices), 'dest' or 'both'
+        :return:    list of [group, calls, minutes] sorted by calls
+        """
+        calls = np.zeros(len(self.device_codes), dtype=np.int64)
+        seconds = np.zeros(len(self.device_codes), dtype=np.int64)
+        if side in ('orig', 'both'):
+            calls += self.orig_calls
+            seconds += self.orig_seconds
+        if side in ('dest', 'both'):
+            calls += self.dest_calls
+            seconds += self.dest_seconds
+
+        group_codes = {}
+        device_group = np.full(len(self.device_codes), -1, dtype=np.int64)
+        for name, code in self.device_codes.items():
+            group = groups.get(name)
+            if group is not None:
+                device_group[code] = group_codes.setdefault(group, len(group_codes))
+        member = device_group >= 0
+        group_calls = np.bincount(device_group[member], weights=calls[member], minlength=len(group_codes))
+        group_seconds = np.bincount(device_group[member], weights=seconds[member], minlength=len(group_codes))
+
+        rows = [[group, int(group_calls[code]), round(float(group_seconds[code]) / 60, 1)]
+                for group, code in group_codes.items()]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def duration_percentiles(self, percentiles=CDR_PERCENTILES):
+        """dict of percentile: connected call duration in seconds (exact to the second)"""
+        cumulative = np.cumsum(self.duration_histogram)
+        total = cumulative[-1] if len(cumulative) else 0
+        if not total:
+            return {percentile: None for percentile in percentiles}
+        return {percentile: int(np.searchsorted(cumulative, total * percentile / 100))
+                for percentile in percentiles}
+
+
+def aggregate_cdr_files(paths, start, end, utc_offset=0, chunk_rows=CDR_CHUNK_ROWS):
+    """CDRAggregator of the CDRs in paths for start..end"""
+    return CDRAggregator(start, end, utc_offset).add_files(paths, chunk_rows)
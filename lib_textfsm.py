@@ -0,0 +1,208 @@
+# Compiled TextFSM template registry
+#
+# textfsm.TextFSM() reads and compiles a template (value regexes, state rules) every time it is
+# built.  VOS cert parsing runs the same template over every cert of a node, often 150 or more
+# times.  TextFSMRegistry compiles each template once, keeps one clone per thread (TextFSM objects
+# hold parse state and are not thread safe) and Reset()s the clone before each parse.
+#
+# parse_many() parses a batch of outputs with one template.  Large batches can go to a process
+# pool where each worker compiles the template once.
+#
+# Usage:
+#     rows = TEMPLATES.parse('./textFSM/vos_show_cert_trust.textfsm', output)
+#     results = TEMPLATES.parse_many('./textFSM/vos_show_cert_trust.textfsm', outputs, processes=4)
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import textfsm
+
+TEMPLATE_DIR = './textFSM'
+PROCESS_POOL_MIN_OUTPUTS = 500      # smaller batches are parsed in process (pool start up costs more)
+PROCESS_POOL_CHUNKSIZE = 50         # outputs sent to a worker at a time
+
+
+def template_path(name, template_dir=TEMPLATE_DIR):
+    """Template name ('vos_show_cert_trust') or path to a template file path"""
+    if os.path.isfile(name):
+        return name
+    return os.path.join(template_dir, name if name.endswith('.textfsm') else f'{name}.textfsm')
+
+
+class TextFSMRegistry(object):
+    """Thread safe cache of compiled TextFSM templates
+
+    A template is compiled again when its file changes (mtime).
+
+    :param template_dir: directory of templates given by name
+    """
+
+    def __init__(self, template_dir=TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self._templates = {}            # path: (mtime, compiled TextFSM, header)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        # counters
+        self.compiles = 0
+        self.parses = 0
+
+    def _compiled(self, path):
+        """(mtime, compiled TextFSM, header) of a template, compiling it on first use"""
+        mtime = os.path.getmtime(path)
+        entry = self._templates.get(path)
+        if entry is None or entry[0] != mtime:
+            with self._lock:
+                entry = self._templates.get(path)
+                if entry is None or entry[0] != mtime:
+                    with open(path) as template_file:
+                        fsm = textfsm.TextFSM(template_file)
+                    entry = self._templates[path] = (mtime, fsm, fsm.header)
+                    self.compiles += 1
+        return entry
+
+    def get(self, name):
+        """This thread's parser for a template, reset and ready for ParseText()
+
+        :param name: template name in template_dir or template file path
+        :return: (TextFSM, header)
+        """
+        path = template_path(name, self.template_dir)
+        mtime, fsm, header = self._compiled(path)
+        clones = getattr(self._local, 'clones', None)
+        if clones is None:
+            clones = self._local.clones = {}
+        clone = clones.get(path)
+        if clone is None or clone[0] != mtime:
+            # parser state is copied from the compiled template, not compiled again
+            clone = clones[path] = (mtime, copy.deepcopy(fsm))
+        parser = clone[1]
+        parser.Reset()
+        return parser, header
+
+    def parse(self, name, output):
+        """Parse one command output
+
+        :return: list of dicts (template value name: value)
+        """
+        parser, header = self.get(name)
+        rows = parser.ParseText(output)
+        self.parses += 1
+        return [dict(zip(header, row)) for row in rows]
+
+    def parse_many(self, name, outputs, processes=0, chunksize=PROCESS_POOL_CHUNKSIZE):
+        """Parse a batch of outputs with one template
+
+        :param name: template name or path
+        :param outputs: command outputs
+        :param processes: worker processes (0 to parse in this process).  Batches smaller than
+                          PROCESS_POOL_MIN_OUTPUTS are always parsed in this process.
+        :return: list of parse() results in outputs order
+        """
+        outputs = list(outputs)
+        if processes and len(outputs) >= PROCESS_POOL_MIN_OUTPUTS:
+            path = os.path.abspath(template_path(name, self.template_dir))
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_parse_in_worker, [path] * len(outputs), outputs, chunksize=chunksize))
+            self.parses += len(outputs)
+            return results
+        return [self.parse(name, output) for output in outputs]
+
+    def stats(self):
+        """Return dict of registry counters"""
+        return {'templates': len(self._templates),
+                'compiles': self.compiles,
+                'parses': self.parses,
+                }
+
+
+# registry shared by all reports in the process (and by each process pool worker)
+TEMPLATES = TextFSMRegistry()
+
+
+def _parse_in_worker(path, output):
+    return TEMPLATES.parse(path, output)
+
+
+# Benchmark
+#
+# Synthetic recording of a node's 'show cert trust <cert>' outputs, same layout as VOS prints them
+
+def recorded_cert_outputs(certs=160):
+    """List of 'show cert trust' outputs, one per cert"""
+    outputs = []
+    for n in range(certs):
+        cn = f'CN=node{n:03d}.example.com, OU=Voice, O=Example, L=RTP, ST=NC, C=US'
+        extensions = '\n'.join(f"""  [
+     Extension: ExtKeyUsageSyntax (OID.2.5.29.{37 + e})
+     Critical: false
+     Usage oids: 1.3.6.1.5.5.7.3.1, 1.3.6.1.5.5.7.3.2, 1.3.6.1.5.5.7.3.5,
+  ]""" for e in range(4))
+        outputs.append(f"""
+[
+  Version: V3
+  Serial Number: {n:032X}
+  SignatureAlgorithm: SHA256withRSA (1.2.840.113549.1.1.11)
+  Issuer Name: {cn}
+  Validity From: Tue Jan 10 12:00:00 EST 2023
+           To:   Sun Jan 09 12:00:00 EST 2028
+  Subject Name: {cn}
+  Key: RSA (1.2.840.113549.1.1.1)
+    Key value:
+{'3082010a0282010100' + 'c3' * 256}
+  Extensions: 4 present
+{extensions}
+]
+""")
+    return outputs
+
+
+def _legacy_parse(output, path):
+    """parse_output_with_textfsm before the registry: open and compile per call"""
+    with open(path) as template_file:
+        fsm = textfsm.TextFSM(template_file)
+        return [dict(zip(fsm.header, row)) for row in fsm.ParseText(output)]
+
+
+def bench_template_registry(certs=160, runs=5, processes=None, name='vos_show_cert_trust'):
+    """Parse one node's cert outputs: compile per call vs registry vs registry + process pool"""
+    processes = processes or min(4, os.cpu_count() or 1)
+    outputs = recorded_cert_outputs(certs)
+    path = template_path(name)
+    registry = TextFSMRegistry()
+
+    def measure(func):
+        best = None
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    legacy = measure(lambda: [_legacy_parse(output, path) for output in outputs])
+    cached = measure(lambda: registry.parse_many(name, outputs))
+    assert registry.parse_many(name, outputs) == [_legacy_parse(output, path) for output in outputs]
+
+    big_batch = outputs * 25
+    in_process = measure(lambda: registry.parse_many(name, big_batch))
+    pooled = measure(lambda: registry.parse_many(name, big_batch, processes=processes))
+
+    print(f'{certs} certs, best of {runs}')
+    print(f'  compile per call:   {legacy * 1000:8.1f} ms')
+    print(f'  registry:           {cached * 1000:8.1f} ms  ({legacy / cached:.1f}x)')
+    print(f'{len(big_batch)} outputs')
+    print(f'  registry:           {in_process * 1000:8.1f} ms')
+    print(f'  {processes} processes:        {pooled * 1000:8.1f} ms  ({in_process / pooled:.1f}x)')
+    return {'legacy': legacy, 'registry': cached, 'batch': in_process, 'batch_processes': pooled}
+
+
+def main():
+    bench_template_registry()
+
+
+# Testing routine
+if __name__ == "__main__":
+     main()
@@ -0,0 +1,80 @@
+# TextFSMRegistry: compile once, per thread parsers, recompile on template change
+import os
+import threading
+
+from lib_textfsm import TextFSMRegistry
+from lib_textfsm import _legacy_parse
+from lib_textfsm import recorded_cert_outputs
+from lib_textfsm import template_path
+
+TEMPLATE = """Value NAME (\\S+)
+Value STATUS (\\S+)
+
+Start
+  ^${NAME}\\s+${STATUS} -> Record
+"""
+
+
+def write_template(tmp_path, name='device_status', template=TEMPLATE):
+    path = tmp_path / f'{name}.textfsm'
+    path.write_text(template)
+    return str(path)
+
+
+def test_template_path_by_name_or_file(tmp_path):
+    path = write_template(tmp_path)
+    assert template_path('device_status', str(tmp_path)) == path
+    assert template_path('device_status.textfsm', str(tmp_path)) == path
+    assert template_path(path, 'unused') == path
+
+
+def test_parse_compiles_once_and_resets_state(tmp_path):
+    write_template(tmp_path)
+    registry = TextFSMRegistry(str(tmp_path))
+    assert registry.parse('device_status', 'SEP001 Registered\n') == [{'NAME': 'SEP001', 'STATUS': 'Registered'}]
+    # a second parse does not return the first parse's rows
+    assert registry.parse('device_status', 'SEP002 Unregistered\n') == [{'NAME': 'SEP002', 'STATUS': 'Unregistered'}]
+    assert registry.stats() == {'templates': 1, 'compiles': 1, 'parses': 2}
+
+
+def test_changed_template_is_compiled_again(tmp_path):
+    path = write_template(tmp_path)
+    registry = TextFSMRegistry(str(tmp_path))
+    registry.parse('device_status', 'SEP001 Registered\n')
+
+    write_template(tmp_path, template=TEMPLATE.replace('STATUS', 'STATE'))
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+
+    assert registry.parse('device_status', 'SEP001 Registered\n') == [{'NAME': 'SEP001', 'STATE': 'Registered'}]
+    assert registry.compiles == 2
+
+
+def test_threads_get_their_own_parser(tmp_path):
+    write_template(tmp_path)
+    registry = TextFSMRegistry(str(tmp_path))
+    parsers = {}
+    errors = []
+
+    def parse(n):
+        parsers[n] = registry.get('device_status')[0]
+        output = ''.join(f'SEP{n}{i:03d} Registered\n' for i in range(200))
+        if len(registry.parse('device_status', output)) != 200:
+            errors.append(n)
+
+    threads = [threading.Thread(target=parse, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len({id(parser) for parser in parsers.values()}) == 4
+    assert registry.compiles == 1
+
+
+def test_parse_many_matches_compile_per_call():
+    registry = TextFSMRegistry()
+    outputs = recorded_cert_outputs(5)
+    path = template_path('vos_show_cert_trust')
+    assert registry.parse_many('vos_show_cert_trust', outputs) == [_legacy_parse(output, path) for output in outputs]
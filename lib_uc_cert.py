@@ -505,7 +505,7 @@ def merge_snapshot_output(new_data, existing_data={}):
 
 # Report Class - first test with VOS backup
 class ReportUCCertSnapshot(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None):           # TODO: do we change this to **kwargs
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.os_type = 'UC_CERT_API'
 
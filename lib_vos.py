@@ -6,20 +6,35 @@
 import os
 os.environ["NETMIKO_LINUX_PROMPT_PRI"] = ":"
 
+from netmiko.exceptions import ReadTimeout
 from netmiko.linux.linux_ssh import LinuxSSH
 from netmiko.ssh_dispatcher import CLASS_MAPPER
+from netmiko.ssh_dispatcher import platforms as NETMIKO_PLATFORMS
 from netmiko import ConnectHandler
-import textfsm
+import hashlib
+import queue
+import re
+import select
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from pprint import pprint
 import click
 
 from rep_base import ReportTemplate
+from lib_textfsm import TEMPLATES
 from lib_excel import CellFormatFixed, CellFormatBody, CellFormatHeader, CellFormatTitle
 
 
 DEFAULT_PROMPT = 'admin:'
+VOS_PROMPT_PATTERN = re.compile(r'admin:\s*$')     # output ends with the CLI prompt
+VOS_PROMPT_TIMEOUT = 90     # seconds from SSH login to the first prompt (CLI start is 20 to 40)
+VOS_READ_WAIT = 0.5         # longest single wait on the channel
+VOS_DRAIN_TIMEOUT = 30      # seconds to read a timed out command's late output up to the prompt
+VOS_DEVICE_TYPE = 'cisco_vos'
+VOS_CERT_CHANNELS = 4       # CLI sessions per node running 'show cert own|trust <cert>' in parallel
+VOS_QUEUE_POLL = 0.2        # seconds an idle cert session waits for commands put back by a dropped one
 LINUX_PROMPT_PRI = ':'
 LINUX_PROMPT_ALT = '#'
 
@@ -52,20 +67,14 @@ def parse_output_with_textfsm(command_output, template_path):
     Returns:
         list: A list of dictionaries containing the parsed data.
     """
-    with open(template_path) as template_file:
-        fsm = textfsm.TextFSM(template_file)
-        parsed_output = fsm.ParseText(command_output)
-        
-        # Create a list of dictionaries
-        result = []
-        for row in parsed_output:
-            result.append(dict(zip(fsm.header, row)))
-            
-        return result
+    # template is compiled once per process (lib_textfsm.TEMPLATES)
+    return TEMPLATES.parse(template_path, command_output)
 
 # Report Class - first test with VOS backup
 class VOSBackupHistory(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None):           # TODO: do we change this to **kwargs
+    vos_sessions = True     # engine passes its VOSSessionPool as vos_pool
+
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.ip = vars.get('ip', '')
         self.host = vars.get('host', '')
@@ -87,6 +96,12 @@ class VOSBackupHistory(ReportTemplate):
         self.data_formatted = None
         self.status = {}
 
+        # VOS CLI sessions shared by all VOS jobs of the run (private pool if run standalone)
+        self.vos_pool = kwargs.get('vos_pool')
+        self._private_pool = self.vos_pool is None
+        if self._private_pool:
+            self.vos_pool = VOSSessionPool()
+
     def run(self):
         # connect and collect data
         status = self._collect_data()
@@ -102,8 +117,8 @@ class VOSBackupHistory(ReportTemplate):
         """
         LOCAL_DEBUG = True
 
-        c = NetmikoVOS(self.ip, self.user, self.pwd)
-        c.connect()
+        c, pool_status = self.vos_pool.get(self.ip, self.user, self.pwd)
+        self.status['vos_pool'] = pool_status
 
         # testing code to determine if connection succeeded
         # this would be used by STATUS reporting 
@@ -115,8 +130,9 @@ class VOSBackupHistory(ReportTemplate):
                 click.secho(f'ERROR: No connection made by netmiko', fg='red')
                 click.secho(f'ERROR: c.connection is None', fg='red')
 
-        self.data_collected = c.connection.send_command(self.command, expect_string=DEFAULT_PROMPT)
-        c.disconnect()
+        self.data_collected = c.send_command(self.command, expect_string=DEFAULT_PROMPT)
+        if self._private_pool:
+            self.vos_pool.close_all()
 
         if LOCAL_DEBUG:
             print(self.data_collected)
@@ -186,7 +202,9 @@ class VOSBackupHistory(ReportTemplate):
 
 # Report Class - first test with VOS backup
 class VOSBackupStatus(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None):           # TODO: do we change this to **kwargs
+    vos_sessions = True     # engine passes its VOSSessionPool as vos_pool
+
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.ip = vars.get('ip', '')
         self.host = vars.get('host', '')
@@ -208,6 +226,12 @@ class VOSBackupStatus(ReportTemplate):
         self.data_formatted = None
         self.status = {}
 
+        # VOS CLI sessions shared by all VOS jobs of the run (private pool if run standalone)
+        self.vos_pool = kwargs.get('vos_pool')
+        self._private_pool = self.vos_pool is None
+        if self._private_pool:
+            self.vos_pool = VOSSessionPool()
+
     def run(self):
         # connect and collect data
         status = self._collect_data()
@@ -227,8 +251,8 @@ class VOSBackupStatus(ReportTemplate):
             print(f'user: {self.user}')
             print(f'pwd:  {self.pwd}')
 
-        c = NetmikoVOS(self.ip, self.user, self.pwd)
-        c.connect()
+        c, pool_status = self.vos_pool.get(self.ip, self.user, self.pwd)
+        self.status['vos_pool'] = pool_status
 
         # testing code to determine if connection succeeded
         # this would be used by STATUS reporting 
@@ -240,8 +264,9 @@ class VOSBackupStatus(ReportTemplate):
                 click.secho(f'ERROR: No connection made by netmiko', fg='red')
                 click.secho(f'ERROR: c.connection is None', fg='red')
                 
-        self.data_collected = c.connection.send_command(self.command, expect_string=DEFAULT_PROMPT)
-        c.disconnect()
+        self.data_collected = c.send_command(self.command, expect_string=DEFAULT_PROMPT)
+        if self._private_pool:
+            self.vos_pool.close_all()
 
         if LOCAL_DEBUG:
             print(self.data_collected)
@@ -315,7 +340,9 @@ class VOSBackupStatus(ReportTemplate):
 # NOTE: This report was being made for Pre-UC14 systems.  UCC12 is all that is left
 # this report is low priority becasue CCX15 is coming out this spring
 class VOSCertListing(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None):           # TODO: do we change this to **kwargs
+    vos_sessions = True     # engine passes its VOSSessionPool as vos_pool
+
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.ip = vars.get('ip', '')
         self.host = vars.get('host', '')
@@ -337,6 +364,17 @@ class VOSCertListing(ReportTemplate):
         self.data_formatted = None
         self.status = {}
 
+        # VOS CLI sessions shared by all VOS jobs of the run (private pool if run standalone)
+        self.vos_pool = kwargs.get('vos_pool')
+        self._private_pool = self.vos_pool is None
+        if self._private_pool:
+            self.vos_pool = VOSSessionPool()
+
+        # CLI sessions per node for the per cert commands (1: everything on the pooled session)
+        self.cert_channels = max(1, int(vars.get('cert_channels', VOS_CERT_CHANNELS)))
+        # worker processes for TextFSM parsing of very large recorded cert stores (0: parse in process)
+        self.parse_processes = int(vars.get('parse_processes', 0))
+
 
     def run(self):
         # connect and collect data
@@ -355,18 +393,21 @@ class VOSCertListing(ReportTemplate):
 
         Purpose of this method is to "collect" but do minimal processing.
 
-        :return:        DICT of all output.  KEYS are typically the cert/service name and VALUES are the raw
-                            output received from commands.
+        The cert lists come from the pooled session.  The per cert 'show cert own|trust <cert>'
+        commands are spread over cert_channels CLI sessions to the node (the pooled one plus extra
+        sessions logged in in parallel) and each response is parsed as soon as it is read, so only
+        the parsed rows are kept.
+
+        :return:        status string.  self.data_collected is a DICT of all output.  KEYS are typically
+                            the cert/service name and VALUES are the parsed rows of the cert.
         """
         output = {}
-        c = NetmikoVOS(self.ip, self.user, self.pwd)
-        c.connect()
+        c, pool_status = self.vos_pool.get(self.ip, self.user, self.pwd)
+        self.status['vos_pool'] = pool_status
         # Get lists of certificates and services (show cert list own|trust)
-        own_output = c.connection.send_command("show cert list own", expect_string=DEFAULT_PROMPT)
+        own_output = c.send_command("show cert list own", expect_string=DEFAULT_PROMPT)
         output['own_output'] = own_output
-        print(own_output)
-        trust_output = c.connection.send_command("show cert list trust", expect_string=DEFAULT_PROMPT)
-        print(trust_output)
+        trust_output = c.send_command("show cert list trust", expect_string=DEFAULT_PROMPT)
         output['trust_output'] = trust_output
 
         # Split OWN output into a LIST and then parse them for output
@@ -380,7 +421,6 @@ class VOSCertListing(ReportTemplate):
                 continue
             own_list.append(parts[0])
         output['own_list'] = own_list   # add the parsed list to output so we don't have to do it again
-        pprint(own_list)
 
         # Split TRUST List out then parse them for output
         # trust_output should split first for lines (\n) and then by ":"
@@ -393,24 +433,105 @@ class VOSCertListing(ReportTemplate):
                 continue
             trust_list.append(parts[0])
         output['trust_list'] = trust_list   # add the parsed list to output so we don't have to do it again
-        pprint(trust_list)
-
-        # Collect OWN PEM files by parsing through own_list
-        for cert in own_list:
-            own_output = c.connection.send_command(f"show cert own {cert}", expect_string=DEFAULT_PROMPT)
-            output[cert] = own_output
-            pprint(own_output)
-        
-        # collect trust certs (decoded...no PEM) by parsing through trust_list
-        for cert in trust_list:
-            trust_output = c.connection.send_command(f"show cert trust {cert}", expect_string=DEFAULT_PROMPT)
-            output[cert] = trust_output
-            pprint(trust_output)
-    
-        c.disconnect()
-
-        # Return ALL raw data
-        return output
+        click.secho(f'{len(own_list)} own and {len(trust_list)} trust certificates on {self.ip}', fg='yellow')
+
+        # Collect OWN and TRUST certs (decoded...no PEM) over several CLI sessions
+        # TODO: own certs use the trust template until PEM extraction is added (see _parse_data)
+        jobs = [(cert, f"show cert own {cert}", 'vos_show_cert_trust') for cert in own_list]
+        jobs += [(cert, f"show cert trust {cert}", 'vos_show_cert_trust') for cert in trust_list]
+        output.update(self._collect_certs(c, jobs))
+
+        if self._private_pool:
+            self.vos_pool.close_all()
+
+        self.data_collected = output
+        self.status['data_collect'] = 'success' if not self.status['cert_errors'] else \
+            f"{len(self.status['cert_errors'])} of {len(jobs)} certificates failed"
+        return self.status['data_collect']
+
+    def _collect_certs(self, session, jobs):
+        """Run cert commands over cert_channels CLI sessions and parse each response as it arrives
+
+        Every session works through the shared job queue one command at a time and stays until
+        every command is parsed or failed.  A session that drops puts its command back for the
+        other sessions.  A command that fails or times out on a live session is listed in
+        status['cert_errors'] and its late output is read up to the prompt (resync) before the
+        session's next command; a session that does not get back to the prompt is retired (the
+        pooled one is discarded from the pool).  Commands left when every session is gone are
+        listed in status['cert_errors'] too.
+
+        :param session: pooled session (stays open for the other jobs of the run)
+        :param jobs:    list of (cert, command, template)
+        :return:    DICT of cert: parsed rows
+        """
+        start_time = time.time()
+        extra_sessions = open_vos_sessions(self.ip, self.user, self.pwd, min(self.cert_channels, len(jobs)) - 1,
+                                           session_class=self.vos_pool.session_class)
+        sessions = [session] + extra_sessions
+
+        work = queue.Queue()
+        for job in jobs:
+            work.put(job)
+        parsed = {}
+        errors = {}
+        commands_run = [0] * len(sessions)
+        pending = [len(jobs)]       # commands not parsed or failed yet
+        pending_lock = threading.Lock()
+
+        def finish():
+            with pending_lock:
+                pending[0] -= 1
+
+        def run_session(index):
+            lane = sessions[index]
+            while True:
+                try:
+                    job = work.get(timeout=VOS_QUEUE_POLL)
+                except queue.Empty:
+                    # a dropped session may still put its command back
+                    with pending_lock:
+                        if pending[0] <= 0:
+                            return
+                    continue
+                cert, command, template = job
+                try:
+                    response = lane.send_command(command, expect_string=DEFAULT_PROMPT)
+                except Exception as e:
+                    if not lane.is_alive():
+                        logging.warning(f'VOS cert session {index} to {self.ip} dropped: {e}')
+                        work.put(job)
+                        return
+                    errors[cert] = str(e)
+                    finish()
+                    if not lane.resync():
+                        logging.warning(f'VOS cert session {index} to {self.ip} retired after: {e}')
+                        if index == 0:
+                            self.vos_pool.discard(self.ip, self.user, self.pwd, lane)
+                        return
+                    continue
+                parsed[cert] = TEMPLATES.parse(template, response)
+                commands_run[index] += 1
+                finish()
+
+        with ThreadPoolExecutor(max_workers=len(sessions), thread_name_prefix='vos_certs') as pool:
+            list(pool.map(run_session, range(len(sessions))))
+
+        while not work.empty():
+            cert, command, template = work.get_nowait()
+            errors[cert] = 'no VOS CLI session left'
+
+        for extra in extra_sessions:
+            try:
+                extra.disconnect()
+            except Exception as e:
+                logging.debug(f'VOS disconnect failed: {e}')
+
+        self.status['cert_channels'] = {'sessions': len(sessions),
+                                        'commands': commands_run,
+                                        'seconds': round(time.time() - start_time, 3),
+                                        }
+        self.status['cert_errors'] = errors
+        return parsed
 
     def _parse_data(self, raw_output=None):
         """ Takes a DICTIONARY of outputs and parses through them
@@ -453,30 +574,23 @@ class VOSCertListing(ReportTemplate):
             print(f'TRUST CERTS:')
             pprint(trust_list)
         
-        # Process all trust certs through textFSM
-        for tcert in trust_list:
-            click.secho(f'Parsing certificate {tcert}...', fg='yellow')
-            output = raw_output[tcert]
-            command = 'vos_show_cert_trust'
-            template_path = f'./textFSM/{command}.textfsm'
-            parsed_data = parse_output_with_textfsm(output, template_path)
-            if LOCAL_DEBUG:
-                print(f"Parsed data for '{command}':\n{parsed_data}\n")
-            new_dict[tcert] = parsed_data
-
-        # Process all own certs through textFSM
-        for own_cert in own_list:
-            click.secho(f'Parsing certificate {tcert}...', fg='yellow')
-            output = raw_output[own_cert]
-            command = 'vos_show_cert_trust'       # MAY NEED TO CHANGE THIS
-            template_path = f'./textFSM/{command}.textfsm'
-            parsed_data = parse_output_with_textfsm(output, template_path)
-
-            # TODO: Either add on PEM extration OR run data through twice to get PEM
-
-            if LOCAL_DEBUG:
-                print(f"Parsed data for '{command}':\n{parsed_data}\n")
-            new_dict[own_cert] = parsed_data
+        # _collect_data parses every cert as it is read.  Raw text outputs (ex: a recorded node
+        # passed as raw_output) are parsed here in one batch per template: compiled once, parsed in
+        # worker processes for very large cert stores
+        # TODO: Either add on PEM extration OR run own certs through twice to get PEM
+        command = 'vos_show_cert_trust'       # MAY NEED TO CHANGE THIS for own certs
+        for cert_type, cert_list in (('trust', trust_list), ('own', own_list)):
+            raw_certs = {cert for cert in cert_list if isinstance(raw_output.get(cert), str)}
+            if raw_certs:
+                click.secho(f'Parsing {len(raw_certs)} {cert_type} certificates...', fg='yellow')
+                raw_certs = [cert for cert in cert_list if cert in raw_certs]
+                parsed_data = TEMPLATES.parse_many(command, [raw_output[cert] for cert in raw_certs],
+                                                   processes=self.parse_processes)
+                new_dict.update(zip(raw_certs, parsed_data))
+                if LOCAL_DEBUG:
+                    print(f"Parsed data for '{command}':\n{parsed_data}\n")
+            new_dict.update((cert, raw_output[cert]) for cert in cert_list
+                            if cert not in raw_certs and cert in raw_output)
         
         # NOTE: at this point I have data that I can work with but not all in a good foramt
         #   date stamps could be converted to UTC for easier working with them
@@ -526,181 +640,320 @@ class VOSCertListing(ReportTemplate):
 class NetmikoVOS(object):
     # this is not a NetMiko sub-class.  It is a helper class
     # for establishing a netmiko connection to VOS
-    # as a generic device type
-    # just helping with handling the prompts
+    # with the 'cisco_vos' driver (CustomVOSSSH) registered below
     #
     # use .connect() to perform the connection/login/and wait for first prompt
-    # then use x.connection.send_command() to send our commands
+    # then use x.send_command() to send our commands
     # .disconnect() when done.
 
-    def __init__(self, ip, username, password):
+    def __init__(self, ip, username, password, prompt_timeout=None):
         self.connection = None
+        self.lock = threading.RLock()       # serializes commands of jobs sharing the session
+        self.login_time = 0.0               # seconds from connect() to a usable CLI
+        self.time_to_prompt = None          # seconds from SSH login to the first admin: prompt
         # Define the device configuration
         self.device = {
-            "device_type": "generic",  # Matches the registered custom class
-            #"device_type": "cisco_vos",
+            "device_type": VOS_DEVICE_TYPE,
             "host": ip,
             "username": username,
             "password": password,
-            #"global_delay_factor": 10,
-            #"timeout": 30
+            "prompt_timeout": prompt_timeout or VOS_PROMPT_TIMEOUT,
         }
 
     def connect(self):
         # Establish Connection
+        # CustomVOSSSH returns once the admin: prompt is up and pagination is off
+        start_time = time.time()
         try:
-            self.connection = ConnectHandler(**self.device)  # This now uses CustomVOSSSH
-            print("Connection Successful!")
-            self.connection.base_prompt = "admin:"  # Adjust the base prompt
-            print(f'entered base_prompt: {self.connection.base_prompt}')
-            #connection.set_base_prompt()  # Force Netmiko to use this
-            #print('set base prompt')
-            #time.sleep(30)
-
-            # what find_prompt does is send a newline and then return whatever the prompt is
-            # this should work great AFTER we have a prompt working but not before.
-            found_prompt = self.connection.find_prompt()
-            
-            wait = 0        # closer to TRIES as currently written
-            timeout = 5
-
-            # check for 'timeout' seconds to find the appropriate prompt.
-            # TODO : redo this logic to something cleaner.
-            while (found_prompt != self.connection.base_prompt) and (wait <= timeout):
-                time.sleep(1)
-                wait +=1
-                print(wait)
-                found_prompt = self.connection.find_prompt()     # NOTE: this takes time so this isn't just a WAIT multiplier - redo
-                
-            if wait >= timeout:
-                print('TIMEOUT')
-
-            print("Detected Prompt:", self.connection.find_prompt())
-
-            # now lets try some commands that should respond fairly quickly without errors
-            #
-            # NOTE: I have NOT entered any conditions for other types of prompts yet so ANYTHING
-            # will cause these to fail
-
-            # immediately shut off pagination
-            # removes case that we might get :: Press <enter> for 1 line, <space> for one page, or <q> to quit
-            #
-            output = self.connection.send_command('set cli pagination off', expect_string=DEFAULT_PROMPT)
-            print(output)
+            self.connection = ConnectHandler(**self.device)
+            self.time_to_prompt = self.connection.time_to_prompt
+            print(f"Connection Successful! {self.device['host']} prompt after {self.time_to_prompt:.1f} seconds")
 
         except Exception as e:
             print(f"Error during connection: {e}")
             pass
 
             # TODO: Needs better error handling and passing up to calling method
+        self.login_time = time.time() - start_time
 
     def disconnect(self):
         self.connection.disconnect()
-        
 
-# Define the custom class
+    def send_command(self, command, expect_string=DEFAULT_PROMPT, **kwargs):
+        """Run one command on the CLI.  Commands from several threads are serialized."""
+        if self.connection is None:
+            raise ConnectionError(f'No VOS CLI session to {self.device["host"]}')
+        with self.lock:
+            return self.connection.send_command(command, expect_string=expect_string, **kwargs)
+
+    def resync(self, timeout=VOS_DRAIN_TIMEOUT):
+        """Read the rest of a timed out command's output up to the next prompt
+
+        Without this the next command on the session reads the previous command's late output.
+
+        :return:    True when the prompt was read (session usable), False otherwise
+        """
+        if self.connection is None:
+            return False
+        with self.lock:
+            try:
+                self.connection.read_until_pattern(pattern=VOS_PROMPT_PATTERN.pattern, read_timeout=timeout)
+                return True
+            except Exception as e:
+                logging.warning(f'VOS session to {self.device["host"]} did not return to the prompt: {e}')
+                return False
+
+    def is_alive(self):
+        if self.connection is None:
+            return False
+        with self.lock:
+            try:
+                return self.connection.is_alive()
+            except Exception:
+                return False
+
+
+def open_vos_sessions(host, username, password, count, session_class=None):
+    """Log in count extra CLI sessions to one node at the same time
+
+    Logins run in parallel so opening several sessions costs about one CLI start up.  Sessions
+    that fail to log in are left out.
+
+    :return:    list of connected sessions (may be shorter than count)
+    """
+    if count <= 0:
+        return []
+    session_class = session_class or NetmikoVOS
+    sessions = [session_class(host, username, password) for _ in range(count)]
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix='vos_login') as pool:
+        list(pool.map(lambda session: session.connect(), sessions))
+    connected = [session for session in sessions if session.connection is not None]
+    if len(connected) < count:
+        logging.warning(f'{count - len(connected)} of {count} extra VOS sessions to {host} failed to log in')
+    return connected
+
+
+class VOSSessionPool(object):
+    """Pool of logged-in VOS CLI sessions keyed by (host, user, password hash)
+
+    VOS takes 20 to 40 seconds to log in and start the CLI.  The pool logs in to each node once
+    and hands the same session to every report job on that node for the rest of the run.  Commands
+    are serialized on the session (NetmikoVOS.send_command) so concurrent jobs can share it.
+
+    Thread-safe.  When several jobs ask for the same node at the same time only the first one logs
+    in; the others wait for it and count as pool hits.  Every hit adds the session's login time to
+    saved_time.  A session that dropped is logged in again on the next get().
+    """
+
+    def __init__(self, session_class=None):
+        self.session_class = session_class or NetmikoVOS
+
+        self._sessions = {}         # pool key: session
+        self._key_locks = {}        # pool key: lock held while that session logs in
+        self._lock = threading.Lock()
+
+        # counters for the whole run
+        self.hits = 0
+        self.misses = 0
+        self.reconnects = 0
+        self.login_time = 0.0
+        self.saved_time = 0.0
+        self.prompt_times = {}      # host: seconds from SSH login to the first prompt
+
+    @staticmethod
+    def pool_key(host, user, pwd):
+        # password as a digest so a job with other credentials logs in on its own session
+        return host.lower(), user, hashlib.sha256((pwd or '').encode('utf-8')).hexdigest()
+
+    def get(self, host, user, pwd):
+        """Return the shared session for a node, logging in on first use.
+
+        A session that failed to log in is returned to the caller but is NOT kept in the pool so
+        the next job will try again.
+
+        :param host:    VOS node (fqdn or ip)
+        :param user:    OS administrator username
+        :param pwd:     password (part of the pool key as a hash)
+        :return:        tuple of (NetmikoVOS, dict of pool status for the job)
+        """
+        key = self.pool_key(host, user, pwd)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                if session.is_alive():
+                    with self._lock:
+                        self.hits += 1
+                        self.saved_time += session.login_time
+                    return session, self._job_status('hit', 0.0, session.login_time)
+                logging.warning(f'VOS session to {host} dropped, logging in again')
+                del self._sessions[key]
+                with self._lock:
+                    self.reconnects += 1
+
+            session = self.session_class(host, user, pwd)
+            session.connect()
+
+            with self._lock:
+                self.misses += 1
+                self.login_time += session.login_time
+
+            if session.connection is not None:
+                self._sessions[key] = session
+
+            if session.time_to_prompt is not None:
+                with self._lock:
+                    self.prompt_times[host] = round(session.time_to_prompt, 3)
+
+            return session, self._job_status('miss', session.login_time, 0.0, session.time_to_prompt)
+
+    def _job_status(self, result, login_time, saved_time, time_to_prompt=None):
+        return {'result': result,
+                'login_time': round(login_time, 3),
+                'saved_time': round(saved_time, 3),
+                'time_to_prompt': round(time_to_prompt, 3) if time_to_prompt is not None else None,
+                'pool_hits': self.hits,
+                'pool_misses': self.misses,
+                }
+
+    def discard(self, host, user, pwd, session=None):
+        """Drop a node's session from the pool and log out (ex: its CLI output is out of step)
+
+        The next get() for the node logs in again.
+
+        :param session: the bad session.  It is logged out, and removed from the pool only if it is
+                        still the pooled one.  None: whatever session is pooled for the node.
+        """
+        key = self.pool_key(host, user, pwd)
+        with self._lock:
+            pooled = self._sessions.get(key)
+            if pooled is not None and (session is None or pooled is session):
+                del self._sessions[key]
+                session = pooled
+        if session is not None:
+            logging.warning(f'VOS session to {host} discarded')
+            try:
+                session.disconnect()
+            except Exception as e:
+                logging.debug(f'VOS disconnect failed: {e}')
+
+    def stats(self):
+        """Return dict of pool counters for the run"""
+        return {'sessions': len(self._sessions),
+                'hits': self.hits,
+                'misses': self.misses,
+                'reconnects': self.reconnects,
+                'login_time': round(self.login_time, 3),
+                'saved_time': round(self.saved_time, 3),
+                'time_to_prompt': dict(self.prompt_times),
+                }
+
+    def close_all(self):
+        """Log out of every pooled session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._key_locks.clear()
+        for session in sessions:
+            try:
+                session.disconnect()
+            except Exception as e:
+                logging.debug(f'VOS disconnect failed: {e}')
+
+
+# VOS CLI driver registered with netmiko as device_type 'cisco_vos'
 class CustomVOSSSH(LinuxSSH):
-    #def session_preparation(self):
-    #    """Override session preparation to match 'admin:' prompt."""
-    #    self._test_channel_read(pattern=r"admin:")  # Match the correct prompt
-    #    self.set_base_prompt()                     # Set the detected prompt as base
-
-    def find_prompt(self):
-        prompt = super().find_prompt()
-        if not prompt.endswith(':'):
-            raise ValueError("Unexpected prompt format")
-        return prompt
-
-    def set_base_prompt(self, pri_prompt_terminator=LINUX_PROMPT_PRI, 
-                        alt_prompt_terminator=LINUX_PROMPT_ALT,
-                        delay_factor=1,):
-           return super().set_base_prompt(
-                pri_prompt_terminator=pri_prompt_terminator,
-                alt_prompt_terminator=alt_prompt_terminator,
-                delay_factor=delay_factor,)
+    """netmiko driver for the VOS platform CLI
 
-# Testing Routine
-def main():
-    if False:
-        # Register the custom class with Netmiko's CLASS_MAPPER
-        CLASS_MAPPER["cisco_vos"] = CustomVOSSSH
-        # Ensure the class registration has been done
-        print("Registered device types:", CLASS_MAPPER.keys())
-
-    # Define the device configuration
-    device = {
-        "device_type": "generic",  # Matches the registered custom class
-        #"device_type": "cisco_vos",
-        "host": "10.10.42.10",
-        "username": "administrator",
-        "password": "Ir0nv01p",
-        #"global_delay_factor": 10,
-        #"timeout": 30
-    }
-
-    if False:
-        # Register the custom class with Netmiko's CLASS_MAPPER
-        CLASS_MAPPER["cisco_vos"] = CustomVOSSSH
-        # Ensure the class registration has been done
-        print("Registered device types:", CLASS_MAPPER.keys())
-
-    # Establish Connection
-    try:
-        connection = ConnectHandler(**device)  # This now uses CustomVOSSSH
-        print("Connection Successful!")
-        connection.base_prompt = "admin:"  # Adjust the base prompt
-        print(f'entered base_prompt: {connection.base_prompt}')
-        #connection.set_base_prompt()  # Force Netmiko to use this
-        #print('set base prompt')
-        #time.sleep(30)
-
-        # what find_prompt does is send a newline and then return whatever the prompt is
-        # this should work great AFTER we have a prompt working but not before.
-        found_prompt = connection.find_prompt()
-        
-        wait = 0        # closer to TRIES as currently written
-        timeout = 5
+    After SSH login VOS takes 20 to 40 seconds to start the CLI.  session_preparation() waits on
+    the SSH channel (select, no fixed sleeps) and returns as soon as the 'admin:' prompt arrives, or
+    raises ReadTimeout at the prompt_timeout deadline.  The time it took is kept in time_to_prompt.
+    Pagination is turned off before the first command.
+
+    :param prompt_timeout: seconds allowed from login to the first prompt
+    """
+    prompt_pattern = VOS_PROMPT_PATTERN.pattern
+
+    def __init__(self, *args, prompt_timeout=VOS_PROMPT_TIMEOUT, **kwargs):
+        # set before super().__init__(), which logs in and runs session_preparation()
+        self.prompt_timeout = prompt_timeout
+        self.time_to_prompt = None
+        super().__init__(*args, **kwargs)
+
+    def session_preparation(self):
+        self.ansi_escape_codes = True
+        start_time = time.time()
+        self.wait_for_prompt(self.prompt_timeout)
+        self.time_to_prompt = time.time() - start_time
+        self.base_prompt = DEFAULT_PROMPT[:-1]
+        self.disable_paging()
+
+    def wait_for_prompt(self, timeout=VOS_PROMPT_TIMEOUT):
+        """Read the channel until the output ends with the VOS prompt
+
+        :param timeout: seconds before ReadTimeout is raised
+        :return:        output read, prompt included
+        """
+        deadline = time.monotonic() + timeout
+        output = ''
+        while True:
+            output += self.read_channel()
+            if VOS_PROMPT_PATTERN.search(output):
+                return output
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ReadTimeout(f'VOS prompt not found in {timeout} seconds.  Last output: {output[-80:]!r}')
+            self._wait_readable(remaining)
+
+    def _wait_readable(self, timeout):
+        """Block until the channel has data (or timeout)"""
+        try:
+            select.select([self.remote_conn], [], [], min(timeout, VOS_READ_WAIT))
+        except (TypeError, ValueError, OSError):
+            # channel without a pollable file descriptor (ex: telnet, serial)
+            time.sleep(0.01)
 
-        # check for 'timeout' seconds to find the appropriate prompt.
-        # TODO : redo this logic to something cleaner.
-        while (found_prompt != connection.base_prompt) and (wait <= timeout):
-            time.sleep(1)
-            wait +=1
-            print(wait)
-            found_prompt = connection.find_prompt()     # NOTE: this takes time so this isn't just a WAIT multiplier - redo
-            
-        if wait >= timeout:
-            print('TIMEOUT')
+    def disable_paging(self, command='set cli pagination off', *args, **kwargs):
+        self.write_channel(command + self.RETURN)
+        return self.wait_for_prompt(self.prompt_timeout)
 
-        print("Detected Prompt:", connection.find_prompt())
+    def set_base_prompt(self, *args, **kwargs):
+        self.base_prompt = DEFAULT_PROMPT[:-1]
+        return self.base_prompt
 
-        # now lets try some commands that should respond fairly quickly without errors
-        #
-        # NOTE: I have NOT entered any conditions for other types of prompts yet so ANYTHING
-        # will cause these to fail
+    def find_prompt(self, *args, **kwargs):
+        """Send a newline and return the prompt"""
+        self.write_channel(self.RETURN)
+        output = self.wait_for_prompt(self.prompt_timeout)
+        return output.strip().splitlines()[-1].strip()
 
-        # immediately shut off pagination
-        # removes case that we might get :: Press <enter> for 1 line, <space> for one page, or <q> to quit
-        #
-        output = connection.send_command('set cli pagination off', expect_string=DEFAULT_PROMPT)
-        print(output)
+    def cleanup(self, command='exit'):
+        self.write_channel(command + self.RETURN)
 
-        output = connection.send_command('show network eth0', expect_string=DEFAULT_PROMPT)
-        print(output)
 
-        output = connection.send_command('utils disaster_recovery history backup', expect_string=DEFAULT_PROMPT)
-        print(output)
+# Register the VOS driver with netmiko so ConnectHandler(device_type='cisco_vos') uses it
+CLASS_MAPPER[VOS_DEVICE_TYPE] = CustomVOSSSH
+if VOS_DEVICE_TYPE not in NETMIKO_PLATFORMS:
+    NETMIKO_PLATFORMS.append(VOS_DEVICE_TYPE)
 
-        output = connection.send_command('utils disaster_recovery status backup', expect_string=DEFAULT_PROMPT)
-        print(output)
 
-        output = connection.send_command('show cert own tomcat', expect_string=DEFAULT_PROMPT)
-        print(output)
+# Testing Routine
+def main():
+    c = NetmikoVOS("10.10.42.10", "administrator", os.environ.get('VOS_PASSWORD', ''))
+    c.connect()
+    print(f'Login: {c.login_time:.1f} seconds, time to prompt: {c.time_to_prompt}')
+
+    for command in ('show network eth0',
+                    'utils disaster_recovery history backup',
+                    'utils disaster_recovery status backup',
+                    'show cert own tomcat'):
+        print(c.send_command(command))
 
-        connection.disconnect()
+    c.disconnect()
 
-    except Exception as e:
-        print(f"Error during connection: {e}")
 
 # Testing routine
 if __name__ == "__main__":
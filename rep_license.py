@@ -8,9 +8,10 @@ import time
 import logging
 from pprint import pprint
 import click
-from ciscocucmapi import UCMAXLConnector
 import re
 from rep_base import ReportTemplate
+from engine.connector_pool import AXLConnectorPool
+from ciscocucmapi.result_table import ResultTable
 from lib_excel import CellFormatFixed, CellFormatBody, CellFormatHeader, CellFormatTitle
 
 from dotenv import load_dotenv
@@ -22,7 +23,7 @@ AXL_SCHEMA_DIR = 'ciscocucmapi/schema'
 
 
 class ReportLicenseStatus(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None, **kwargs):           # TODO: do we change this to **kwargs
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         self.excel_manager = excel
         self.metadata = metadata
         self.vars = vars
@@ -47,6 +48,9 @@ class ReportLicenseStatus(ReportTemplate):
         self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
         self.commands = []
 
+        # shared connector pool from the report engine (private pool if run standalone)
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+
 
     def run(self):
         # connect and collect data
@@ -71,15 +75,13 @@ class ReportLicenseStatus(ReportTemplate):
 
         LOCAL_DEBUG = False
 
-        axl = UCMAXLConnector(username=self.user, password=self.pwd, fqdn=self.host, wsdl=self.axl_wsdl_url)
-        #axlmethodcaller = UCMAXLMethodCaller(axl)
-
-        try:
-            r = axl.get_ccm_version()
-            print(r)
-        except Exception as e:
+        axl, pool_status = self.connector_pool.get(self.host, self.user, self.pwd, self.axl_version,
+                                                   wsdl=self.axl_wsdl_url)
+        self.status['axl_pool'] = pool_status
+        if pool_status['ccm_version'] is None:
             print('ERROR: Authentication failure.')
-            print(e)
+        else:
+            print(pool_status['ccm_version'])
 
         try:
             print('*-' * 30)
@@ -97,8 +99,7 @@ class ReportLicenseStatus(ReportTemplate):
         except Exception as e:
             logging.error('ERROR: Exception occured during _collect_data')
             print(e)
-            logging.error('Response received: ')
-            pprint(r)
+            r = None
             status = 'error during _collect_data'
 
         self.data_collected = r
@@ -384,7 +385,7 @@ class ReportLicenseStatus(ReportTemplate):
         return status
 
 class ReportLicenseUsage(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None, **kwargs):           # TODO: do we change this to **kwargs
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.ip = vars.get('ip', '')
         self.host = vars.get('host', '')
@@ -398,6 +399,9 @@ class ReportLicenseUsage(ReportTemplate):
         self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
         self.commands = []
 
+        # shared connector pool from the report engine (private pool if run standalone)
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+
         self.excel_manager = excel
         self.metadata = metadata
         self.vars = vars
@@ -433,19 +437,15 @@ class ReportLicenseUsage(ReportTemplate):
 
         LOCAL_DEBUG = False
 
-        axl = UCMAXLConnector(username=self.user, password=self.pwd, fqdn=self.host, wsdl=self.axl_wsdl_url)
-        #axlmethodcaller = UCMAXLMethodCaller(axl)
-
-        try:
-            r = axl.get_ccm_version()
-            print(r)
-        except Exception as e:
-            print(e)
+        axl, pool_status = self.connector_pool.get(self.host, self.user, self.pwd, self.axl_version,
+                                                   wsdl=self.axl_wsdl_url)
+        self.status['axl_pool'] = pool_status
+        print(pool_status['ccm_version'])
 
         try:
             print('*-' * 30)
             print('TRY smart_license_status.get()')
-            r = axl.licensed_user.list()
+            r = ResultTable.from_dicts(axl.licensed_user.list())
 
             if LOCAL_DEBUG:
                 print('FINAL r return')
@@ -457,8 +457,7 @@ class ReportLicenseUsage(ReportTemplate):
         except Exception as e:
             logging.error('ERROR: Exception occured during _collect_data')
             print(e)
-            logging.error('Response received: ')
-            pprint(r)
+            r = None
             status = 'error during _collect_data'
 
         self.data_collected = r
@@ -560,7 +559,7 @@ class ReportLicenseUsage(ReportTemplate):
         return 'success assumed'
 
 class ReportUnassignedDevices(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None, **kwargs):           # TODO: do we change this to **kwargs
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
         pprint(vars)
         self.ip = vars.get('ip', '')
         self.host = vars.get('host', '')
@@ -574,6 +573,9 @@ class ReportUnassignedDevices(ReportTemplate):
         self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
         self.commands = []
 
+        # shared connector pool from the report engine (private pool if run standalone)
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+
         # this query DOES need some work to restrict it down to ONLY phones that are licensed.
         # Need a TypeClass=Phone (1)
         # Also need to get the TypeModel listing into a list (or exclude cti)
@@ -605,6 +607,7 @@ class ReportUnassignedDevices(ReportTemplate):
                     " AND (TLRPM.tklicensedresource != 7 OR TLRPM.tklicensedresource IS NULL) "
                     " AND ((my_lower(d.name::lvarchar) LIKE my_lower('%')  "
                     " OR d.name IS NULL OR my_lower(d.name::lvarchar) = ''))"
+                    " ORDER BY D.pkid"      # stable order for chunked query_iter
         )
 
         self.excel_manager = excel
@@ -650,19 +653,16 @@ class ReportUnassignedDevices(ReportTemplate):
         LOCAL_DEBUG = False
 
         click.secho(f'{__class__} collecting data...')
-        axl = UCMAXLConnector(username=self.user, password=self.pwd, fqdn=self.host, wsdl=self.axl_wsdl_url)
-        #axlmethodcaller = UCMAXLMethodCaller(axl)
-
-        try:
-            r = axl.get_ccm_version()
-            print(r)
-        except Exception as e:
-            print(e)
+        axl, pool_status = self.connector_pool.get(self.host, self.user, self.pwd, self.axl_version,
+                                                   wsdl=self.axl_wsdl_url)
+        self.status['axl_pool'] = pool_status
+        print(pool_status['ccm_version'])
 
         try:
             print('*-' * 30)
             print('TRY SQL query)')
-            r = axl.sql.query(self.sql)
+            # chunked so large clusters stay under the AXL SQL row/size limits
+            r = ResultTable.from_dicts(axl.sql.query_iter(self.sql))
 
             # TODO: planned success check is whether it returns a LIST or not
             if LOCAL_DEBUG:
@@ -675,8 +675,7 @@ class ReportUnassignedDevices(ReportTemplate):
         except Exception as e:
             logging.error('ERROR: Exception occured during _collect_data')
             print(e)
-            logging.error('Response received: ')
-            pprint(r)
+            r = None
             status = 'error during _collect_data'
 
         self.data_collected = r
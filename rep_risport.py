@@ -0,0 +1,211 @@
+# RisPort70 registration status report
+#
+# Device names come from AXL (chunked Thin AXL query) and their real-time status from RisPort70
+# in 1000 device batches within the RisPort rate limit (see ciscocucmapi.risport)
+import logging
+import os
+from pprint import pprint
+import click
+from rep_base import ReportTemplate
+from engine.connector_pool import AXLConnectorPool
+from ciscocucmapi.result_table import ResultTable
+from ciscocucmapi.risport import RIS_RATE_LIMIT
+from ciscocucmapi.risport import RIS_WORKERS
+from ciscocucmapi.risport import UCMRisPortConnector
+from lib_excel import CellFormatBody, CellFormatHeader, CellFormatTitle
+
+# TODO: this should go in ClickConfig and holds the location of the AXL schema files
+AXL_SCHEMA_DIR = 'ciscocucmapi/schema'
+
+# RisPort device class: device table class filter for the AXL name query (tkclass).
+# Other device_class values are rejected by _collect_data.
+RIS_CLASS_SQL_FILTER = {
+    'Phone': ' where tkclass = 1',
+    'Any': '',
+}
+
+# report columns: RisPort field (or Node/IPAddress added while parsing)
+REGISTRATION_COLUMNS = ['Name', 'Description', 'Node', 'Status', 'StatusReason', 'Protocol', 'IPAddress',
+                        'DirNumber', 'Model', 'ActiveLoadID', 'TimeStamp']
+
+
+class ReportRegistrationStatus(ReportTemplate):
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
+        self.excel_manager = excel
+        self.metadata = metadata
+        self.vars = vars
+        self.tab_name = metadata.get('tab_name', 'MISSING_TAB')
+        self.title = metadata.get('title', 'MISSING_TITLE')
+
+        # running data objects
+        self.data_collected = None
+        self.data_parsed = None
+        self.data_formatted = None
+        self.status = {}
+
+        self.host = vars.get('host', '')
+        self.user = vars.get('user', '')
+        self.pwd = vars.get('pwd', '')
+        self.os_type = 'VOS'
+        self.axl_version = vars.get('axl_version', '12.5')
+        self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
+
+        # RisPort options (rate_limit must match the cluster's "Rate Control for RisPort70" parameter)
+        self.device_class = vars.get('device_class', 'Phone')
+        self.ris_status = vars.get('status', 'Any')
+        self.rate_limit = int(vars.get('rate_limit', RIS_RATE_LIMIT))
+        self.workers = int(vars.get('workers', RIS_WORKERS))
+        self.commands = []
+
+        # shared connector pool from the report engine (private pool if run standalone)
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+
+    def run(self):
+        # connect and collect data
+        status = self._collect_data()
+
+        # process raw output before formatting
+        status = self._parse_data()
+
+        # process structured data and format to Excel
+        status = self._format_data()
+
+        return status
+
+    def _collect_data(self):
+        """Get device names and descriptions with AXL then their registration status from RisPort70
+
+        :return:    status string.  self.data_collected holds {'devices': ResultTable, 'ris': list of dicts}
+        """
+        click.secho(f'{__class__} collecting data...')
+        self.data_collected = {'devices': ResultTable(), 'ris': []}
+
+        if self.device_class not in RIS_CLASS_SQL_FILTER:
+            logging.error(f'ERROR: unknown device_class {self.device_class!r}, '
+                          f'expected one of {", ".join(RIS_CLASS_SQL_FILTER)}')
+            status = 'error: unknown device_class'
+            self.status['data_collect'] = status
+            return status
+
+        axl, pool_status = self.connector_pool.get(self.host, self.user, self.pwd, self.axl_version,
+                                                   wsdl=self.axl_wsdl_url)
+        self.status['axl_pool'] = pool_status
+
+        try:
+            sql = ('select name, description from device'
+                   + RIS_CLASS_SQL_FILTER[self.device_class] + ' order by name')
+            devices = ResultTable.from_dicts(axl.sql.query_iter(sql))
+            if not devices:
+                self.status['data_collect'] = 'success: 0 devices'
+                return self.status['data_collect']
+            self.data_collected['devices'] = devices
+
+            ris = UCMRisPortConnector(username=self.user, password=self.pwd, fqdn=self.host,
+                                      rate_limit=self.rate_limit, workers=self.workers)
+            self.data_collected['ris'] = ris.device_status(devices['name'], device_class=self.device_class,
+                                                          status=self.ris_status)
+            self.status['risport'] = ris.stats()
+            status = 'success'
+        except Exception as e:
+            logging.error(f'ERROR: Exception occured during _collect_data: {e}')
+            status = 'error during _collect_data'
+
+        self.status['data_collect'] = status
+        return status
+
+    def _parse_data(self, raw_output=None):
+        """One row per device and node it has registration history on.  Devices RisPort does not
+        know about get a single 'NotFound' row."""
+        if not raw_output:
+            raw_output = self.data_collected
+
+        descriptions = dict(raw_output['devices'].tuples())
+        found = set()
+        rows = []
+        for device in raw_output['ris']:
+            ip_items = (device.get('IPAddress') or {}).get('item') or []
+            device['IPAddress'] = ', '.join(ip.get('IP') or '' for ip in ip_items)
+            device['Description'] = descriptions.get(device.get('Name'), device.get('Description'))
+            found.add(device.get('Name'))
+            rows.append(tuple(device.get(column) for column in REGISTRATION_COLUMNS))
+
+        for name, description in raw_output['devices'].tuples():
+            if name not in found:
+                row = dict(Name=name, Description=description, Status='NotFound')
+                rows.append(tuple(row.get(column) for column in REGISTRATION_COLUMNS))
+
+        rows.sort(key=lambda row: (row[0] or '', row[2] or ''))
+        self.data_parsed = ResultTable(REGISTRATION_COLUMNS, rows)
+        self.status['data_parse'] = 'success'
+        return 'success'
+
+    def _format_data(self, data=None):
+        if not data:
+            data = self.data_parsed
+
+        self.data_formatted = data
+        self.status['data_format'] = 'success'
+        return 'success'
+
+    def write_excel_tab(self, data=None, tab_name=None,
+                        title_format=CellFormatTitle(),
+                        header_format=CellFormatHeader(),
+                        body_format=CellFormatBody()):
+        """Write the registration table with a per status count line under the title"""
+        if not data:
+            data = self.data_formatted
+
+        if not tab_name:
+            tab_name = self.tab_name
+
+        if not self.excel_manager.workbook:
+            raise Exception("No active workbook. Create or open a spreadsheet first.")
+        sheet = self.excel_manager.workbook.create_sheet(title=tab_name)
+
+        def write_cell(row, column, value, cell_format):
+            cell = sheet.cell(row=row, column=column, value=value)
+            cell.font = cell_format.font
+            cell.fill = cell_format.fill
+            cell.alignment = cell_format.alignment
+            cell.border = cell_format.border
+
+        write_cell(1, 1, 'Device Registration Status (RisPort70)', title_format)
+
+        counts = {}
+        for status in data['Status']:
+            counts[status] = counts.get(status, 0) + 1
+        summary = ', '.join(f'{status}: {count}'
+                            for status, count in sorted(counts.items(), key=lambda item: str(item[0])))
+        sheet.cell(row=2, column=1, value=summary)
+
+        row_start = 3
+        for col_num, header in enumerate(data.header, start=1):
+            write_cell(row_start, col_num, header, header_format)
+
+        for row_num, row in enumerate(data.tuples(), start=row_start + 1):
+            for col_num, value in enumerate(row, start=1):
+                write_cell(row_num, col_num, value, body_format)
+
+        print(f"Added a new tab [{tab_name}] with formatted data to the workbook.")
+        self.status['print'] = 'success'
+        return 'success'
+
+
+def main():
+
+    # test example to lab server
+    vars = {'host': '10.10.42.10',
+            'user': 'administrator',
+            'pwd': os.environ.get('AXL_PASSWORD', ''),
+            'axl_version': '12.5',
+            }
+
+    report = ReportRegistrationStatus(vars)
+    r = report.run()
+    pprint(r)
+    pprint(report.status)
+
+
+# Testing routine
+if __name__ == "__main__":
+     main()
@@ -0,0 +1,56 @@
+# ReportRegistrationStatus data collection: no devices and unknown device classes
+import rep_risport
+from rep_risport import ReportRegistrationStatus
+
+
+class FakeSQL:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def query_iter(self, sql):
+        self.statements.append(sql)
+        return iter(self.rows)
+
+
+class FakeAXL:
+    def __init__(self, rows):
+        self.sql = FakeSQL(rows)
+
+
+class FakePool:
+    def __init__(self, rows=()):
+        self.axl = FakeAXL(list(rows))
+        self.gets = 0
+
+    def get(self, host, user, pwd, axl_version, wsdl=None):
+        self.gets += 1
+        return self.axl, 'new'
+
+
+class FailingRisPort:
+    def __init__(self, **kwargs):
+        raise AssertionError('RisPort should not be queried')
+
+
+def report(pool, **vars):
+    return ReportRegistrationStatus(dict(host='cucm', user='admin', pwd='', **vars), connector_pool=pool)
+
+
+def test_no_devices_skips_risport(monkeypatch):
+    monkeypatch.setattr(rep_risport, 'UCMRisPortConnector', FailingRisPort)
+    pool = FakePool()
+    registration = report(pool)
+
+    assert registration.run() == 'success'
+    assert registration.status['data_collect'] == 'success: 0 devices'
+    assert pool.axl.sql.statements == ['select name, description from device where tkclass = 1 order by name']
+    assert len(registration.data_parsed) == 0
+
+
+def test_unknown_device_class_is_rejected():
+    pool = FakePool([{'name': 'SEP001122334455', 'description': 'Lobby'}])
+    registration = report(pool, device_class='Phones')
+
+    assert registration._collect_data() == 'error: unknown device_class'
+    assert pool.gets == 0
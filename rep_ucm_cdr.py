@@ -12,7 +12,18 @@ import json
 from ciscocucmapi import UCMAXLConnector
 import re
 import csv
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
 from rep_base import ReportTemplate
+import lib_cdr
+from engine.connector_pool import AXLConnectorPool
+from ciscocucmapi.cdr_on_demand import CDR_WORKERS
+from ciscocucmapi.cdr_on_demand import CDRFileDownloader
+from ciscocucmapi.cdr_on_demand import DirectoryFileSource
+from ciscocucmapi.cdr_on_demand import HTTPFileSource
+from ciscocucmapi.cdr_on_demand import SFTPFileSource
+from ciscocucmapi.cdr_on_demand import UCMCDRonDemandConnector
+from ciscocucmapi.cdr_on_demand import source_window
 from lib_excel import CellFormatFixed, CellFormatBody, CellFormatHeader, CellFormatTitle
 from openpyxl.chart import LineChart, AreaChart, Reference
 
@@ -23,6 +34,22 @@ from dotenv import load_dotenv
 # TODO: this should go in ClickConfig and holds the location of the AXL schema files
 AXL_SCHEMA_DIR = 'ciscocucmapi/schema'
 
+# local directory CDR flat files are downloaded to (files already there are not downloaded again)
+CDR_DOWNLOAD_DIR = 'cdr_files'
+
+# daily traffic summary columns built from the CDR flat files
+CDR_DAILY_HEADER = ['Date', 'Calls', 'Connected Calls', 'Minutes']
+CDR_ANALYTICS_DAILY_HEADER = CDR_DAILY_HEADER + ['Busy Hour', 'Busy Hour Calls']
+# flat file fields the daily summary reads (files without them are skipped)
+CDR_SUMMARY_FIELDS = ('cdrRecordType', 'dateTimeOrigination', 'dateTimeConnect', 'duration')
+
+# device name -> device pool, and trunk names, for the per device pool / per trunk volume tables
+# (query_iter pages with SKIP/FIRST, so the statements need an ORDER BY)
+DEVICE_POOL_SQL = ('select d.name, dp.name as devicepool from device d, devicepool dp '
+                   'where d.fkdevicepool = dp.pkid order by d.name')
+TRUNK_SQL = ('select d.name from device d, typeproduct p '
+             "where d.tkproduct = p.enum and p.name like '%Trunk%' order by d.name")
+
 def load_cdr_data_from_file(file_path):
     """Test routine to load stored CDR data as text format rather than making a live call to server
 
@@ -39,9 +66,91 @@ def load_cdr_data_from_file(file_path):
         print(f"Error loading snapshot: {e}")
         return None
 
+
+def report_month(month=None):
+    """UTC (start, end) datetimes of a month
+
+    :param month:   'YYYY-MM'.  Previous month when not given
+    """
+    if month:
+        start = datetime.strptime(month, '%Y-%m').replace(tzinfo=timezone.utc)
+    else:
+        this_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        start = this_month.replace(year=this_month.year - 1, month=12) if this_month.month == 1 \
+            else this_month.replace(month=this_month.month - 1)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+
+def report_file_window(month=None, utc_offset=0):
+    """UTC (start, end) of the CDR files holding a report month
+
+    With utc_offset the month is in local time (see lib_cdr.CDRAggregator), so its first or last
+    |utc_offset| hours are in the previous or next UTC month.  The window is widened by the offset
+    on both sides; records outside the local month are dropped by the aggregator.
+    """
+    start, end = report_month(month)
+    margin = timedelta(hours=abs(utc_offset))
+    return start - margin, end + margin
+
+
+def summarize_cdr_files(paths, start=None, end=None, utc_offset=0):
+    """Daily call counts and minutes of CDR flat files
+
+    Flat files have a header row of field names and a row of field types before the records.
+    Only CDRs (cdrRecordType 1) are counted, by day of dateTimeOrigination + utc_offset.  With
+    start and end (see report_month) only CDRs in that local period are counted and every day of
+    it gets a row, the same days as lib_cdr.CDRAggregator.daily().
+
+    :param paths:   CDR flat file paths
+    :param start:   period start (UTC datetime, the local start with utc_offset)
+    :param end:     period end
+    :param utc_offset:  hours added to CDR times (UTC) for days (ex: -5)
+    :return:        list of rows, CDR_DAILY_HEADER first
+    """
+    offset = int(utc_offset * 3600)
+    days = defaultdict(lambda: [0, 0, 0])
+    if start is not None:
+        first, last = int(start.timestamp()), int(end.timestamp())
+        for day in range((last - first) // 86400):
+            days[(start + timedelta(days=day)).strftime('%Y-%m-%d')]
+    for path in paths:
+        with open(path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if not header:
+                continue
+            missing = [field for field in CDR_SUMMARY_FIELDS if field not in header]
+            if missing:
+                logging.warning(f'{path} skipped, not a CDR flat file (no {", ".join(missing)})')
+                continue
+            next(reader, None)      # field types
+            record_type = header.index('cdrRecordType')
+            origination = header.index('dateTimeOrigination')
+            connect = header.index('dateTimeConnect')
+            duration = header.index('duration')
+            for row in reader:
+                if len(row) != len(header) or row[record_type] != '1':
+                    continue
+                local_time = int(row[origination]) + offset
+                if start is not None and not first <= local_time < last:
+                    continue
+                day = datetime.fromtimestamp(local_time, timezone.utc).strftime('%Y-%m-%d')
+                totals = days[day]
+                totals[0] += 1
+                if row[connect] not in ('', '0'):
+                    totals[1] += 1
+                totals[2] += int(row[duration] or 0)
+
+    rows = [CDR_DAILY_HEADER]
+    for day in sorted(days):
+        calls, connected, seconds = days[day]
+        rows.append([day, calls, connected, round(seconds / 60, 1)])
+    return rows
+
 class ReportUcmCdrMonthly(ReportTemplate):
-    def __init__(self, vars, metadata={}, excel=None, **kwargs):           # TODO: do we change this to **kwargs
-        self.os_type = 'SELENIUM'
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
+        self.os_type = 'API'
 
         #AXL_WSDL_URL=os.environ.get('AXL_WSDL_URL',f'ciscocucmapi/schema/{DEFAULT_AXL_VERSION}/AXLAPI.wsdl')
         #self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
@@ -59,7 +168,29 @@ class ReportUcmCdrMonthly(ReportTemplate):
         self.user = vars.get('user', '')
         self.pwd = vars.get('pwd', '')
         self.cluster_type = vars.get('type', '')
-        pprint(vars)
+
+        # CDR flat file collection.  cdr_source is where the files are read from ('sftp', 'http' or
+        # 'dir'), normally the billing server CUCM pushes them to.  cdr_push has CUCM push the month's
+        # files there first with CDRonDemand (slow: one listing per hour of the month, 10 requests/min).
+        self.month = vars.get('month')
+        self.cdr_source = vars.get('cdr_source', 'sftp')
+        self.cdr_server = vars.get('cdr_server', '')
+        self.cdr_user = vars.get('cdr_user', '')
+        self.cdr_pwd = vars.get('cdr_pwd', '')
+        self.cdr_path = vars.get('cdr_path', '.')
+        self.cdr_push = vars.get('cdr_push', False)
+        self.cdr_dir = vars.get('cdr_dir', CDR_DOWNLOAD_DIR)
+        self.workers = int(vars.get('workers', CDR_WORKERS))
+        self.cdr_files = None
+
+        # analytics (lib_cdr, needs numpy): utc_offset in hours for days and busy hours.
+        # device_pools looks up device pools and trunks with AXL for the volume tables.
+        self.utc_offset = float(vars.get('utc_offset', 0))
+        self.device_pools = vars.get('device_pools', True)
+        self.axl_version = vars.get('axl_version', '12.5')
+        self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+        self.chart_rows = None      # (header row, last row, last column) of the daily table when known
 
         # running data objects
         self.data_collected = None
@@ -85,8 +216,6 @@ class ReportUcmCdrMonthly(ReportTemplate):
         LOCAL_DEBUG = False
         output = ""
         status = None
-        # TODO: load from file for now
-        # will call selenium engine when in production
         if self.vars.get('test', False):
             # use test data
             # NOTE: this is loading right into CSV which we may not want
@@ -95,27 +224,125 @@ class ReportUcmCdrMonthly(ReportTemplate):
             data = load_cdr_data_from_file(self.vars.get('test_file', ''))
             status = 'SUCCESS - Using Test data from file.'
         else:
-            # TODO: This is where the call to selenium will go when it is working
-            # 
-            data = {}
-            status = 'SELENIUM DATA COLLECTION NOT BUILT YET'
+            try:
+                data = self._download_cdr_files()
+                status = f'success - {len(data)} CDR files'
+            except Exception as e:
+                logging.error(f'ERROR: Exception occured during _collect_data: {e}')
+                data = []
+                status = 'error during _collect_data'
+            self.cdr_files = data
 
         if LOCAL_DEBUG:
             pprint(data)
 
         self.data_collected = data
+        self.status['data_collect'] = status
 
         return status
 
+    def _file_source(self):
+        """File source for the cdr_source setting"""
+        if self.cdr_source == 'http':
+            return HTTPFileSource(self.cdr_path, username=self.cdr_user, password=self.cdr_pwd)
+        if self.cdr_source == 'dir':
+            return DirectoryFileSource(self.cdr_path)
+        return SFTPFileSource(self.cdr_server, self.cdr_user, self.cdr_pwd, self.cdr_path)
+
+    def _download_cdr_files(self):
+        """Download the report month's CDR files to cdr_dir
+
+        :return:    list of local file paths
+        """
+        start, end = report_file_window(self.month, self.utc_offset)
+        source = self._file_source()
+        downloader = CDRFileDownloader(source, self.cdr_dir, workers=self.workers)
+        try:
+            if self.cdr_push:
+                cdr = UCMCDRonDemandConnector(username=self.user, password=self.pwd, fqdn=self.host)
+                push_to = {'host': self.cdr_server, 'username': self.cdr_user, 'password': self.cdr_pwd,
+                           'directory': self.cdr_path}
+                results = cdr.fetch_files(start, end, downloader, push_to)
+                self.status['cdr_on_demand_requests'] = cdr.requests
+            else:
+                results = downloader.download(source_window(source, start, end))
+        finally:
+            if hasattr(source, 'close'):
+                source.close()
+
+        self.status['cdr_download'] = downloader.stats()
+        failed = [result['name'] for result in results if result['error']]
+        if failed:
+            logging.warning(f'{len(failed)} CDR files not downloaded: {failed[:5]}')
+        return [result['path'] for result in results if result['path']]
+
     def _parse_data(self, raw_output=None):
  
         if not raw_output:
             raw_output = self.data_collected
 
+        if self.cdr_files is not None:
+            # live collection: raw_output is the list of downloaded CDR files
+            if lib_cdr.np is not None:
+                raw_output = self._analyze_cdr_files(raw_output)
+            else:
+                start, end = report_month(self.month)
+                raw_output = summarize_cdr_files(raw_output, start, end, utc_offset=self.utc_offset)
+                self.chart_rows = (2, len(raw_output) + 1, len(CDR_DAILY_HEADER))
+
         self.data_parsed = raw_output
 
         return 'success assumed'
     
+    def _device_groups(self):
+        """AXL lookup of device pools and trunks
+
+        :return:    (dict of device name: device pool, dict of trunk name: trunk name).  Empty on error.
+        """
+        if not self.device_pools:
+            return {}, {}
+        try:
+            axl, pool_status = self.connector_pool.get(self.host, self.user, self.pwd, self.axl_version,
+                                                       wsdl=self.axl_wsdl_url)
+            self.status['axl_pool'] = pool_status
+            device_pools = {row['name']: row['devicepool'] for row in axl.sql.query_iter(DEVICE_POOL_SQL)}
+            trunks = {row['name']: row['name'] for row in axl.sql.query_iter(TRUNK_SQL)}
+            return device_pools, trunks
+        except Exception as e:
+            logging.error(f'ERROR: device pool lookup failed, volume tables skipped: {e}')
+            return {}, {}
+
+    def _analyze_cdr_files(self, paths):
+        """Daily, device pool, trunk and duration tables of the month's CDR files (lib_cdr)
+
+        :return:    list of rows: the daily table first, then the other tables after a blank row each
+        """
+        start, end = report_month(self.month)
+        start_time = time.time()
+        cdrs = lib_cdr.aggregate_cdr_files(paths, start, end, utc_offset=self.utc_offset)
+        self.status['cdr_analytics'] = {'records': cdrs.records, 'outside_period': cdrs.outside_period,
+                                        'devices': len(cdrs.device_codes),
+                                        'seconds': round(time.time() - start_time, 2)}
+
+        daily = cdrs.daily()
+        rows = [CDR_ANALYTICS_DAILY_HEADER] + daily
+        # daily table header is on row 2 (under the title)
+        self.chart_rows = (2, len(daily) + 2, len(CDR_DAILY_HEADER))
+
+        busy_time, busy_calls = cdrs.busy_hour()
+        if busy_time is not None:
+            rows += [[], ['Busy Hour', busy_time.strftime('%Y-%m-%d %H:00'), busy_calls]]
+
+        rows += [[], ['Duration Percentile', 'Seconds']]
+        rows += [[f'{percentile}%', seconds] for percentile, seconds in cdrs.duration_percentiles().items()]
+
+        device_pools, trunks = self._device_groups()
+        if device_pools:
+            rows += [[], ['Device Pool', 'Calls', 'Minutes']] + cdrs.group_volume(device_pools, side='orig')
+        if trunks:
+            rows += [[], ['Trunk', 'Calls', 'Minutes']] + cdrs.group_volume(trunks, side='both')
+        return rows
+
     def _format_data(self, output=None):
         """Final report formatting.   This is broken out because we could want different
         types of reports from this data.  This last method is for formatting different
@@ -181,8 +408,14 @@ class ReportUcmCdrMonthly(ReportTemplate):
         chart.y_axis.title = "Values"
 
         # Define data range (excluding headers)
-        data_range = Reference(sheet, min_col=2, min_row=11, max_col=11, max_row=42)
-        category_range = Reference(sheet, min_col=1, min_row=10, max_row=32)
+        if self.chart_rows:
+            # daily table from CDR files: header row, last day row, last numeric column
+            header_row, last_row, last_col = self.chart_rows
+            data_range = Reference(sheet, min_col=2, min_row=header_row, max_col=last_col, max_row=last_row)
+            category_range = Reference(sheet, min_col=1, min_row=header_row + 1, max_row=last_row)
+        else:
+            data_range = Reference(sheet, min_col=2, min_row=11, max_col=11, max_row=42)
+            category_range = Reference(sheet, min_col=1, min_row=10, max_row=32)
 
         # Add data to chart (titles from headers)
         chart.add_data(data_range, titles_from_data=True)
@@ -202,6 +435,11 @@ def main():
             'user': 'administrator',
             'pwd': '',
             'axl_version': '12.5',
+            'cdr_source': 'sftp',
+            'cdr_server': '10.10.42.20',
+            'cdr_user': 'cdr',
+            'cdr_pwd': os.environ.get('CDR_SFTP_PASSWORD', ''),
+            'cdr_path': '/cdr',
             }
     
     report = ReportUcmCdrMonthly(vars)
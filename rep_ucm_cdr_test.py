@@ -0,0 +1,68 @@
+# Monthly CDR report: the csv daily summary (no numpy) matches the lib_cdr analytics days
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+import lib_cdr
+from rep_ucm_cdr import report_month
+from rep_ucm_cdr import summarize_cdr_files
+
+HEADER = ['cdrRecordType', 'globalCallID_callId', 'dateTimeOrigination', 'dateTimeConnect', 'duration',
+          'origDeviceName', 'destDeviceName']
+TYPES = ['INTEGER', 'INTEGER', 'INTEGER', 'INTEGER', 'INTEGER', 'VARCHAR(129)', 'VARCHAR(129)']
+
+
+def timestamp(text):
+    return int(datetime.strptime(text, '%Y-%m-%d %H:%M').replace(tzinfo=timezone.utc).timestamp())
+
+
+def write_cdrs(path, records):
+    """records: (cdrRecordType, UTC 'YYYY-MM-DD HH:MM', connected, duration)"""
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        writer.writerow(TYPES)
+        for n, (record_type, origination, connected, duration) in enumerate(records):
+            origination = timestamp(origination)
+            writer.writerow([record_type, n, origination, origination + 5 if connected else 0, duration,
+                             'SEP001', 'SIPTrunk1'])
+    return str(path)
+
+
+@pytest.fixture
+def cdr_file(tmp_path):
+    return write_cdrs(tmp_path / 'cdr_StandAloneCluster_01_202405010000_1', [
+        (1, '2024-05-01 02:00', True, 120),     # 2024-04-30 local (-5), outside the month
+        (1, '2024-05-01 06:00', True, 60),
+        (1, '2024-05-01 07:00', False, 0),
+        (2, '2024-05-01 07:00', False, 0),      # CMR, not counted
+        (1, '2024-05-31 23:00', True, 30),
+        (1, '2024-06-01 04:00', True, 90),      # 2024-05-31 local
+        (1, '2024-06-01 05:00', True, 90),      # 2024-06-01 local, outside the month
+    ])
+
+
+def test_summary_counts_local_days_of_the_month(cdr_file):
+    start, end = report_month('2024-05')
+    rows = summarize_cdr_files([cdr_file], start, end, utc_offset=-5)
+
+    assert rows[0] == ['Date', 'Calls', 'Connected Calls', 'Minutes']
+    assert len(rows) == 32
+    assert rows[1] == ['2024-05-01', 2, 1, 1.0]
+    assert rows[31] == ['2024-05-31', 2, 2, 2.0]
+    assert sum(row[1] for row in rows[1:]) == 4
+
+
+def test_summary_without_a_period_counts_utc_days(cdr_file):
+    rows = summarize_cdr_files([cdr_file])
+    assert [row[0] for row in rows[1:]] == ['2024-05-01', '2024-05-31', '2024-06-01']
+    assert rows[1] == ['2024-05-01', 3, 2, 3.0]
+
+
+@pytest.mark.skipif(lib_cdr.np is None, reason='numpy not installed')
+def test_summary_matches_cdr_aggregator(cdr_file):
+    start, end = report_month('2024-05')
+    rows = summarize_cdr_files([cdr_file], start, end, utc_offset=-5)
+    daily = lib_cdr.aggregate_cdr_files([cdr_file], start, end, utc_offset=-5).daily()
+    assert rows[1:] == [row[:4] for row in daily]
@@ -0,0 +1,277 @@
+# VOS command fan-out report
+#
+# Runs the same VOS CLI commands on every node of a cluster (a node list from the seed or the
+# cluster's processNode list from AXL) over a bounded worker pool and writes all output to one tab
+# with a Node column.  Each node runs in its own worker with its own time budget: a node that fails
+# or is slow only marks its own rows, the other nodes finish at their own pace.
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pprint import pprint
+import click
+from rep_base import ReportTemplate
+from engine.connector_pool import AXLConnectorPool
+from lib_vos import DEFAULT_PROMPT
+from lib_vos import VOSSessionPool
+from lib_excel import CellFormatFixed, CellFormatHeader, CellFormatTitle
+
+# TODO: this should go in ClickConfig and holds the location of the AXL schema files
+AXL_SCHEMA_DIR = 'ciscocucmapi/schema'
+
+VOS_FANOUT_WORKERS = 8          # nodes worked on at the same time
+VOS_NODE_TIMEOUT = 600          # seconds per node for all of its commands (login not included)
+VOS_COMMAND_TIMEOUT = 120       # seconds per command
+
+# processNode entry that is not a server
+PROCESS_NODE_EXCLUDE = ('EnterpriseWideData',)
+
+FANOUT_COLUMNS = ['Node', 'Command', 'Status', 'Seconds', 'Output']
+
+
+def node_list(nodes):
+    """Seed 'nodes' value (list or comma separated string) to a list of node names"""
+    if isinstance(nodes, str):
+        nodes = nodes.split(',')
+    return [node.strip() for node in nodes or [] if node and node.strip()]
+
+
+class ReportVOSFanout(ReportTemplate):
+    vos_sessions = True     # engine passes its VOSSessionPool as vos_pool
+
+    def __init__(self, vars, metadata={}, excel=None, **kwargs):
+        self.excel_manager = excel
+        self.metadata = metadata
+        self.vars = vars
+        self.tab_name = metadata.get('tab_name', 'MISSING_TAB')
+        self.title = metadata.get('title', 'MISSING_TITLE')
+
+        # running data objects
+        self.data_collected = None
+        self.data_parsed = None
+        self.data_formatted = None
+        self.status = {}
+
+        # OS administrator login used on every node
+        self.host = vars.get('host', '')
+        self.user = vars.get('user', '')
+        self.pwd = vars.get('pwd', '')
+        self.os_type = 'VOS'
+        self.cluster_type = vars.get('type', '')
+
+        # nodes from the seed, or discovered from AXL processNode on 'host' (discover: true)
+        self.nodes = node_list(vars.get('nodes'))
+        self.discover = vars.get('discover', not self.nodes)
+        self.node_role = vars.get('node_role')          # ex: 'CUCM Voice/Video' to skip IM&P nodes
+        self.axl_user = vars.get('axl_user', self.user)
+        self.axl_pwd = vars.get('axl_pwd', self.pwd)
+        self.axl_version = vars.get('axl_version', '12.5')
+        self.axl_wsdl_url = f'{AXL_SCHEMA_DIR}/{self.axl_version}/AXLAPI.wsdl'
+
+        commands = vars.get('commands') or vars.get('command') or []
+        self.commands = [commands] if isinstance(commands, str) else list(commands)
+        self.workers = int(vars.get('workers', VOS_FANOUT_WORKERS))
+        self.node_timeout = float(vars.get('node_timeout', VOS_NODE_TIMEOUT))
+        self.command_timeout = float(vars.get('command_timeout', VOS_COMMAND_TIMEOUT))
+
+        # shared pools from the report engine (private pools if run standalone)
+        self.connector_pool = kwargs.get('connector_pool') or AXLConnectorPool(schema_dir=AXL_SCHEMA_DIR)
+        self.vos_pool = kwargs.get('vos_pool')
+        self._private_pool = self.vos_pool is None
+        if self._private_pool:
+            self.vos_pool = VOSSessionPool()
+
+    def run(self):
+        # connect and collect data
+        status = self._collect_data()
+
+        # process raw output before formatting
+        status = self._parse_data()
+
+        # process structured data and format to Excel
+        status = self._format_data()
+
+        return status
+
+    def _discover_nodes(self):
+        """Server names of the cluster from AXL processNode
+
+        :return:    list of node names (empty on error)
+        """
+        axl, pool_status = self.connector_pool.get(self.host, self.axl_user, self.axl_pwd, self.axl_version,
+                                                   wsdl=self.axl_wsdl_url)
+        self.status['axl_pool'] = pool_status
+        try:
+            process_nodes = axl.process_node.list(searchCriteria={'name': '%'},
+                                                  returnedTags={'name': '', 'processNodeRole': ''})
+        except Exception as e:
+            logging.error(f'ERROR: processNode discovery failed on {self.host}: {e}')
+            return []
+        return [node['name'] for node in process_nodes
+                if node['name'] not in PROCESS_NODE_EXCLUDE
+                and (not self.node_role or node.get('processNodeRole') == self.node_role)]
+
+    def _run_node(self, node):
+        """Run the command set on one node within its node_timeout budget
+
+        :return:    dict {'node', 'status', 'seconds', 'vos_pool', 'results': [(command, status, seconds, output)]}
+        """
+        start_time = time.time()
+        result = {'node': node, 'status': 'success', 'seconds': 0.0, 'vos_pool': None, 'results': []}
+        try:
+            session, pool_status = self.vos_pool.get(node, self.user, self.pwd)
+            result['vos_pool'] = pool_status
+            deadline = time.time() + self.node_timeout
+
+            for command in self.commands:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    result['status'] = 'timeout'
+                    result['results'].append((command, 'skipped (node timeout)', 0.0, ''))
+                    continue
+                if session is None:
+                    result['results'].append((command, 'skipped (session discarded)', 0.0, ''))
+                    continue
+                command_start = time.time()
+                try:
+                    output = session.send_command(command, expect_string=DEFAULT_PROMPT,
+                                                  read_timeout=min(self.command_timeout, remaining))
+                    result['results'].append((command, 'success', time.time() - command_start, output))
+                except Exception as e:
+                    result['status'] = 'error'
+                    result['results'].append((command, f'error: {e}', time.time() - command_start, ''))
+                    # the pooled session is shared: read the late output or take it out of the pool
+                    if not session.resync():
+                        self.vos_pool.discard(node, self.user, self.pwd, session)
+                        session = None
+        except Exception as e:
+            logging.error(f'ERROR: VOS fan-out failed on {node}: {e}')
+            result['status'] = 'error'
+            result['results'] = [(command, f'error: {e}', 0.0, '') for command in self.commands]
+
+        result['seconds'] = time.time() - start_time
+        return result
+
+    def _collect_data(self):
+        """Run the commands on all nodes concurrently
+
+        :return:    status string.  self.data_collected holds one _run_node() dict per node, in node order
+        """
+        click.secho(f'{__class__} collecting data...')
+        if self.discover and not self.nodes:
+            self.nodes = self._discover_nodes()
+        if not self.nodes or not self.commands:
+            self.data_collected = []
+            self.status['data_collect'] = 'no nodes or commands'
+            return self.status['data_collect']
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(self.nodes)),
+                                thread_name_prefix='vos_fanout') as pool:
+            futures = {pool.submit(self._run_node, node): node for node in self.nodes}
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['node']] = result
+                click.secho(f"  {result['node']}: {result['status']} ({result['seconds']:.1f} seconds)",
+                            fg='green' if result['status'] == 'success' else 'red')
+
+        if self._private_pool:
+            self.vos_pool.close_all()
+
+        self.data_collected = [results[node] for node in self.nodes]
+        self.status['nodes'] = {result['node']: {'status': result['status'],
+                                                 'seconds': round(result['seconds'], 3),
+                                                 'vos_pool': result['vos_pool']}
+                                for result in self.data_collected}
+        failed = [node for node, node_status in self.status['nodes'].items() if node_status['status'] != 'success']
+        status = f'success - {len(self.nodes) - len(failed)} of {len(self.nodes)} nodes'
+        if failed:
+            status += f' (failed: {", ".join(failed)})'
+        self.status['data_collect'] = status
+        return status
+
+    def _parse_data(self, raw_output=None):
+        """One row per output line with Node and Command columns.  Status and time are on the first
+        row of each command."""
+        if not raw_output:
+            raw_output = self.data_collected
+
+        rows = []
+        for node_result in raw_output:
+            for command, status, seconds, output in node_result['results']:
+                lines = output.strip('\n').split('\n') if output else ['']
+                rows.append([node_result['node'], command, status, round(seconds, 1), lines[0]])
+                rows.extend([node_result['node'], command, None, None, line] for line in lines[1:])
+
+        self.data_parsed = rows
+        self.status['data_parse'] = 'success'
+        return 'success'
+
+    def _format_data(self, data=None):
+        if not data:
+            data = self.data_parsed
+
+        self.data_formatted = data
+        self.status['data_format'] = 'success'
+        return 'success'
+
+    def write_excel_tab(self, data=None, tab_name=None,
+                        title_format=CellFormatTitle(),
+                        header_format=CellFormatHeader(),
+                        body_format=CellFormatFixed()):
+        """Write all nodes' output with a per node status line under the title"""
+        if data is None:
+            data = self.data_formatted
+
+        if not tab_name:
+            tab_name = self.tab_name
+
+        if not self.excel_manager.workbook:
+            raise Exception("No active workbook. Create or open a spreadsheet first.")
+        sheet = self.excel_manager.workbook.create_sheet(title=tab_name)
+
+        def write_cell(row, column, value, cell_format):
+            cell = sheet.cell(row=row, column=column, value=value)
+            cell.font = cell_format.font
+            cell.fill = cell_format.fill
+            cell.alignment = cell_format.alignment
+            cell.border = cell_format.border
+
+        write_cell(1, 1, self.title, title_format)
+
+        summary = ', '.join(f"{node}: {node_status['status']} ({node_status['seconds']:.1f}s)"
+                            for node, node_status in self.status.get('nodes', {}).items())
+        sheet.cell(row=2, column=1, value=summary)
+
+        row_start = 3
+        for col_num, header in enumerate(FANOUT_COLUMNS, start=1):
+            write_cell(row_start, col_num, header, header_format)
+
+        for row_num, row in enumerate(data, start=row_start + 1):
+            for col_num, value in enumerate(row, start=1):
+                write_cell(row_num, col_num, value, body_format)
+
+        print(f"Added a new tab [{tab_name}] with formatted data to the workbook.")
+        self.status['print'] = 'success'
+        return 'success'
+
+
+def main():
+
+    # test example to lab server
+    vars = {'host': '10.10.42.10',
+            'user': 'administrator',
+            'pwd': os.environ.get('VOS_PASSWORD', ''),
+            'discover': True,
+            'commands': ['utils disaster_recovery status backup', 'show status'],
+            }
+
+    report = ReportVOSFanout(vars)
+    r = report.run()
+    pprint(r)
+    pprint(report.status)
+
+
+# Testing routine
+if __name__ == "__main__":
+     main()